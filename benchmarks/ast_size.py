@@ -0,0 +1,110 @@
+#! python3
+# Memory and build time of the AST per 1000 source lines, for a generated
+# program made of many small FUNCTIONs, loops and conditionals.
+#
+#   python benchmarks/ast_size.py [-n LINES]
+#
+# Run it on two checkouts to compare them.
+import argparse
+import gc
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pybasic.basic_yacc import ParseState, parse_lines
+
+unit = '''\
+FUNCTION F{0}(A, B)
+    S = 0
+    FOR I = A TO B STEP 2
+        IF I MOD 3 = 0 THEN
+            S = S + I * {0}
+        ELSEIF I MOD 3 = 1 THEN
+            S = S - (I + B) / 2
+        ELSE
+            S = S + LEN("item {0}")
+        END IF
+    NEXT I
+    RETURN S
+END FUNCTION
+DIM V{0}(10) AS INTEGER
+N{0} = 0
+WHILE N{0} < 10
+    V{0}(N{0}) = F{0}(N{0}, N{0} + 5)
+    N{0} = N{0} + 1
+WEND
+DO
+    N{0} = N{0} - 3
+LOOP UNTIL N{0} < 0
+PRINT "unit", {0}, V{0}(9)
+'''
+
+
+def generate(lines):
+    source = []
+    index = 0
+    while len(source) < lines:
+        source.extend(unit.format(index).splitlines(True))
+        index += 1
+    return source
+
+
+def count_nodes(node):
+    if isinstance(node, list):
+        return sum(count_nodes(x) for x in node)
+    if not hasattr(node, 'tree'):
+        return 0
+    extra = count_nodes(node.value) if node.type == 'array' else 0
+    return 1 + extra + sum(count_nodes(x) for x in node.tree)
+
+
+def build(source):
+    gc.collect()
+    start = time.perf_counter()
+    parse_lines(source, ParseState())
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the size of the AST.')
+    parser.add_argument('-n', dest='lines', type=int, default=20000, help='lines to generate')
+    parser.add_argument('-r', dest='repeat', type=int, default=3, help='builds to time')
+    args = parser.parse_args()
+    source = generate(args.lines)
+    per_k = 1000 / len(source)
+    sys.setrecursionlimit(100000)
+
+    build_time = min(build(source) for _ in range(args.repeat))
+
+    state = ParseState()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    parse_lines(source, state)
+    ast = state.ast
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    data = pickle.dumps(ast)
+    dump_time = time.perf_counter() - start
+    start = time.perf_counter()
+    pickle.loads(data)
+    load_time = time.perf_counter() - start
+
+    print('lines            %10d' % len(source))
+    print('nodes / 1k lines %10d' % (count_nodes(ast) * per_k))
+    print('memory / 1k lines%10.1f KiB' % (memory * per_k / 1024))
+    print('build / 1k lines %10.2f ms' % (build_time * per_k * 1000))
+    print('pickle / 1k lines%10.1f KiB' % (len(data) * per_k / 1024))
+    print('dump / 1k lines  %10.2f ms' % (dump_time * per_k * 1000))
+    print('load / 1k lines  %10.2f ms' % (load_time * per_k * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#! python3
+# Time per line of reading a generated file in BASIC: a FINPUT loop, FOR
+# EACH LINE with an empty body and with the body of the others, and
+# READLINES, with each engine.
+#
+#   python benchmarks/file_lines.py [-n LINES]
+#
+# Run it on two checkouts to compare them.
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import pybasic
+
+programs = [
+    ('FINPUT', '''
+F = OPEN(NAME)
+N = 0
+L = FINPUT(F)
+WHILE L <> NOTHING
+    N = N + LEN$(L)
+    L = FINPUT(F)
+WEND
+CLOSE F
+'''),
+    ('FOR EACH LINE, empty', '''
+FOR EACH LINE L IN FILE NAME
+NEXT L
+'''),
+    ('FOR EACH LINE', '''
+N = 0
+FOR EACH LINE L IN FILE NAME
+    N = N + LEN$(L)
+NEXT L
+'''),
+    ('READLINES', '''
+A = READLINES(NAME)
+N = 0
+FOR I = 0 TO LEN$(A) - 1
+    N = N + LEN$(A(I))
+NEXT I
+'''),
+]
+
+
+def best(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure reading files line by line.')
+    parser.add_argument('-n', dest='lines', type=int, default=200000, help='lines to generate')
+    parser.add_argument('-r', dest='repeat', type=int, default=3, help='runs to time')
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        name = os.path.join(directory, 'lines.log')
+        with open(name, 'w') as f:
+            for i in range(args.lines):
+                f.write('%d GET /index.html 200 %d\n' % (i, i * 7 % 5000))
+        engines = ('closure', 'vm', 'tree')
+        print('%-22s' % 'ns/line' + ''.join('%10s' % x for x in engines))
+        for title, source in programs:
+            row = []
+            for engine in engines:
+                program = pybasic.compile(source, engine=engine)
+                seconds = best(lambda: program.run(inputs={'NAME': name}), args.repeat)
+                row.append(seconds / args.lines * 1e9)
+            print('%-22s' % title + ''.join('%10.0f' % x for x in row))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+#! python3
+# Parse throughput in lines per second, for the generated program of
+# ast_size.py, lexing alone and lexing with parsing.
+#
+#   python benchmarks/parse_speed.py [-n LINES]
+#
+# Run it on two checkouts to compare them.
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ast_size import generate
+from pybasic.basic_lex import tokenize
+from pybasic.basic_yacc import ParseState, parse_source
+
+
+def best(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the speed of the parser.')
+    parser.add_argument('-n', dest='lines', type=int, default=100000, help='lines to generate')
+    parser.add_argument('-r', dest='repeat', type=int, default=3, help='runs to time')
+    args = parser.parse_args()
+    text = ''.join(generate(args.lines))
+    lines = text.count('\n')
+
+    lex_time = best(lambda: sum(1 for _ in tokenize(text)), args.repeat)
+    parse_time = best(lambda: parse_source(text, ParseState()), args.repeat)
+
+    print('lines            %10d' % lines)
+    print('lex              %10.2f s %10d lines/s' % (lex_time, lines / lex_time))
+    print('lex and parse    %10.2f s %10d lines/s' % (parse_time, lines / parse_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#! python3
+# Size and save and load times of the AST of the generated program of
+# ast_size.py, as a binary program file and as a pickle.
+#
+#   python benchmarks/program_file.py [-n LINES]
+import argparse
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ast_size import generate
+from pybasic import basic_binary
+from pybasic.basic_yacc import ParseState, parse_source
+
+
+def best(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare program files with pickles.')
+    parser.add_argument('-n', dest='lines', type=int, default=20000, help='lines to generate')
+    parser.add_argument('-r', dest='repeat', type=int, default=5, help='runs to time')
+    args = parser.parse_args()
+    state = ParseState()
+    parse_source(''.join(generate(args.lines)), state)
+    ast = state.ast
+    sys.setrecursionlimit(100000)
+
+    data = basic_binary.dumps(ast)
+    pickled = pickle.dumps(ast, pickle.HIGHEST_PROTOCOL)
+    rows = [
+        ('program file', len(data),
+            best(lambda: basic_binary.dumps(ast), args.repeat),
+            best(lambda: basic_binary.loads(data), args.repeat)),
+        ('pickle', len(pickled),
+            best(lambda: pickle.dumps(ast, pickle.HIGHEST_PROTOCOL), args.repeat),
+            best(lambda: pickle.loads(pickled), args.repeat)),
+    ]
+    print('lines %d' % args.lines)
+    print('%-14s %10s %10s %10s' % ('', 'KiB', 'save (ms)', 'load (ms)'))
+    for name, size, save, load in rows:
+        print('%-14s %10.1f %10.1f %10.1f' % (name, size / 1024, save * 1000, load * 1000))
+
+    # Reading one FUNCTION from a mapped file.
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, 'program.pba')
+        basic_binary.save(ast, file_name)
+        def one_function():
+            with basic_binary.ProgramFile(file_name) as program:
+                program.function('F0')
+        print('%-14s %21s %10.1f' % ('one FUNCTION', '', best(one_function, args.repeat) * 1000))
+
+
+if __name__ == '__main__':
+    main()
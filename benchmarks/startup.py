@@ -0,0 +1,51 @@
+#! python3
+# Start-up time: running an empty program with python -m pybasic, next to
+# starting Python alone, best of a number of runs in new processes.
+#
+#   python benchmarks/startup.py [-r RUNS]
+#
+# The first run writes the bytecode caches of the package, unless
+# PYTHONDONTWRITEBYTECODE is set, in which case every run compiles it again.
+# Run it on two checkouts to compare them.
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def best(command, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=root, check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return times[0], times[len(times) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the start-up time of the interpreter.')
+    parser.add_argument('-r', dest='runs', type=int, default=20, help='runs to time')
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        program = os.path.join(directory, 'empty.bas')
+        open(program, 'w').close()
+        commands = [
+            ('python', [sys.executable, '-c', 'pass']),
+            ('import pybasic', [sys.executable, '-c', 'import pybasic']),
+            ('python -m pybasic', [sys.executable, '-m', 'pybasic', program]),
+        ]
+        # Warm up, and write the bytecode caches.
+        subprocess.run(commands[-1][1], cwd=root, check=True)
+        print('%-20s %10s %10s' % ('', 'best (ms)', 'median (ms)'))
+        for name, command in commands:
+            low, median = best(command, args.runs)
+            print('%-20s %10.1f %10.1f' % (name, low * 1000, median * 1000))
+
+
+if __name__ == '__main__':
+    main()
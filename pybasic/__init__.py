@@ -5,6 +5,10 @@ __all__ = [
     'SymbolTable',
     'table_stack',
     'global_table',
+    'Interpreter',
+    'InterpreterPool',
+    'Program',
+    'compile',
     'execute',
     'repl',
     'save_ast',
@@ -1,8 +1,13 @@
 import argparse
-import pickle
 import sys
 
-from .basic_yacc import ast, parser, root_stack
+from . import basic_array
+from . import basic_cache
+from . import basic_memo
+from . import basic_modules
+from . import basic_parallel
+from . import basic_vectorize
+from .basic_profile import Profiler
 from .utils import BasicError
 from .pybasic import *
 
@@ -24,17 +29,134 @@ def main():
         help='Save the binary abstract syntax tree of the source program to the given path. '
         'The source program will not be executed. '
         'This will be ignored in REPL mode. ')
+
+    arg_parser.add_argument('--no-cache', action='store_false', dest='cache',
+        help='Parse the source program even if it is unchanged since it was last run, '
+        'and do not cache its syntax tree. ')
+
+    arg_parser.add_argument('--cache-dir', action='store', dest='cache_dir',
+        default=basic_cache.cache_dir,
+        help='Where to cache the syntax trees of programs, so that running them again '
+        'skips parsing them. Defaults to $PYBASIC_CACHE_DIR, or a __pbcache__ '
+        'directory next to each program. ')
+
+    arg_parser.add_argument('-I', '--module-path', action='append', dest='module_path',
+        default=[], metavar='DIR',
+        help='Also look for the modules of USE in DIR, after the working directory and the '
+        'directory of the program. May be given several times; $PYBASIC_PATH lists more '
+        'directories. ')
+
+    arg_parser.add_argument('-e', '--engine', choices=engines, default='closure',
+        help='The execution engine. "closure" compiles the program into Python closures '
+        'before running it, "tree" walks the abstract syntax tree directly, '
+        '"vm" runs bytecode on a stack machine not limited by Python\'s recursion depth. '
+        'Defaults to "closure". ')
+
+    arg_parser.add_argument('--dis', action='store_true', dest='dis',
+        help='Print the bytecode of the source program instead of executing it. ')
+
+    arg_parser.add_argument('-O', type=int, choices=(0, 1, 2), default=1, dest='level',
+        help='The optimization level. 0 runs the program as written, 1 folds constant '
+        'expressions and removes IF branches that can never run, 2 also runs element-wise '
+        'FOR loops over arrays as whole-array operations, evaluates common '
+        'subexpressions once and moves loop-invariant expressions out of loops. '
+        'Defaults to 1. ')
+
+    arg_parser.add_argument('--vectorize-report', action='store_true', dest='vectorize_report',
+        help='Print which FOR loops were vectorized at -O2, and why the others were not. ')
+
+    arg_parser.add_argument('--dump-ast', action='store_true', dest='dump_ast',
+        help='Print the abstract syntax tree before and after optimization to stderr. ')
+
+    arg_parser.add_argument('--no-tco', action='store_false', dest='tco',
+        help='Do not eliminate tail calls: RETURN F(...) nests a new call as written, '
+        'which keeps every frame of a tail-recursive function around for debugging. ')
+
+    arg_parser.add_argument('--no-memoize', action='store_false', dest='memoize',
+        help='Do not cache the results of FUNCTIONs found to be pure. '
+        'MEMOIZE still enables caching for a given function. ')
+
+    arg_parser.add_argument('--memo-size', type=int, default=basic_memo.memo_size, dest='memo_size',
+        help='The number of results cached per function, 0 for no limit. '
+        'Defaults to %d. ' % basic_memo.memo_size)
+
+    arg_parser.add_argument('--memo-eviction', choices=basic_memo.evictions,
+        default=basic_memo.memo_eviction, dest='memo_eviction',
+        help='Which result to drop from a full cache: the least recently used one, '
+        'or the oldest one. Defaults to "%s". ' % basic_memo.memo_eviction)
+
+    arg_parser.add_argument('--memo-stats', action='store_true', dest='memo_stats',
+        help='Print cache hits and misses of every memoized function when the program ends. ')
+
+    arg_parser.add_argument('--array-backend', choices=basic_array.backends,
+        default=basic_array.array_backend, dest='array_backend',
+        help='Where DIM keeps the elements of INTEGER and DECIMAL arrays: typed buffers of '
+        'the array module, or NumPy arrays if NumPy is installed. '
+        'Defaults to "%s". ' % basic_array.array_backend)
+
+    arg_parser.add_argument('--parallel-workers', type=int, default=basic_parallel.workers,
+        dest='parallel_workers',
+        help='The number of worker processes running PARALLEL FOR loops. '
+        'Defaults to the number of CPUs. ')
+
+    arg_parser.add_argument('--parallel-chunk', type=int, default=basic_parallel.chunk_size,
+        dest='parallel_chunk',
+        help='The number of iterations of a PARALLEL FOR loop run by a worker at a time, '
+        '0 to split every loop into %d chunks. Defaults to %d. '
+        % (basic_parallel.default_chunks, basic_parallel.chunk_size))
+
+    arg_parser.add_argument('--profile', action='store_true', dest='profile',
+        help='Profile the program and print call counts, cumulative and self time '
+        'and maximum recursion depth of every function and statement when it ends. '
+        'Requires the closure engine. ')
+
+    arg_parser.add_argument('--profile-sort', choices=Profiler.sort_keys, default='self',
+        dest='profile_sort', help='The column to sort the profile report by. Defaults to "self". ')
+
+    arg_parser.add_argument('--profile-json', action='store', dest='profile_json',
+        help='Also write the profile report to the given JSON file. Implies --profile. ')
     args = arg_parser.parse_args()
+    basic_array.array_backend = args.array_backend
+    basic_cache.enabled = args.cache
+    basic_cache.cache_dir = args.cache_dir
+    basic_modules.search_path[:0] = args.module_path
+    basic_memo.memo_size = args.memo_size
+    if args.parallel_workers < 1 or args.parallel_chunk < 0:
+        arg_parser.error('--parallel-workers must be at least 1 and --parallel-chunk at least 0')
+    basic_parallel.workers = args.parallel_workers
+    basic_parallel.chunk_size = args.parallel_chunk
+    basic_memo.memo_eviction = args.memo_eviction
+    profiler = None
+    if args.profile or args.profile_json:
+        if args.engine != 'closure':
+            arg_parser.error('profiling requires the closure engine')
+        profiler = Profiler()
+    interpreter = Interpreter()
     if not args.program_name:
-        repl()
+        interpreter.repl(args.engine, args.tco, args.memoize)
     else:
         if args.ast_path:
-            save_ast(args.program_name, args.ast_path)
+            interpreter.save_ast(args.program_name, args.ast_path)
             return
-        if args.ast:
-            execute_ast(args.program_name)
+        if args.dis:
+            interpreter.disassemble_program(args.program_name, level=args.level, tco=args.tco)
             return
-        execute(args.program_name)
+        try:
+            if args.ast:
+                interpreter.execute_ast(args.program_name, args.engine, profiler, args.level,
+                    args.dump_ast, args.tco, args.memoize)
+            else:
+                interpreter.execute(args.program_name, args.engine, profiler, args.level,
+                    args.dump_ast, args.tco, args.memoize)
+        finally:
+            if args.memo_stats:
+                basic_memo.report(interpreter.caches)
+            if args.vectorize_report:
+                basic_vectorize.report(interpreter.vector_reports)
+            if profiler is not None:
+                profiler.report(args.profile_sort)
+                if args.profile_json:
+                    profiler.dump_json(args.profile_json, args.profile_sort)
 
 
 if __name__ == '__main__':
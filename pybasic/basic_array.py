@@ -0,0 +1,336 @@
+#! python3
+# Storage of arrays declared with DIM. INTEGER and DECIMAL arrays keep their
+# elements unboxed in one typed buffer, from the array module or from NumPy
+# when selected; one-dimensional arrays of any other type are plain lists.
+# Arrays of several dimensions keep all their elements in one flat buffer in
+# row-major order.
+#
+# Arithmetic operators and the math builtins work on whole arrays, element by
+# element, in one pass over the buffer; scalars are broadcast to every
+# element.
+import operator
+from array import array
+from itertools import repeat
+
+from .utils import BasicError
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Buffer used by new arrays, changed by the command line.
+array_backend = 'array'
+backends = ('array', 'numpy')
+typecodes = {int: 'q', float: 'd'}
+type_names = {int: 'INTEGER', float: 'DECIMAL'}
+
+
+def elementwise(op):
+    # Methods for a binary operator and its reflected form.
+    def apply(self, other):
+        return self.combine(op, other, False)
+    def reflected(self, other):
+        return self.combine(op, other, True)
+    return apply, reflected
+
+
+def pack(values):
+    # Buffer and element type for computed values.
+    try:
+        return array('q', values), int
+    except OverflowError:
+        return values, int
+    except TypeError:
+        pass
+    try:
+        return array('d', values), float
+    except TypeError:
+        return values, values[0].__class__
+
+
+def is_numpy(data):
+    return numpy is not None and isinstance(data, numpy.ndarray)
+
+
+class BasicArray:
+    __slots__ = ('type', 'data')
+    # Mutable like lists, so never a memo key.
+    __hash__ = None
+
+    def __init__(self, type, size):
+        self.type = type
+        code = typecodes.get(type)
+        length = max(size + 1, 0)
+        if code is None:
+            self.data = [type() for _ in range(length)]
+        elif array_backend == 'numpy':
+            if numpy is None:
+                raise BasicError('The numpy array backend needs NumPy installed')
+            self.data = numpy.zeros(length, dtype=code)
+        else:
+            self.data = array(code, bytes(length * array(code).itemsize))
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __getitem__(self, index):
+        return self.data[index]
+
+    def __setitem__(self, index, value):
+        # Values of another type are converted like AS does.
+        if value.__class__ is not self.type:
+            value = self.convert(value)
+        try:
+            self.data[index] = value
+        except OverflowError:
+            # Too large for 64 bits: keep exact integers in a list instead.
+            self.data = self.data.tolist()
+            self.data[index] = value
+
+    def convert(self, value):
+        try:
+            return self.type(value)
+        except (TypeError, ValueError, OverflowError):
+            type_name = type_names.get(self.type, self.type.__name__.upper())
+            raise BasicError('Cannot store %s in an array of %s' % (value, type_name))
+
+    def store(self, first, last, value):
+        # Sets elements first to last, both included, to value or to the
+        # elements of the array value, converted like single stores.
+        values = value.data if isinstance(value, BasicArray) else [value] * (last - first + 1)
+        data = self.data
+        try:
+            if data.__class__ is array:
+                if values.__class__ is not array or values.typecode != data.typecode:
+                    values = array(data.typecode, map(self.type, values))
+            elif data.__class__ is list:
+                values = list(map(self.type, values))
+            data[first:last + 1] = values
+        except (TypeError, ValueError, OverflowError):
+            # Report the failing element, or keep exact integers.
+            for index, value in enumerate(values, first):
+                self[index] = value
+
+    def tolist(self):
+        data = self.data
+        return data if data.__class__ is list else data.tolist()
+
+    def __eq__(self, other):
+        if isinstance(other, BasicArray):
+            other = other.tolist()
+        return self.tolist() == other
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+    @staticmethod
+    def of(values):
+        # A one-dimensional array holding values, such as an array literal.
+        result = object.__new__(BasicArray)
+        result.data, result.type = pack(list(values))
+        return result
+
+    def new(self, type, data):
+        # An array shaped like this one.
+        result = object.__new__(self.__class__)
+        result.type, result.data = type, data
+        return result
+
+    def dimensions(self):
+        return (len(self.data),)
+
+    def combine(self, op, other, reflected):
+        data = self.data
+        if isinstance(other, list):
+            other = BasicArray.of(other)
+        if isinstance(other, BasicArray):
+            if self.dimensions() != other.dimensions():
+                raise BasicError('Arrays of different shapes %s and %s' % (self.dimensions(), other.dimensions()))
+            other = other.data
+            if is_numpy(data) and is_numpy(other):
+                return self.from_numpy(op(other, data) if reflected else op(data, other))
+            others = other
+        elif is_numpy(data):
+            return self.from_numpy(op(other, data) if reflected else op(data, other))
+        else:
+            others = repeat(other)
+        if reflected:
+            data, others = others, data
+        return self.new(*reversed(pack(list(map(op, data, others)))))
+
+    def map(self, func, ufunc=None):
+        # func applied to every element, or the NumPy ufunc of that name.
+        if ufunc is not None and is_numpy(self.data):
+            return self.from_numpy(getattr(numpy, ufunc)(self.data))
+        return self.new(*reversed(pack(list(map(func, self.data)))))
+
+    def from_numpy(self, data):
+        return self.new(int if data.dtype.kind in 'iub' else float, data)
+
+    __add__, __radd__ = elementwise(operator.add)
+    __sub__, __rsub__ = elementwise(operator.sub)
+    __mul__, __rmul__ = elementwise(operator.mul)
+    __truediv__, __rtruediv__ = elementwise(operator.truediv)
+    __floordiv__, __rfloordiv__ = elementwise(operator.floordiv)
+    __mod__, __rmod__ = elementwise(operator.mod)
+    __pow__, __rpow__ = elementwise(operator.pow)
+
+    def __neg__(self):
+        return self.map(operator.neg, 'negative')
+
+    def __abs__(self):
+        return self.map(abs, 'absolute')
+
+    def slice(self, first, last):
+        # Elements first to last, both included, as a new array.
+        check_slice(first, last, len(self))
+        return self.new(self.type, self.part(first, last + 1))
+
+    def part(self, start, stop):
+        data = self.data[start:stop]
+        return data.copy() if is_numpy(data) else data
+
+
+class BasicMatrix(BasicArray):
+    # An array of two or more dimensions. DIM M(2, 3) has a shape of (3, 4)
+    # and strides of (4, 1): M(I, J) is element I * 4 + J of the buffer.
+    __slots__ = ('shape', 'strides', 'rows', 'columns')
+
+    def __init__(self, type, sizes):
+        self.shape = tuple(max(size + 1, 0) for size in sizes)
+        strides = [1]
+        for length in reversed(self.shape[1:]):
+            strides.append(strides[-1] * length)
+        self.strides = tuple(reversed(strides))
+        # Matrices are common enough to skip the general loop: columns is
+        # only set for two dimensions.
+        self.rows = self.shape[0]
+        self.columns = self.shape[1] if len(self.shape) == 2 else 0
+        super().__init__(type, self.strides[0] * self.shape[0] - 1)
+
+    def offset(self, indices):
+        shape = self.shape
+        if len(indices) != len(shape):
+            raise BasicError('Array of %d dimensions indexed with %d subscripts' % (len(shape), len(indices)))
+        offset = 0
+        for dimension, index in enumerate(indices):
+            if not 0 <= index < shape[dimension]:
+                raise BasicError('Index %d is out of range in dimension %d (maximum %d)'
+                    % (index, dimension + 1, shape[dimension] - 1))
+            offset += index * self.strides[dimension]
+        return offset
+
+    def new(self, type, data, shape=None):
+        result = super().new(type, data)
+        shape = shape or self.shape
+        result.shape, result.strides = shape, self.strides
+        result.rows, result.columns = shape[0], self.columns
+        return result
+
+    def dimensions(self):
+        return self.shape
+
+    def slice(self, first, last):
+        # Rows first to last of the first dimension.
+        check_slice(first, last, self.rows)
+        stride = self.strides[0]
+        shape = (max(last - first + 1, 0),) + self.shape[1:]
+        return self.new(self.type, self.part(first * stride, (last + 1) * stride), shape)
+
+    def get(self, indices):
+        columns = self.columns
+        if columns and len(indices) == 2:
+            i, j = indices
+            if 0 <= i < self.rows and 0 <= j < columns:
+                return self.data[i * columns + j]
+        return self.data[self.offset(indices)]
+
+    def set(self, indices, value):
+        columns = self.columns
+        if columns and len(indices) == 2:
+            i, j = indices
+            if 0 <= i < self.rows and 0 <= j < columns:
+                self[i * columns + j] = value
+                return
+        self[self.offset(indices)] = value
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def tolist(self):
+        # Nested lists, one level per dimension.
+        rows = BasicArray.tolist(self)
+        for length in reversed(self.shape[1:]):
+            rows = [rows[i:i + length] for i in range(0, len(rows), length)]
+        return rows
+
+
+# Values indexed like arrays by the engines.
+array_types = (list, BasicArray)
+
+
+def as_array(value):
+    return BasicArray.of(value) if isinstance(value, list) else value
+
+
+def vectorize(func, ufunc):
+    # A math function which also applies to every element of an array,
+    # through the NumPy ufunc of that name for NumPy buffers.
+    def apply(x, *args):
+        try:
+            return func(x, *args)
+        except TypeError:
+            if args or not isinstance(x, array_types):
+                raise
+        return as_array(x).map(func, ufunc)
+    return apply
+
+
+def elements(value):
+    value = as_array(value)
+    if not isinstance(value, BasicArray):
+        raise BasicError('%s is not an array' % (value,))
+    data = value.data
+    return data.tolist() if is_numpy(data) else data
+
+
+# FUNCTION SUM(A) ' sum of the elements of A
+def basic_sum(a):
+    return sum(elements(a))
+
+# FUNCTION MAX(A) / MAX(X, Y, ...) ' largest element of A, or largest argument
+def basic_max(*args):
+    return max(elements(args[0])) if len(args) == 1 else max(args)
+
+# FUNCTION MIN(A) / MIN(X, Y, ...) ' smallest element of A, or smallest argument
+def basic_min(*args):
+    return min(elements(args[0])) if len(args) == 1 else min(args)
+
+# FUNCTION DOT(A, B) ' sum of the products of matching elements of A and B
+def basic_dot(a, b):
+    a, b = as_array(a), as_array(b)
+    xs, ys = elements(a), elements(b)
+    if a.dimensions() != b.dimensions():
+        raise BasicError('Arrays of different shapes %s and %s' % (a.dimensions(), b.dimensions()))
+    return sum(map(operator.mul, xs, ys))
+
+
+def check_slice(first, last, length):
+    if first < 0 or last >= length:
+        raise BasicError('Slice %d TO %d is out of range (maximum %d)' % (first, last, length - 1))
+
+
+def slice_array(value, first, last):
+    if isinstance(value, list):
+        check_slice(first, last, len(value))
+        return value[first:last + 1]
+    if not isinstance(value, BasicArray):
+        raise BasicError('%s is not an array' % (value,))
+    return value.slice(first, last)
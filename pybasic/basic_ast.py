@@ -1,12 +1,13 @@
 #! python3
-import runpy
 import sys
-from os import path
-import traceback
+from sys import intern
 
 from . import basic_lib
 from . import basic_operators
 from . import basic_types
+from .basic_array import BasicArray, BasicMatrix, array_types
+from .basic_modules import use
+from .basic_parallel import parallel_for, runners
 from .symbol_table import SymbolTable, global_table, table_stack
 from .utils import Stack, item_getter, BasicError
 
@@ -23,31 +24,6 @@ def stack_size2a(size=2):
         if not frame:
             return size
 
-class tracer(object):
-    registry = {}
-    def __init__(self, func):       # On @ decorator
-        self.calls = 0              # Save func for later call
-        self.func = func
-        self.max_lvl = 0
-        tracer.registry[func.__name__] = self
-
-    def __call__(self, *args, **kwargs):  # On call to original func
-        self.calls += 1
-        if self.calls > self.max_lvl:
-             self.max_lvl = self.calls
-             # sys._debugmallocstats()
-             # traceback.print_stack()
-             # print(f'stack depth = {stack_size2a()}')
-        # print(f'RUN {self.type} {self.value}', file=sys.stderr)
-        r = self.func(*args, **kwargs)
-        self.calls -= 1
-        return r
-
-    def __get__(self, instance, owner):   # On method fetch
-        def wrapper(*args, **kwargs):     # Retain both inst
-            return self(instance, *args, **kwargs) # Runs __call__
-        return wrapper
-
 class ASTControl:
     def __init__(self, msg, value=None):
         self.msg = msg
@@ -58,14 +34,31 @@ class ASTControl:
 
 
 class ASTNode:
+    # Programs are made of many small nodes, so they have no __dict__ and no
+    # pointer to their parent. The tree passed in is taken over, not copied,
+    # and leaves share an empty one until a child is added.
+    __slots__ = ('type', 'value', 'tree', 'lineno')
     literals = ('number', 'string')
-
-    def __init__(self, type='', value='', tree=[], parent=None):
-        self.type = type
+    leaf = ()
+    # Index of the block opened by a multi-line statement; 1 for the others.
+    block_index = {'<FOR>': 4, '<FOR_EACH>': 2, '<PARALLEL_FOR>': 4, '<SUB>': 2, '<FUNCTION>': 2}
+
+    def __init__(self, type='', value='', tree=()):
+        # Kinds and names are interned so that equal ones share one string.
+        self.type = intern(type)
+        if type != 'string' and value.__class__ is str:
+            value = intern(value)
         self.value = value
-        self.tree = tree[:]
-        self.parent = parent
-        self.block = None
+        self.tree = tree or ASTNode.leaf
+        # Source line of statement nodes, set by the parser.
+        self.lineno = 0
+
+    def __reduce__(self):
+        # Pickled as a constructor call, which also interns names on load.
+        return ASTNode, (self.type, self.value, self.tree), self.lineno or None
+
+    def __setstate__(self, lineno):
+        self.lineno = lineno
 
     def __str__(self):
         return '<ASTNode type="%s", value="%s">' % (self.type, self.value)
@@ -82,10 +75,15 @@ class ASTNode:
     def NothingNode(cls):
         return cls(type='number', value=None)
 
+    @property
+    def block(self):
+        return self.tree[self.block_index.get(self.value, 1)]
+
     def add(self, node):
-        self.tree.append(node)
-        if isinstance(node, ASTNode):
-            node.parent = self
+        if self.tree is ASTNode.leaf:
+            self.tree = [node]
+        else:
+            self.tree.append(node)
 
     def add_group(self, nodes):
         for node in nodes:
@@ -104,15 +102,25 @@ class ASTNode:
             if isinstance(node, ASTNode) and node.tree:
                 node.show(layer + 1, node is self.tree[-1])
 
+    def run_preheader(self, index):
+        # Loop nodes may carry a block hoisted out of their body by the
+        # optimizer, run once before the first iteration.
+        if len(self.tree) > index:
+            self.tree[index].run()
+
     def run_flag(self):
         if self.value == '<PROGRAM>':
             for node in self.tree:
                 node.run()
 
         elif self.value in ('<SUB>', '<FUNCTION>'):
+            # Globals of the table it is defined in, which is not the
+            # caller's for the functions of a module.
+            gtab = table_stack.top().gtab
 
             def func(n):
                 local_table = SymbolTable(table_stack.top())
+                local_table.gtab = gtab
                 # compute in caller's level
                 for index, param in enumerate(self.tree[1]):
                     local_table.set(param, n[index].run())
@@ -151,26 +159,42 @@ class ASTNode:
             return False
 
         elif self.value == '<FOR>':
+            # TO and STEP are evaluated once, like in classic BASIC.
             loop_var_name = self.tree[0].value
-            start = self.tree[1].run()
-            get_end = lambda: self.tree[2].run()
-            get_step = lambda: self.tree[3].run()
-            table_stack.top().set(loop_var_name, start)
-            while True:
-                loop_var = table_stack.top().get(loop_var_name)
+            loop_var, end, step = (node.run() for node in self.tree[1:4])
+            ascending = step >= 0
+            table = table_stack.top()
+            table.set(loop_var_name, loop_var)
+            if loop_var <= end if ascending else loop_var >= end:
+                self.run_preheader(5)
+            while loop_var <= end if ascending else loop_var >= end:
                 result = self.tree[4].run()
                 if isinstance(result, ASTControl):
                     if result.msg == 'break':
                         break
-                    elif result.msg == 'continue':
-                        continue
                     elif result.msg == 'return':
                         return result
-                table_stack.top().set(loop_var_name, loop_var + get_step())
-                if loop_var == get_end():
-                    break
+                loop_var = table.get(loop_var_name) + step
+                table.set(loop_var_name, loop_var)
+
+        elif self.value == '<FOR_EACH>':
+            loop_var_name = self.tree[0].value
+            table = table_stack.top()
+            for line in basic_lib.each_line(self.tree[1].run()):
+                table.set(loop_var_name, line)
+                result = self.tree[2].run()
+                if isinstance(result, ASTControl):
+                    if result.msg == 'break':
+                        break
+                    elif result.msg == 'return':
+                        return result
+
+        elif self.value == '<PARALLEL_FOR>':
+            start, end, step = (node.run() for node in self.tree[1:4])
+            parallel_for(self, start, end, step, 'tree', table_stack.top())
 
         elif self.value == '<DO>':
+            self.run_preheader(2)
             while True:
                 result = self.tree[1].run()
                 if isinstance(result, ASTControl):
@@ -184,7 +208,11 @@ class ASTNode:
                     break
 
         elif self.value == '<WHILE>':
+            preheader = len(self.tree) > 2
             while self.tree[0].run() is True:
+                if preheader:
+                    self.run_preheader(2)
+                    preheader = False
                 result = self.tree[1].run()
                 if isinstance(result, ASTControl):
                     if result.msg == 'break':
@@ -207,20 +235,19 @@ class ASTNode:
             sys.exit(0)
             return ASTControl('end')
 
-        elif self.value == '<RUN_PY>':
-            file_name = self.tree[0]
-            if path.isfile(file_name):
-                runpy.run_path(file_name)
+        elif self.value == '<USE>':
+            use(self.tree[0], 'tree', table_stack.top())
 
-    @tracer
     def run(self):
         if self.type == 'flag':
             return self.run_flag()
 
         elif self.type == 'funcall':
             func = table_stack.top().get(self.value)
-            if isinstance(func, list):
-                getter = item_getter(func)
+            if isinstance(func, array_types):
+                if func.__class__ is BasicMatrix:
+                    return func.get([x.run() for x in self.tree])
+                getter = item_getter(func.data if func.__class__ is BasicArray else func)
                 return getter(self.tree)
             try:
                 return func(self.tree)
@@ -240,3 +267,6 @@ class ASTNode:
 def build_ast():
     root = ASTNode(type='flag', value='<PROGRAM>')
     return root
+
+
+runners['tree'] = lambda program: program.run
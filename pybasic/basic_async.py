@@ -0,0 +1,282 @@
+#! python3
+# Cooperative tasks.
+#
+#   T = SPAWN FETCH("a.txt")
+#   C = CHANNEL()
+#   SPAWN PRODUCE(C)
+#   PRINT RECEIVE(C), AWAIT(T)
+#
+# SPAWN F(...) calls F in a new task and returns at once. Every task has a
+# thread of its own, but the tasks pass a single baton around and only the
+# task holding it runs BASIC code, so they only switch where a task waits:
+# YIELD, AWAIT, SEND to a full channel, RECEIVE from an empty one, and the
+# blocking builtins SLEEP, INPUT, FINPUT and PAUSE. The blocking builtins
+# hand the baton over while they wait, so the waits of many tasks overlap.
+# Each task has a symbol table stack of its own, swapped in when it gets the
+# baton. The program ends once every task it spawned has ended. Each
+# Context has a Scheduler of its own.
+import threading
+from collections import deque
+
+from .basic_array import BasicArray
+from .symbol_table import global_table, table_stack
+from .utils import BasicError
+
+# Event loop of wait_for(), started on first use and shared by every
+# interpreter.
+loop = None
+
+
+class Task:
+    def __init__(self, frames):
+        self.frames = frames
+        self.event = threading.Event()
+        self.done = False
+        self.result = None
+        self.error = None
+        # Tasks waiting for this one to end.
+        self.waiters = []
+
+    def __repr__(self):
+        return '<TASK %s>' % ('DONE' if self.done else 'RUNNING')
+
+
+class Value:
+    # An evaluated argument, for functions expecting argument nodes.
+    __slots__ = ('result',)
+
+    def __init__(self, result):
+        self.result = result
+
+    def run(self):
+        return self.result
+
+
+class Scheduler:
+    # The tasks of one Context.
+    def __init__(self, context):
+        self.context = context
+        # The task holding the baton, and the task of the main program.
+        self.running = None
+        self.main = None
+        # Tasks waiting for the baton, in the order they will get it.
+        self.ready = deque()
+        # Number of tasks in a blocking builtin, which will want the baton
+        # back.
+        self.blocked = 0
+        self.lock = threading.Lock()
+        # Tasks whose end nobody has seen yet.
+        self.pending = {}
+        # The SystemExit of an END run by a task, raised in every task
+        # resumed.
+        self.exiting = None
+
+    def current(self):
+        # The running task; the first call makes one of the main program.
+        if self.running is None:
+            self.running = self.main = Task(table_stack.items)
+        return self.running
+
+    def wake(self, task):
+        # Makes task ready to run again.
+        with self.lock:
+            if self.running is None:
+                self.running = task
+                task.event.set()
+            else:
+                self.ready.append(task)
+
+    def release(self, waiting):
+        # Hands the baton to the next ready task. waiting is True when the
+        # running task waits for another one to wake it.
+        with self.lock:
+            if waiting and not self.ready and not self.blocked:
+                raise BasicError('Deadlock: every task is waiting for another one')
+            self.running = self.ready.popleft() if self.ready else None
+            if self.running is not None:
+                self.running.event.set()
+
+    def resume(self, task):
+        task.event.wait()
+        task.event.clear()
+        table_stack.items, table_stack.context = task.frames, self.context
+        if self.exiting is not None:
+            raise self.exiting
+
+    def switch(self):
+        # Lets other tasks run until the running task is woken.
+        task = self.current()
+        self.release(True)
+        self.resume(task)
+
+    def blocking(self, func, *args):
+        task = self.running
+        with self.lock:
+            self.blocked += 1
+        self.release(False)
+        try:
+            return func(*args)
+        finally:
+            with self.lock:
+                self.blocked -= 1
+            self.wake(task)
+            self.resume(task)
+
+    def spawn(self, func, args):
+        self.current()
+        task = Task([self.context.globals])
+        self.pending[task] = None
+        threading.Thread(target=self.run_task, args=(task, func, args), daemon=True).start()
+        self.wake(task)
+        return task
+
+    def run_task(self, task, func, args):
+        try:
+            self.resume(task)
+            task.result = func(args)
+        except SystemExit as error:
+            # END: only the main program can exit, wherever it waits.
+            task.error = self.exiting = error
+            self.wake(self.main)
+        except BaseException as error:
+            task.error = error
+        task.done = True
+        if task.error is None:
+            self.pending.pop(task, None)
+        for waiter in task.waiters:
+            self.wake(waiter)
+        self.release(False)
+
+    def join(self, task):
+        # Waits for the end of task, or of every task in an array, and
+        # returns its result.
+        if isinstance(task, (list, BasicArray)):
+            return [self.join(x) for x in task]
+        if task.__class__ is not Task:
+            raise BasicError('%s is not a task' % (task,))
+        if not task.done:
+            task.waiters.append(self.current())
+            self.switch()
+        self.pending.pop(task, None)
+        if task.error is not None:
+            raise task.error
+        return task.result
+
+    def finish(self):
+        # Waits for the tasks nobody waited for when the program ends,
+        # raising the first error among them.
+        while self.pending:
+            self.join(next(iter(self.pending)))
+
+
+def scheduler():
+    # Scheduler of the running Context.
+    context = table_stack.context
+    if context.scheduler is None:
+        context.scheduler = Scheduler(context)
+    return context.scheduler
+
+
+def blocking(func, *args):
+    # Calls func, which may wait for a while, letting other tasks run until
+    # it returns.
+    tasks = table_stack.context.scheduler
+    if tasks is None or tasks.running is None:
+        return func(*args)
+    return tasks.blocking(func, *args)
+
+
+def wait_for(coroutine):
+    # Runs an asyncio coroutine on the event loop, letting other tasks run
+    # until it is done. For Python modules adding builtins which wait.
+    global loop
+    import asyncio
+    if loop is None:
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, daemon=True).start()
+    return blocking(lambda: asyncio.run_coroutine_threadsafe(coroutine, loop).result())
+
+
+def finish():
+    if table_stack.context.scheduler is not None:
+        table_stack.context.scheduler.finish()
+
+
+class Channel:
+    # Values passed between tasks in order. A channel of size N holds at
+    # most N values; SEND waits while it is full.
+    def __init__(self, size=0):
+        self.size = size
+        self.values = deque()
+        self.receivers = deque()
+        self.senders = deque()
+        self.closed = False
+
+    def __repr__(self):
+        return '<CHANNEL %d>' % len(self.values)
+
+    def send(self, value):
+        tasks = scheduler()
+        while self.size and len(self.values) >= self.size and not self.closed:
+            self.senders.append(tasks.current())
+            tasks.switch()
+        if self.closed:
+            raise BasicError('SEND to a closed channel')
+        self.values.append(value)
+        if self.receivers:
+            tasks.wake(self.receivers.popleft())
+
+    def receive(self):
+        tasks = scheduler()
+        while not self.values:
+            if self.closed:
+                return None
+            self.receivers.append(tasks.current())
+            tasks.switch()
+        value = self.values.popleft()
+        if self.senders:
+            tasks.wake(self.senders.popleft())
+        return value
+
+    def close(self):
+        # Wakes every task waiting on the channel. RECEIVE returns NOTHING
+        # once a closed channel is empty.
+        self.closed = True
+        tasks = scheduler()
+        while self.receivers:
+            tasks.wake(self.receivers.popleft())
+        while self.senders:
+            tasks.wake(self.senders.popleft())
+
+
+# T = SPAWN F(...) ' call F in a new task
+@global_table.register('<SPAWN>')
+def basic_spawn(n):
+    func = n[0].run()
+    if not callable(func):
+        raise BasicError('Cannot SPAWN %s, which is not a SUB or FUNCTION' % n[0].value)
+    return scheduler().spawn(func, [Value(x.run()) for x in n[1:]])
+
+# FUNCTION AWAIT(T) ' wait for task T, or every task in array T, to end and return its result
+@global_table.register('await')
+def basic_await(n):
+    tasks = scheduler()
+    if len(n) == 1:
+        return tasks.join(n[0].run())
+    return [tasks.join(x.run()) for x in n]
+
+# YIELD ' let the other ready tasks run
+@global_table.register('yield')
+def basic_yield(n):
+    tasks = scheduler()
+    tasks.wake(tasks.current())
+    tasks.switch()
+
+# FUNCTION CHANNEL([N]) ' new channel holding at most N values, any number by default
+global_table.reflect('channel', Channel)
+
+# SEND C, V ' pass V to channel C
+global_table.reflect('send', lambda channel, value: channel.send(value))
+
+# FUNCTION RECEIVE(C) ' next value of channel C, NOTHING once it is closed and empty
+global_table.reflect('receive', lambda channel: channel.receive())
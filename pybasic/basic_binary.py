@@ -0,0 +1,283 @@
+#! python3
+# Binary program files, as written by --save and read by --ast: a parsed
+# program, made of nothing but nodes, lists, tuples, None, booleans, numbers
+# and strings, so loading one runs no code from the file.
+#
+# A file is a header, a constant pool, a code table and a function index:
+#
+#   header     magic, format version, size of a code, then the offset and
+#              length of each of the three sections, little-endian
+#   constants  each distinct constant once: a tag byte, then its value
+#   codes      16-bit integers, or 32-bit ones if some code does not fit, the
+#              tree in pre-order; a code of 0 or more is the constant of that
+#              index, LIST n and TUPLE n a list or tuple whose n items follow,
+#              and NODE - t, lineno, n a node of the type in constant t, whose
+#              value and n children follow
+#   functions  pairs of the constant holding the name of a SUB or FUNCTION
+#              and the index of the code of its node
+#
+# A subtree is a run of codes, read in one pass without recursion, so deep
+# trees load like flat ones, and ProgramFile reads the code of a single SUB
+# or FUNCTION from a mapped file without reading the rest.
+import mmap
+import struct
+import sys
+from array import array
+from itertools import islice
+from sys import intern
+
+from .basic_ast import ASTNode
+from .utils import BasicError
+
+magic = b'PYBASAST'
+version = 1
+header = struct.Struct('<8sHH6I')
+
+LIST, TUPLE, NODE = -1, -2, -3
+# Array types of codes by size.
+typecodes = {2: 'h', 4: 'i'}
+functions = ('<SUB>', '<FUNCTION>')
+small_int = struct.Struct('<q')
+double = struct.Struct('<d')
+length = struct.Struct('<I')
+
+
+# The program file of the tree under node, as bytes.
+def dumps(node):
+    codes = array('i')
+    pool = {}
+    constants = bytearray()
+    index = []
+
+    def constant(value):
+        cls = value.__class__
+        key = (cls, value.hex() if cls is float else value)
+        number = pool.get(key)
+        if number is not None:
+            return number
+        if value is None:
+            constants.extend(b'N')
+        elif cls is bool:
+            constants.extend(b'T' if value else b'F')
+        elif cls is int:
+            if -2 ** 63 <= value < 2 ** 63:
+                constants.extend(b'i' + small_int.pack(value))
+            else:
+                data = value.to_bytes(value.bit_length() // 8 + 1, 'little', signed=True)
+                constants.extend(b'I' + length.pack(len(data)) + data)
+        elif cls is float:
+            constants.extend(b'f' + double.pack(value))
+        elif cls is str:
+            data = value.encode('utf8', 'surrogatepass')
+            constants.extend(b's' + length.pack(len(data)) + data)
+        else:
+            raise BasicError('Cannot save a %s in a program file' % cls.__name__)
+        number = pool[key] = len(pool)
+        return number
+
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        cls = item.__class__
+        if cls is ASTNode:
+            if item.type == 'flag' and item.value in functions:
+                index.append((constant(item.tree[0]), len(codes)))
+            codes.extend((NODE - constant(item.type), item.lineno, len(item.tree)))
+            stack.extend(reversed(item.tree))
+            stack.append(item.value)
+        elif cls is list or cls is tuple:
+            codes.extend((LIST if cls is list else TUPLE, len(item)))
+            stack.extend(reversed(item))
+        else:
+            codes.append(constant(item))
+    index = array('i', [x for pair in index for x in pair])
+    if -2 ** 15 <= min(codes, default=0) and max(codes, default=0) < 2 ** 15:
+        codes = array('h', codes)
+    if sys.byteorder != 'little':
+        codes.byteswap()
+        index.byteswap()
+    # Codes and the index start on a multiple of 4 bytes, for mapping them
+    # as integers.
+    constants.extend(bytes(-(header.size + len(constants)) % 4))
+    size = codes.itemsize
+    codes = codes.tobytes()
+    codes += bytes(-len(codes) % 4)
+    codes_offset = header.size + len(constants)
+    index_offset = codes_offset + len(codes)
+    return b''.join((
+        header.pack(magic, version, size, header.size, len(pool),
+                    codes_offset, len(codes), index_offset, len(index) // 2),
+        constants, codes, index.tobytes()))
+
+
+def read_constants(data, offset, count):
+    constants = []
+    append = constants.append
+    for _ in range(count):
+        tag = data[offset]
+        offset += 1
+        if tag == 115:      # s
+            size, = length.unpack_from(data, offset)
+            offset += 4
+            append(intern(str(data[offset:offset + size], 'utf8', 'surrogatepass')))
+            offset += size
+        elif tag == 105:    # i
+            append(small_int.unpack_from(data, offset)[0])
+            offset += 8
+        elif tag == 102:    # f
+            append(double.unpack_from(data, offset)[0])
+            offset += 8
+        elif tag == 73:     # I
+            size, = length.unpack_from(data, offset)
+            offset += 4
+            append(int.from_bytes(data[offset:offset + size], 'little', signed=True))
+            offset += size
+        elif tag in b'NTF':
+            append(None if tag == 78 else tag == 84)
+        else:
+            raise BasicError('Corrupt program file')
+    return constants
+
+
+# The item whose code starts at codes[i].
+def decode(codes, constants, i):
+    new = ASTNode.__new__
+    leaf = ASTNode.leaf
+    codes = islice(codes, i, None)
+    take = codes.__next__
+    stack = []
+    items = []
+    append = items.append
+    need = 1
+    for code in codes:
+        if code >= 0:
+            append(constants[code])
+        elif code <= NODE:
+            node = new(ASTNode)
+            node.type = constants[NODE - code]
+            node.lineno = take()
+            stack.append((items, need, node))
+            items = []
+            append = items.append
+            need = take() + 1
+            continue
+        else:
+            n = take()
+            if n:
+                stack.append((items, need, code))
+                items = []
+                append = items.append
+                need = n
+                continue
+            append([] if code == LIST else ())
+        need -= 1
+        while not need:
+            if not stack:
+                return items[0]
+            parent_items, need, container = stack.pop()
+            if container.__class__ is ASTNode:
+                container.value = items[0]
+                container.tree = items[1:] if len(items) > 1 else leaf
+            elif container == LIST:
+                container = items
+            else:
+                container = tuple(items)
+            items = parent_items
+            append = items.append
+            append(container)
+            need -= 1
+    raise ValueError('Truncated codes')
+
+
+# Where the sections of a program file are: the type of its codes, then the
+# offset and length of each section.
+def read_header(data):
+    try:
+        fields = header.unpack_from(data)
+    except struct.error:
+        raise BasicError('Not a program file') from None
+    if fields[0] != magic:
+        raise BasicError('Not a program file')
+    if fields[1] != version:
+        raise BasicError('Program file of version %d, expected %d' % (fields[1], version))
+    if fields[2] not in typecodes:
+        raise BasicError('Corrupt program file')
+    return (typecodes[fields[2]],) + fields[3:]
+
+
+def codes_of(data, typecode, offset, size):
+    codes = array(typecode)
+    codes.frombytes(data[offset:offset + size - size % codes.itemsize])
+    if sys.byteorder != 'little':
+        codes.byteswap()
+    return codes
+
+
+# The tree of a program file given as bytes.
+def loads(data):
+    typecode, constants_offset, constants_count, codes_offset, codes_size, _, _ = read_header(data)
+    try:
+        constants = read_constants(data, constants_offset, constants_count)
+        return decode(codes_of(data, typecode, codes_offset, codes_size), constants, 0)
+    except (IndexError, ValueError, StopIteration, struct.error):
+        raise BasicError('Corrupt program file') from None
+
+
+def save(node, file_name):
+    with open(file_name, 'wb') as f:
+        f.write(dumps(node))
+
+
+def load(file_name):
+    with open(file_name, 'rb') as f:
+        return loads(f.read())
+
+
+class ProgramFile:
+    # A program file mapped in memory, to read SUBs and FUNCTIONs from one at
+    # a time. Only the constant pool is read when it is opened.
+    def __init__(self, file_name):
+        with open(file_name, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (typecode, constants_offset, constants_count, codes_offset, codes_size,
+            index_offset, index_count) = read_header(self.data)
+        try:
+            self.constants = read_constants(self.data, constants_offset, constants_count)
+            index = codes_of(self.data, 'i', index_offset, index_count * 8)
+            self.functions = {self.constants[index[i]]: index[i + 1]
+                              for i in range(0, len(index), 2)}
+        except (IndexError, ValueError, StopIteration, struct.error):
+            raise BasicError('Corrupt program file') from None
+        self.view = memoryview(self.data)[codes_offset:codes_offset + codes_size]
+        if sys.byteorder == 'little' and len(self.view) == codes_size:
+            self.codes = self.view.cast(typecode)
+        else:
+            self.codes = codes_of(self.view, typecode, 0, codes_size)
+
+    # The node of the SUB or FUNCTION of the given name.
+    def function(self, name):
+        if name not in self.functions:
+            raise BasicError('No SUB or FUNCTION %s in program file' % name)
+        try:
+            return decode(self.codes, self.constants, self.functions[name])
+        except (IndexError, ValueError, StopIteration):
+            raise BasicError('Corrupt program file') from None
+
+    # The tree of the whole program.
+    def program(self):
+        try:
+            return decode(self.codes, self.constants, 0)
+        except (IndexError, ValueError, StopIteration):
+            raise BasicError('Corrupt program file') from None
+
+    def close(self):
+        if isinstance(self.codes, memoryview):
+            self.codes.release()
+        self.view.release()
+        self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
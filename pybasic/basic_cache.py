@@ -0,0 +1,95 @@
+#! python3
+# Cache of parsed programs on disk, so that running an unchanged program
+# again skips lexing and parsing it, like __pycache__ for Python modules.
+#
+# The tree of PROG.bas is kept in __pbcache__/PROG.bas.ast next to it, or in
+# cache_dir, and so are those of the modules it uses. An entry is only used
+# if it was made from the same source, by the same grammar and cache
+# version. Entries are written to a temporary file renamed over the old
+# one, so processes running the same program at once each read a whole
+# entry. A cache which cannot be written is skipped.
+import hashlib
+import os
+from os import path
+
+from . import basic_binary
+from . import basic_yacc
+from .utils import BasicError
+
+# Settings, changed by the command line. With cache_dir None, entries are
+# kept next to the programs.
+enabled = True
+cache_dir = os.environ.get('PYBASIC_CACHE_DIR') or None
+# Changes whenever the trees of older versions cannot be used.
+version = 3
+
+
+def digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+# Digest of a file, None if there is no such file.
+def file_digest(file_name):
+    try:
+        with open(file_name, 'rb') as f:
+            return digest(f.read())
+    except OSError:
+        return None
+
+
+def cache_path(file_name):
+    file_name = path.abspath(file_name)
+    directory, base = path.split(file_name)
+    if cache_dir is None:
+        return path.join(directory, '__pbcache__', base + '.ast')
+    # Programs of the same name in different directories share cache_dir.
+    return path.join(cache_dir, '%s-%s.ast' % (base, digest(os.fsencode(file_name))[:16]))
+
+
+def source_key(source):
+    return digest(('%d %s\n' % (version, basic_yacc.checksum) + source).encode())
+
+
+# An entry is the key of the source on a line of its own, followed by the
+# program file of the tree, see basic_binary.
+def load(file_name, source):
+    try:
+        with open(cache_path(file_name), 'rb') as f:
+            if f.readline().rstrip(b'\n').decode() != source_key(source):
+                return None
+            return basic_binary.loads(f.read())
+    except (OSError, ValueError, BasicError):
+        return None
+
+
+def store(file_name, source, node):
+    import tempfile
+    target = cache_path(file_name)
+    directory = path.dirname(target)
+    temp = None
+    try:
+        data = basic_binary.dumps(node)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp = tempfile.mkstemp(prefix=path.basename(target), suffix='.tmp', dir=directory)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(source_key(source).encode() + b'\n')
+            f.write(data)
+        # Readable by whoever can read the program, like the program.
+        os.chmod(temp, os.stat(file_name).st_mode & 0o666)
+        os.replace(temp, target)
+    except (OSError, BasicError):
+        if temp is not None and path.exists(temp):
+            os.remove(temp)
+
+
+# The tree of the program in file file_name, whose text is source, from the
+# cache if it is there.
+def parse_file(file_name, source):
+    node = load(file_name, source) if enabled else None
+    if node is None:
+        state = basic_yacc.ParseState()
+        basic_yacc.parse_source(source, state)
+        node = state.ast
+        if enabled:
+            store(file_name, source, node)
+    return node
@@ -0,0 +1,511 @@
+#! python3
+# Closure compiler: walks a finished AST once and turns every node into a
+# specialized Python closure taking the current symbol table, so running a
+# program needs no per-node string comparison or operator lookup.
+import sys
+from functools import partial
+
+from .basic_array import BasicArray, BasicMatrix, array_types
+from .basic_ast import ASTControl, ASTNode
+from .basic_lib import each_line
+from .basic_operators import (binary_operators, unary_operators,
+    dim_array, assign_array, assign_member, slice_array)
+from .basic_memo import MISSING, MemoCache, pure_functions
+from .basic_modules import use
+from .basic_parallel import parallel_for, runners
+from .basic_resolve import assigned_names, resolve_function
+from .symbol_table import UNSET, Frame, table_stack
+from .utils import BasicError
+
+BREAK = ASTControl('break')
+CONTINUE = ASTControl('continue')
+
+
+class Thunk:
+    # Stands in for an argument node when calling a builtin, which expects
+    # objects with a run() method (and reads .value for by-name arguments).
+    __slots__ = ('run', 'type', 'value')
+
+    def __init__(self, code, node):
+        self.run = lambda: code(table_stack.top())
+        self.type = node.type
+        self.value = node.value
+
+
+class BasicFunction:
+    # A SUB or FUNCTION defined by compiled code. gtab is the dictionary of
+    # the global table it was defined in.
+    # Bytecode of functions defined by the VM, which calls them without
+    # recursing.
+    code = None
+    # MemoCache of pure functions.
+    memo = None
+
+    def __init__(self, name, scope, body, gtab):
+        self.name = name
+        self.scope = scope
+        self.body = body
+        self.gtab = gtab
+
+    def __call__(self, n):
+        # Called like a builtin, with argument nodes evaluated by the caller.
+        return self.invoke([x.run() for x in n])
+
+    def invoke(self, args):
+        func = self
+        # The cache waiting for the result of this call, and its key. Only
+        # the first memoized call of a chain of tail calls waits, so that
+        # the chain runs in constant memory.
+        pending = None
+        while True:
+            memo = func.memo
+            if memo is not None:
+                key = memo.key(args)
+                if key is not None:
+                    value = memo.get(key)
+                    if value is not MISSING:
+                        break
+                    if pending is None:
+                        pending = (memo, key)
+            scope, gtab = func.scope, func.gtab
+            if len(args) < len(scope.params):
+                raise BasicError('Wrong number of arguments when calling %s' % func.name)
+            frame = Frame(scope, gtab)
+            for slot, name in enumerate(scope.params):
+                # Parameters named like an existing global assign to it.
+                if name in gtab:
+                    gtab[name] = args[slot]
+                else:
+                    frame[slot] = args[slot]
+            table_stack.push(frame)
+            try:
+                result = func.body(frame)
+            finally:
+                table_stack.pop()
+            if result.__class__ is not ASTControl:
+                value = None
+                break
+            if result.msg != 'tailcall':
+                value = result.value
+                break
+            # RETURN F(...): run F in place of this call instead of nesting.
+            func, args = result.value
+        if pending is not None:
+            pending[0].put(pending[1], value)
+        return value
+
+
+class Compiler:
+    def __init__(self, profiler=None, tco=True, memoize=True):
+        self.profiler = profiler
+        # Whether RETURN F(...) in a SUB/FUNCTION reuses the caller's call.
+        self.tco = tco
+        # Whether to cache the results of pure functions, and their names
+        # once the program has been analyzed.
+        self.memoize = memoize
+        self.pure = set()
+        # Scope of the SUB/FUNCTION being compiled, None for the program body.
+        self.scope = None
+        self.flags = {
+            '<PROGRAM>': self.compile_program,
+            '<SUB>': self.compile_function,
+            '<FUNCTION>': self.compile_function,
+            '<BLOCK>': self.compile_block,
+            '<SEQ>': self.compile_seq,
+            '<IF>': self.compile_if,
+            '<FOR>': self.compile_for,
+            '<FOR_EACH>': self.compile_for_each,
+            '<PARALLEL_FOR>': self.compile_parallel_for,
+            '<DO>': self.compile_do,
+            '<WHILE>': self.compile_while,
+            '<BREAK>': lambda node: lambda env: BREAK,
+            '<CONTINUE>': lambda node: lambda env: CONTINUE,
+            '<RETURN>': self.compile_return,
+            '<END>': self.compile_end,
+            '<USE>': self.compile_use,
+        }
+        self.funcalls = {
+            '<AND>': self.compile_and,
+            '<OR>': self.compile_or,
+            '<MEMBER>': self.compile_member,
+            '<ASSIGN>': self.compile_assign,
+            '<DIM_ARRAY>': self.compile_dim_array,
+            '<ASSIGN_ARRAY>': self.compile_assign_array,
+            '<ASSIGN_MEMBER>': self.compile_assign_member,
+            '<SLICE>': self.compile_slice,
+        }
+
+    def compile(self, node):
+        if node.type == 'flag':
+            try:
+                handler = self.flags[node.value]
+            except KeyError:
+                raise BasicError('Cannot compile %s' % node.value)
+            return handler(node)
+        elif node.type == 'funcall':
+            return self.compile_funcall(node)
+        elif node.type == 'id':
+            return self.compile_load(node.value)
+        elif node.type == 'array':
+            items = [self.compile(x) for x in node.value]
+            return lambda env: [item(env) for item in items]
+        elif node.type in ASTNode.literals:
+            value = node.value
+            return lambda env: value
+        raise BasicError('Cannot compile %s' % node)
+
+    # Variables. Program-body variables live in the global table under their
+    # resolved key, locals of a SUB/FUNCTION in the slots of its Frame.
+    def compile_load(self, name):
+        name = name.upper()
+        if self.scope is not None and self.scope.is_local(name):
+            slot = self.scope.index[name]
+            def load_local(env):
+                value = env[slot]
+                if value is UNSET:
+                    try:
+                        return env.gtab[name]
+                    except KeyError:
+                        raise BasicError('undefined variable "%s"' % name)
+                return value
+            return load_local
+        def load_global(env):
+            try:
+                return env.gtab[name]
+            except KeyError:
+                raise BasicError('undefined variable "%s"' % name)
+        return load_global
+
+    def compile_store(self, name):
+        name = name.upper()
+        if self.scope is not None:
+            slot = self.scope.index[name]
+            def store_local(env, value):
+                if env[slot] is not UNSET or name not in env.gtab:
+                    env[slot] = value
+                else:
+                    env.gtab[name] = value
+                return True
+            return store_local
+        def store_global(env, value):
+            env.gtab[name] = value
+            return True
+        return store_global
+
+    # Statements. Their closures return an ASTControl to unwind loops and
+    # functions, anything else is ignored.
+    def compile_statement(self, node):
+        code = self.compile(node)
+        if self.profiler is not None:
+            code = self.profiler.wrap(self.profiler.statement(node), code)
+        return code
+
+    def compile_program(self, node):
+        if self.memoize:
+            self.pure = pure_functions(node)
+        stmts = [self.compile_statement(x) for x in node.tree]
+        def program(env):
+            for stmt in stmts:
+                stmt(env)
+        return program
+
+    def compile_block(self, node):
+        stmts = [self.compile_statement(x) for x in node.tree]
+        if len(stmts) == 1:
+            return stmts[0]
+        def block(env):
+            for stmt in stmts:
+                result = stmt(env)
+                if result.__class__ is ASTControl:
+                    return result
+        return block
+
+    def compile_function(self, node):
+        name = node.tree[0]
+        store = self.compile_store(name)
+        outer_scope, self.scope = self.scope, resolve_function(node)
+        try:
+            scope, body = self.scope, self.compile(node.tree[2])
+        finally:
+            self.scope = outer_scope
+        if self.profiler is not None:
+            body = self.profiler.wrap(self.profiler.function(name), body)
+        memoize = outer_scope is None and name in self.pure
+        def define(env):
+            func = BasicFunction(name, scope, body, env.gtab)
+            if memoize:
+                func.memo = MemoCache(name)
+            store(env, func)
+        return define
+
+    def compile_seq(self, node):
+        branches = [self.compile(x) for x in node.tree]
+        def seq(env):
+            for branch in branches:
+                result = branch(env)
+                if result is True or result.__class__ is ASTControl:
+                    return result
+            return False
+        return seq
+
+    def compile_if(self, node):
+        cond, body = self.compile(node.tree[0]), self.compile(node.tree[1])
+        def if_branch(env):
+            if cond(env) is True:
+                result = body(env)
+                if result.__class__ is ASTControl:
+                    return result
+                return True
+            return False
+        return if_branch
+
+    def compile_for(self, node):
+        # TO and STEP are evaluated once and the loop runs while the variable
+        # has not passed the end in the direction of the step, so it may run
+        # zero times. CONTINUE FOR goes on with the next value.
+        name = node.tree[0].value
+        load, store = self.compile_load(name), self.compile_store(name)
+        start, end, step, body = (self.compile(x) for x in node.tree[1:5])
+        preheader = self.compile_preheader(node, 5)
+        # A body which never assigns the variable lets integer loops count
+        # with range(), checking only that no call changed it meanwhile.
+        counted = name.upper() not in assigned_names(node.tree[4])
+        step_node = node.tree[3]
+        if step_node.type == 'number' and step_node.value.__class__ in (int, float):
+            const_step = step_node.value
+        else:
+            const_step = None
+
+        def classic(env, value, stop, increment):
+            ascending = increment >= 0
+            while value <= stop if ascending else value >= stop:
+                result = body(env)
+                if result.__class__ is ASTControl:
+                    if result is BREAK:
+                        return
+                    elif result is not CONTINUE:
+                        return result
+                value = load(env) + increment
+                store(env, value)
+
+        def count(env, value, stop, increment):
+            for value in range(value, stop + 1 if increment > 0 else stop - 1, increment):
+                store(env, value)
+                result = body(env)
+                if result.__class__ is ASTControl:
+                    if result is BREAK:
+                        return
+                    elif result is not CONTINUE:
+                        return result
+                if load(env) != value:
+                    value = load(env) + increment
+                    store(env, value)
+                    return classic(env, value, stop, increment)
+            store(env, value + increment)
+
+        if counted and const_step.__class__ is int and const_step:
+            ascending = const_step > 0
+            def for_loop(env):
+                value, stop = start(env), end(env)
+                store(env, value)
+                if not (value <= stop if ascending else value >= stop):
+                    return
+                preheader(env)
+                if value.__class__ is int and stop.__class__ is int:
+                    return count(env, value, stop, const_step)
+                return classic(env, value, stop, const_step)
+            return for_loop
+
+        def for_loop(env):
+            value, stop, increment = start(env), end(env), step(env)
+            store(env, value)
+            if not (value <= stop if increment >= 0 else value >= stop):
+                return
+            preheader(env)
+            if counted and increment and value.__class__ is int \
+                    and stop.__class__ is int and increment.__class__ is int:
+                return count(env, value, stop, increment)
+            return classic(env, value, stop, increment)
+        return for_loop
+
+    def compile_for_each(self, node):
+        store = self.compile_store(node.tree[0].value)
+        source, body = self.compile(node.tree[1]), self.compile(node.tree[2])
+        def for_each_loop(env):
+            for line in each_line(source(env)):
+                store(env, line)
+                result = body(env)
+                if result.__class__ is ASTControl:
+                    if result is BREAK:
+                        return
+                    elif result is not CONTINUE:
+                        return result
+        return for_each_loop
+
+    def compile_parallel_for(self, node):
+        start, end, step = (self.compile(x) for x in node.tree[1:4])
+        return lambda env: parallel_for(node, start(env), end(env), step(env), 'closure', env)
+
+    def compile_preheader(self, node, index):
+        # Block hoisted out of a loop body by the optimizer.
+        if len(node.tree) > index:
+            return self.compile(node.tree[index])
+        return lambda env: None
+
+    def compile_do(self, node):
+        cond, body = self.compile(node.tree[0]), self.compile(node.tree[1])
+        preheader = self.compile_preheader(node, 2)
+        def do_loop(env):
+            preheader(env)
+            while True:
+                result = body(env)
+                if result.__class__ is ASTControl:
+                    if result is BREAK:
+                        break
+                    elif result is CONTINUE:
+                        continue
+                    else:
+                        return result
+                if cond(env) is False:
+                    break
+        return do_loop
+
+    def compile_while(self, node):
+        cond, body = self.compile(node.tree[0]), self.compile(node.tree[1])
+        preheader = self.compile(node.tree[2]) if len(node.tree) > 2 else None
+        def while_loop(env):
+            first = preheader is not None
+            while cond(env) is True:
+                if first:
+                    preheader(env)
+                    first = False
+                result = body(env)
+                if result.__class__ is ASTControl:
+                    if result is BREAK:
+                        break
+                    elif result is CONTINUE:
+                        continue
+                    else:
+                        return result
+        return while_loop
+
+    def compile_return(self, node):
+        value = node.tree[0]
+        if self.tco and self.scope is not None and value.type == 'funcall' \
+                and not value.value.startswith('<'):
+            return self.compile_tail_call(value)
+        value = self.compile(value)
+        return lambda env: ASTControl('return', value(env))
+
+    def compile_tail_call(self, node):
+        # Calls to compiled functions are left to BasicFunction.invoke,
+        # anything else (builtins, arrays) is called right away.
+        lookup = self.compile_load(node.value)
+        args = [self.compile(x) if isinstance(x, ASTNode) else None for x in node.tree]
+        call = self.compile_funcall(node)
+        def tail_call(env):
+            func = lookup(env)
+            if func.__class__ is BasicFunction:
+                return ASTControl('tailcall', (func, [arg(env) for arg in args]))
+            return ASTControl('return', call(env))
+        return tail_call
+
+    def compile_end(self, node):
+        def end(env):
+            sys.exit(0)
+        return end
+
+    def compile_use(self, node):
+        name = node.tree[0]
+        def use_module(env):
+            use(name, 'closure', env)
+        return use_module
+
+    # Expressions.
+    def compile_funcall(self, node):
+        name = node.value
+        if name in self.funcalls:
+            return self.funcalls[name](node)
+        if name in binary_operators:
+            op = binary_operators[name]
+            a, b = self.compile(node.tree[0]), self.compile(node.tree[1])
+            return lambda env: op(a(env), b(env))
+        if name in unary_operators:
+            op = unary_operators[name]
+            a = self.compile(node.tree[0])
+            return lambda env: op(a(env))
+        lookup = self.compile_load(name)
+        args = [self.compile(x) if isinstance(x, ASTNode) else None for x in node.tree]
+        thunks = [Thunk(code, x) if code else x for code, x in zip(args, node.tree)]
+        if len(args) == 2:
+            first, second = args
+            indices = lambda env: [first(env), second(env)]
+        else:
+            indices = lambda env: [arg(env) for arg in args]
+        def call(env):
+            func = lookup(env)
+            if func.__class__ is BasicFunction:
+                return func.invoke([arg(env) for arg in args])
+            if isinstance(func, array_types):
+                if func.__class__ is BasicMatrix:
+                    return func.get(indices(env))
+                result = func.data if func.__class__ is BasicArray else func
+                for arg in args:
+                    index = arg(env)
+                    try:
+                        result = result[index]
+                    except IndexError:
+                        raise BasicError('Index %d is out of range (maximum %d)' % (index, len(result)))
+                return result
+            try:
+                return func(thunks)
+            except IndexError:
+                raise BasicError('Wrong number of arguments when calling %s' % name)
+        return call
+
+    def compile_and(self, node):
+        a, b = self.compile(node.tree[0]), self.compile(node.tree[1])
+        return lambda env: a(env) and b(env)
+
+    def compile_or(self, node):
+        a, b = self.compile(node.tree[0]), self.compile(node.tree[1])
+        return lambda env: a(env) or b(env)
+
+    def compile_member(self, node):
+        master, field = self.compile(node.tree[0]), node.tree[1]
+        return lambda env: master(env).get(field)
+
+    def compile_assign(self, node):
+        store, value = self.compile_store(node.tree[0]), self.compile(node.tree[1])
+        return lambda env: store(env, value(env))
+
+    def compile_slice(self, node):
+        array, first, last = (self.compile(x) for x in node.tree)
+        return lambda env: slice_array(array(env), first(env), last(env))
+
+    def compile_dim_array(self, node):
+        name, type_name = node.tree[0], node.tree[1]
+        sizes = [self.compile(x) for x in node.tree[2:]]
+        return lambda env: dim_array(name, type_name, [size(env) for size in sizes])
+
+    def compile_assign_array(self, node):
+        name, value = node.tree[0], self.compile(node.tree[-1])
+        indices = [self.compile(x) for x in node.tree[1:-1]]
+        if len(indices) == 1:
+            index = indices[0]
+            return lambda env: assign_array(name, [index(env)], value(env))
+        if len(indices) == 2:
+            first, second = indices
+            return lambda env: assign_array(name, [first(env), second(env)], value(env))
+        return lambda env: assign_array(name, [index(env) for index in indices], value(env))
+
+    def compile_assign_member(self, node):
+        master, field, value = self.compile(node.tree[0]), node.tree[1], self.compile(node.tree[2])
+        return lambda env: assign_member(master(env), field, value(env))
+
+
+def compile_node(node, profiler=None, tco=True, memoize=True):
+    return Compiler(profiler, tco, memoize).compile(node)
+
+
+runners['closure'] = lambda program: partial(compile_node(program), table_stack.items[0])
@@ -1,5 +1,6 @@
 #! python3
-import ply.lex as lex
+import re
+
 from .utils import BasicError
 
 # List of reserved words.
@@ -22,7 +23,8 @@ tokens = (
     'ID', 'INTEGER', 'DECIMAL', 'STRING',
     'EQUALS', 'PLUS', 'MINUS', 'TIMES', 'DIVIDE', 'EXACTDIV', 'EXP',
     'GREATER_THAN', 'LESS_THAN', 'EQUAL_GREATER_THAN', 'EQUAL_LESS_THAN', 'NOT_EQUAL',
-    'LPAREN', 'RPAREN', 'LBRACE', 'RBRACE', 'COMMA', 'DOT', 'COLON'
+    'LPAREN', 'RPAREN', 'LBRACE', 'RBRACE', 'COMMA', 'DOT', 'COLON',
+    'NEWLINE',
 )
 tokens += reserved_tuple
 
@@ -49,35 +51,55 @@ t_COMMA = r'\,'
 t_DOT = r'\.'
 t_COLON = r'\:'
 
-# Regular expression rules for some tokens with action codes.
-def t_DECIMAL(t):
-    r'[1-9]*[0-9]\.[0-9]*'
-    t.value = float(t.value)
-    return t
-def t_INTEGER(t):
-    r'\d+'
-    t.value = int(t.value)
-    return t
-def t_STRING(t):
-    r'\"(.*?)\"'
-    t.value = t.value[1:-1]
-    return t
-def t_ID(t):
-    r'[a-zA-Z_\$\w][a-zA-Z_\$0-9\w]*'
-    t.value = t.value.upper()
-    t.type = reserved_words.get(t.value.upper(), 'ID') # Check for reserved words
-    return t
-def t_COMMENT(t):
-    r'\'.*'
-    pass # Discard comments
+# Regular expressions of the tokens whose value is not the text they match,
+# tried in this order before the ones above, as PLY's lexer did.
+t_DECIMAL = r'[1-9]*[0-9]\.[0-9]*'
+t_INTEGER = r'\d+'
+t_STRING = r'\"(.*?)\"'
+t_ID = r'[a-zA-Z_\$\w][a-zA-Z_\$0-9\w]*'
+t_COMMENT = r'\'.*'
+t_NEWLINE = r'\n+'
+ordered = ('DECIMAL', 'INTEGER', 'STRING', 'ID', 'COMMENT', 'NEWLINE')
+
+# Values of tokens from their text. IDs and reserved words are upper case.
+conversions = {
+    'DECIMAL': float,
+    'INTEGER': int,
+    'STRING': lambda text: text[1:-1],
+}
+
+# Every rule as one regular expression, which also matches the ignored
+# characters before a token. The others are tried longest first.
+rules = [(name, globals()['t_' + name]) for name in ordered]
+rules += sorted(((name[2:], value) for name, value in list(globals().items())
+                 if name.startswith('t_') and name[2:] not in ordered and name != 't_ignore'),
+                key=lambda rule: -len(rule[1]))
+scanner = re.compile('[%s]*(?:%s)' % (t_ignore, '|'.join('(?P<%s>%s)' % rule for rule in rules)))
 
-# Track line numbers.
-def t_newline(t):
-    r'\n+'
-    t.lexer.lineno += len(t.value)
-# Error handling rules.
-def t_error(t):
-    raise BasicError('Illegal character: "%s"' % t.value[0])
 
-# Build the lexer.
-lexer = lex.lex()
+# Tokens of source text as (type, value, line number), ending with one of
+# type '$end'. The whole text is scanned with one regular expression, and
+# statements end with NEWLINE tokens.
+def tokenize(text):
+    lineno = 1
+    pos = 0
+    for m in scanner.finditer(text):
+        if m.start() != pos:
+            break
+        pos = m.end()
+        kind = m.lastgroup
+        value = m.group(kind)
+        if kind == 'ID':
+            value = value.upper()
+            yield reserved_words.get(value, 'ID'), value, lineno
+        elif kind == 'NEWLINE':
+            yield kind, value, lineno
+            lineno += len(value)
+        elif kind in conversions:
+            yield kind, conversions[kind](value), lineno
+        elif kind != 'COMMENT':
+            yield kind, value, lineno
+    rest = text[pos:].lstrip(t_ignore)
+    if rest:
+        raise BasicError('Illegal character "%s" on line %d' % (rest[0], lineno))
+    yield '$end', None, lineno
@@ -1,9 +1,11 @@
 import math
+import operator
 import os
-import platform
 import random
 import time
 
+from .basic_async import blocking
+from .basic_array import BasicArray, basic_dot, basic_max, basic_min, basic_sum, vectorize
 from .symbol_table import global_table, table_stack
 from .utils import BasicError
 
@@ -17,26 +19,49 @@ class BasicStruct:
             raise BasicError('Member %s is undefined' % str(error))
 
 
-# console I/O
+# console I/O, through the files of the running program
+def read_line():
+    stdin = table_stack.context.stdin
+    if stdin is None:
+        return input()
+    line = stdin.readline()
+    if not line:
+        raise BasicError('No more input')
+    return line[:-1] if line.endswith('\n') else line
+
 @global_table.register('print')
 def basic_print(n):
+    stdout = table_stack.context.stdout
     for node in n:
-        print(node.run(), end=' ')
-    print()
+        print(node.run(), end=' ', file=stdout)
+    print(file=stdout)
 
 @global_table.register('write')
 def basic_write(n):
+    stdout = table_stack.context.stdout
     for node in n:
-        print(node.run(), end='')
+        print(node.run(), end='', file=stdout)
 
 
 @global_table.register('input')
 def basic_input(n):
-    return input()
+    return blocking(read_line)
 
 
 # file I/O
-global_table.reflect('open', open)
+# FUNCTION OPEN(NAME, MODE, BUFFER) ' MODE is INPUT (the default), OUTPUT,
+# APPEND or a mode of Python's open(); BUFFER is the size of the buffer in
+# bytes, 1 to write text a line at a time, 0 for none in binary modes.
+open_modes = {'INPUT': 'r', 'OUTPUT': 'w', 'APPEND': 'a'}
+
+def basic_open(name, mode='r', buffer=-1):
+    mode = open_modes.get(mode.upper(), mode)
+    try:
+        return open(name, mode, buffer)
+    except (OSError, ValueError) as error:
+        raise BasicError('Cannot open %s: %s' % (name, error))
+
+global_table.reflect('open', basic_open)
 global_table.reflect('close', lambda f: f.close())
 
 
@@ -59,22 +84,93 @@ def basic_fwrite(n):
 @global_table.register('finput')
 def basic_finput(n):
     f = n[0].run()
-    line = f.readline()
+    line = blocking(f.readline)
     if not line:
         return None
-    return line[:-1]
+    return line[:-1] if line.endswith('\n') else line
+
+
+# Files read by name in one go, and by FOR EACH LINE, have a larger buffer
+# than the default one.
+read_buffer = 1 << 16
+strip_line = operator.methodcaller('rstrip', '\n')
+strip_binary_line = operator.methodcaller('rstrip', b'\n')
+
+
+def read_file(source, read):
+    # read(f) of the file OPEN returned, or of the file of that name.
+    if source.__class__ is not str:
+        if not hasattr(source, 'readline'):
+            raise BasicError('Cannot read from %s' % source)
+        return read(source)
+    with basic_open(source, 'r', read_buffer) as f:
+        return read(f)
+
+
+def closing_lines(f):
+    with f:
+        yield from map(strip_line, f)
+
+
+# Lines of a file without their line breaks, for FOR EACH LINE: those of the
+# file of that name, which is closed once they have all been read or the
+# loop is left, or the rest of those of a file OPEN returned.
+def each_line(source):
+    if source.__class__ is str:
+        return closing_lines(basic_open(source, 'r', read_buffer))
+    if not hasattr(source, 'readline'):
+        raise BasicError('Cannot read lines from %s' % source)
+    if 'b' in getattr(source, 'mode', ''):
+        return map(strip_binary_line, source)
+    return map(strip_line, source)
+
+
+# FUNCTION READALL$(F) ' the rest of file F, or the whole file named F
+global_table.reflect('readall$', lambda source: blocking(read_file, source, lambda f: f.read()))
+
+# FUNCTION READLINES(F) ' an array of the lines of F, as READALL$
+global_table.reflect('readlines', lambda source: blocking(read_file, source, lambda f: list(each_line(f))))
+
+def write_lines(target, lines):
+    if target.__class__ is str:
+        with basic_open(target, 'w') as f:
+            f.writelines('%s\n' % x for x in lines)
+    elif hasattr(target, 'writelines'):
+        target.writelines('%s\n' % x for x in lines)
+    else:
+        raise BasicError('Cannot write to %s' % target)
+
+# SUB WRITELINES(F, A) ' write each element of array A on a line of its own
+# to file F, or to a new file named F
+@global_table.reflect('writelines')
+def basic_writelines(target, lines):
+    if isinstance(lines, BasicArray):
+        lines = lines.data
+    blocking(write_lines, target, lines)
 
 
 # math
-global_table.reflect('abs', abs)
-global_table.reflect('sqr', math.sqrt)
-global_table.reflect('sin', math.sin)
-global_table.reflect('cos', math.cos)
-global_table.reflect('tan', math.tan)
-global_table.reflect('exp', math.exp)
-global_table.reflect('log', math.log)
+# Math functions also apply to every element of an array.
+math_functions = {
+    'ABS': vectorize(abs, 'absolute'),
+    'SQR': vectorize(math.sqrt, 'sqrt'),
+    'SIN': vectorize(math.sin, 'sin'),
+    'COS': vectorize(math.cos, 'cos'),
+    'TAN': vectorize(math.tan, 'tan'),
+    'EXP': vectorize(math.exp, 'exp'),
+    'LOG': vectorize(math.log, 'log'),
+}
+for name, func in math_functions.items():
+    global_table.reflect(name, func)
 global_table.reflect('rnd', random.random)
 global_table.reflect('randint', random.randint)
+global_table.reflect('randomize', random.seed)
+
+# whole arrays
+global_table.reflect('sum', basic_sum)
+global_table.reflect('max', basic_max)
+global_table.reflect('min', basic_min)
+global_table.reflect('dot', basic_dot)
 
 # strings
 global_table.reflect('asc', ord)
@@ -95,6 +191,7 @@ global_table.reflect('trim$', lambda s: s.strip())
 # FUNCTION CLS() ' clear the screen
 @global_table.reflect('cls')
 def basic_cls():
+    import platform
     if platform.system() == 'Windows':
         os.system('cls')
     else:
@@ -108,12 +205,12 @@ def basic_sysexit():
     sys.exit(0)
 
 # FUNCTION SLEEP(X) ' suspend for X milliseconds
-global_table.reflect('sleep', time.sleep)
+global_table.reflect('sleep', lambda x: blocking(time.sleep, x))
 
 # FUNCTION PAUSE() ' pause until Enter key is pressed
 @global_table.reflect('pause')
 def basic_pause():
-    input()
+    blocking(read_line)
 
 # FUNCTION SWAP(A ByRef, B ByRef) ' swap two variables
 @global_table.register('swap')
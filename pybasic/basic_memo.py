@@ -0,0 +1,202 @@
+#! python3
+# Memoization of pure BASIC functions. A FUNCTION is pure when its result
+# depends on its arguments only: it prints nothing, touches no files, reads
+# and writes no global variables and calls pure functions only. Compiled
+# pure functions get a MemoCache keyed by their arguments; MEMOIZE and
+# NOMEMOIZE switch caching on or off for a given function explicitly.
+import sys
+from collections import OrderedDict
+
+from .basic_ast import ASTNode
+from .basic_lib import BasicStruct
+from .basic_optimize import pure_builtins, constant_names, type_names
+from .basic_resolve import assigned_names
+from .symbol_table import global_table, table_stack
+from .utils import BasicError
+
+# Defaults for new caches, changed by the command line.
+memo_size = 1024
+memo_eviction = 'lru'
+evictions = ('lru', 'fifo')
+
+MISSING = object()
+# Classes of the arguments results are cached for.
+scalar_types = (int, float, str, bool, type(None))
+
+
+class MemoCache:
+    def __init__(self, name, size=None, eviction=None):
+        self.name = name
+        # A size of 0 keeps every result.
+        self.size = memo_size if size is None else size
+        self.eviction = memo_eviction if eviction is None else eviction
+        if self.eviction not in evictions:
+            raise BasicError('Unknown eviction policy %s' % self.eviction)
+        self.table = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # Every cache of a program is listed in its Context.
+        table_stack.context.caches.append(self)
+
+    @staticmethod
+    def key(args):
+        # Types are part of the key, so F(1) and F(1.0) are kept apart.
+        # Returns None unless every argument is an immutable scalar: arrays
+        # and structures may change between calls under the same identity.
+        for x in args:
+            if x.__class__ not in scalar_types:
+                return None
+        return tuple((x.__class__, x) for x in args)
+
+    def get(self, key):
+        try:
+            value = self.table[key]
+        except KeyError:
+            self.misses += 1
+            return MISSING
+        self.hits += 1
+        if self.eviction == 'lru':
+            self.table.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.table[key] = value
+        if self.size and len(self.table) > self.size:
+            self.table.popitem(last=False)
+
+
+def report(caches, file=sys.stderr):
+    print('%10s %10s %10s %10s  %s' % ('hits', 'misses', 'entries', 'size', 'name'), file=file)
+    for cache in caches:
+        print('%10d %10d %10d %10s  FUNCTION %s' % (cache.hits, cache.misses,
+            len(cache.table), cache.size or 'unbounded', cache.name), file=file)
+
+
+# Purity analysis over a whole program.
+impure_flags = ('<SUB>', '<FUNCTION>', '<USE>', '<END>', '<PARALLEL_FOR>', '<FOR_EACH>')
+impure_funcalls = ('<MEMBER>', '<ASSIGN_MEMBER>', '<ASSIGN_ARRAY>', '<DIM_ARRAY>', '<VECTOR_FOR>', '<SPAWN>')
+# Builtins taking a function by name without assigning it.
+memo_builtins = ('MEMOIZE', 'NOMEMOIZE', 'MEMOSTATS')
+
+
+class PurityAnalysis:
+    def __init__(self, program):
+        # Top-level FUNCTIONs defined once, by name.
+        self.functions = {}
+        # Names of every SUB/FUNCTION, and of every global the program may
+        # assign.
+        self.defined = set()
+        self.assigned = set()
+        self.dynamic = False
+        self.collect(program, top=True)
+
+    def collect(self, node, top):
+        if isinstance(node, list):
+            for item in node:
+                self.collect(item, top)
+            return
+        if not isinstance(node, ASTNode):
+            return
+        if node.type == 'flag':
+            if node.value in ('<SUB>', '<FUNCTION>'):
+                name = node.tree[0]
+                if name in self.defined:
+                    self.functions.pop(name, None)
+                elif top and node.value == '<FUNCTION>':
+                    self.functions[name] = node
+                self.defined.add(name)
+                self.collect(node.tree[2], False)
+                return
+            if node.value in ('<FOR>', '<FOR_EACH>', '<PARALLEL_FOR>') and top:
+                self.assigned.add(node.tree[0].value)
+            elif node.value == '<USE>':
+                self.dynamic = True
+        elif node.type == 'funcall':
+            if node.value in ('<DIM_ARRAY>', '<ASSIGN_ARRAY>'):
+                self.assigned.add(node.tree[0])
+            elif node.value == '<ASSIGN>' and top:
+                self.assigned.add(node.tree[0])
+            elif not node.value.startswith('<') and top and node.value not in memo_builtins:
+                for arg in node.tree:
+                    if isinstance(arg, ASTNode) and arg.type == 'id':
+                        self.assigned.add(arg.value)
+        elif node.type == 'array':
+            self.collect(node.value, top)
+        self.collect(node.tree, top)
+
+    def pure_functions(self):
+        if self.dynamic:
+            return set()
+        candidates = {name for name in self.functions if name not in self.assigned}
+        while True:
+            pure = {name for name in candidates if self.is_pure(self.functions[name], candidates)}
+            if pure == candidates:
+                return pure
+            candidates = pure
+
+    def is_known(self, name):
+        return name not in self.assigned and name not in self.defined
+
+    def is_pure(self, function, candidates):
+        local_names = set(function.tree[1]) | set(assigned_names(function.tree[2]))
+        # Assigning a name that also exists globally writes the global.
+        for name in local_names:
+            if name in self.assigned or name in self.defined or name in global_table.gtab:
+                return False
+        return self.is_pure_node(function.tree[2], local_names, candidates)
+
+    def is_pure_node(self, node, local_names, candidates):
+        if isinstance(node, list):
+            return all(self.is_pure_node(x, local_names, candidates) for x in node)
+        if not isinstance(node, ASTNode):
+            return True
+        if node.type == 'array':
+            return False
+        if node.type == 'flag' and node.value in impure_flags:
+            return False
+        if node.type == 'id' and node.value not in local_names:
+            if not (node.value in constant_names + type_names and self.is_known(node.value)):
+                return False
+        if node.type == 'funcall':
+            name = node.value
+            if name in impure_funcalls:
+                return False
+            if not name.startswith('<') and name not in candidates \
+                    and not (name in pure_builtins and self.is_known(name)):
+                return False
+        return self.is_pure_node(node.tree, local_names, candidates)
+
+
+def pure_functions(program):
+    return PurityAnalysis(program).pure_functions()
+
+
+# MEMOIZE F[, size[, eviction]] ' cache the results of F
+@global_table.register('memoize')
+def basic_memoize(n):
+    func = n[0].run()
+    size = n[1].run() if len(n) > 1 else None
+    eviction = n[2].run().lower() if len(n) > 2 else None
+    # Functions of the tree-walking engine cannot be cached.
+    if hasattr(func, 'memo'):
+        if func.memo is not None:
+            table_stack.context.caches.remove(func.memo)
+        func.memo = MemoCache(func.name, size, eviction)
+
+# NOMEMOIZE F ' stop caching the results of F
+@global_table.register('nomemoize')
+def basic_nomemoize(n):
+    func = n[0].run()
+    if hasattr(func, 'memo'):
+        func.memo = None
+
+# FUNCTION MEMOSTATS(F) ' structure with HITS, MISSES and ENTRIES of F's cache
+@global_table.register('memostats')
+def basic_memostats(n):
+    func = n[0].run()
+    cache = getattr(func, 'memo', None)
+    stats = BasicStruct()
+    stats.member['HITS'] = cache.hits if cache else 0
+    stats.member['MISSES'] = cache.misses if cache else 0
+    stats.member['ENTRIES'] = len(cache.table) if cache else 0
+    return stats
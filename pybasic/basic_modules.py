@@ -0,0 +1,106 @@
+#! python3
+# Modules loaded by USE. USE NAME runs NAME.bas or NAME.py the first time a
+# program of the interpreter uses it, then gives the program the names the
+# module defined:
+#
+#   USE GEOMETRY        ' GEOMETRY.bas defines AREA and _SQUARE
+#   PRINT AREA(2)       ' _SQUARE is private to GEOMETRY
+#
+# A BASIC module runs in a global table of its own, starting with the
+# builtins, so its variables do not clash with those of the programs using
+# it, and its SUBs and FUNCTIONs keep using that table wherever they are
+# called from. Names starting with _ are not exported. What a Python module
+# registers with global_table is exported the same way. Each module runs
+# once per interpreter: using it again, from the program or from another
+# module, copies its exports again without running it. The trees of BASIC
+# modules are cached on disk like those of programs, see basic_cache.
+import os
+import sys
+from os import path
+
+from .basic_parallel import register, runners
+from .symbol_table import SymbolTable, builtin_table, table_stack
+from .utils import BasicError
+
+# Directories searched for modules after the working directory and the
+# directory of the program, changed by the command line.
+search_path = [x for x in os.environ.get('PYBASIC_PATH', '').split(os.pathsep) if x]
+extensions = ('.bas', '.py')
+
+
+class Module:
+    def __init__(self, name, file_name):
+        self.name = name
+        self.file_name = file_name
+        # What the module defined by name, None while it runs.
+        self.exports = None
+
+
+# The file of module name: NAME.bas or NAME.py, in lower case, in the first
+# directory of the search path which has one, then in basic_lib.
+def find(name):
+    directories = [os.getcwd()]
+    if table_stack.context.directory is not None:
+        directories.append(table_stack.context.directory)
+    directories.extend(search_path)
+    directories.append(path.join(sys.path[0], 'basic_lib'))
+    for directory in directories:
+        for extension in extensions:
+            file_name = path.join(directory, name.lower() + extension)
+            if path.isfile(file_name):
+                return path.abspath(file_name)
+    raise BasicError('No such module: %s' % name)
+
+
+def run_in(table, run):
+    # Runs run() with table as the global table of the running context, for
+    # the engines and for Python modules registering builtins.
+    context = table_stack.context
+    saved = table_stack.items, context.globals
+    table_stack.items, context.globals = [table], table
+    try:
+        run()
+    finally:
+        table_stack.items, context.globals = saved
+
+
+def load(module, engine):
+    # The parser and the optimizer import the engines, which import this.
+    from .basic_cache import parse_file
+    from .basic_optimize import optimize
+    table = SymbolTable()
+    table._table.update(builtin_table._table)
+    before = dict(table._table)
+    if module.file_name.endswith('.py'):
+        import runpy
+        run_in(table, lambda: runpy.run_path(module.file_name))
+    else:
+        with open(module.file_name, 'r', encoding='utf8') as f:
+            source = f.read()
+        try:
+            node = optimize(parse_file(module.file_name, source))
+        except BasicError as error:
+            raise BasicError('%s in module %s' % (error, module.name))
+        # PARALLEL FOR workers need the SUBs and FUNCTIONs it defines.
+        register(node)
+        run_in(table, lambda: runners[engine](node)())
+    module.exports = {name: value for name, value in table._table.items()
+                      if name[0] not in '_<' and before.get(name, table) is not value}
+
+
+# Runs USE name in table, for the given engine.
+def use(name, engine, table):
+    modules = table_stack.context.modules
+    file_name = find(name)
+    module = modules.get(file_name)
+    if module is None:
+        module = modules[file_name] = Module(name, file_name)
+        try:
+            load(module, engine)
+        except BaseException:
+            del modules[file_name]
+            raise
+    elif module.exports is None:
+        raise BasicError('Module %s uses itself' % name)
+    for key, value in module.exports.items():
+        table.set(key, value)
@@ -1,52 +1,90 @@
+import operator
+
+from .basic_array import BasicArray, BasicMatrix, slice_array, typecodes
 from .symbol_table import global_table, table_stack
 from .utils import BasicError
 
 
-@global_table.register('<PLUS>')
-def basic_plus(n):
-    a, b = n[0].run(), n[1].run()
+def basic_plus(a, b):
     if isinstance(a, str) or isinstance(b, str):
-        a, b = str(a), str(b)
+        # Adding a string to an array appends it to every element.
+        if not isinstance(a, BasicArray) and not isinstance(b, BasicArray):
+            a, b = str(a), str(b)
     return a + b
 
-global_table.set('<MINUS>', lambda n: n[0].run() - n[1].run())
-global_table.set('<TIMES>', lambda n: n[0].run() * n[1].run())
-global_table.set('<DIVIDE>', lambda n: n[0].run() / n[1].run())
-global_table.set('<EXACTDIV>', lambda n: n[0].run() // n[1].run())
-global_table.set('<MOD>', lambda n: n[0].run() % n[1].run())
-global_table.set('<EXP>', lambda n: n[0].run() ** n[1].run())
+# Operators working on evaluated operands. The tree-walker registers node
+# based wrappers for them below, while compiled code binds them directly.
+binary_operators = {
+    '<PLUS>': basic_plus,
+    '<MINUS>': operator.sub,
+    '<TIMES>': operator.mul,
+    '<DIVIDE>': operator.truediv,
+    '<EXACTDIV>': operator.floordiv,
+    '<MOD>': operator.mod,
+    '<EXP>': operator.pow,
+    '<GREATER_THAN>': operator.gt,
+    '<LESS_THAN>': operator.lt,
+    '<EQUAL_GREATER_THAN>': operator.ge,
+    '<EQUAL_LESS_THAN>': operator.le,
+    '<NOT_EQUAL>': operator.ne,
+    '<EQUAL>': operator.eq,
+    '<AS>': lambda a, b: b(a),
+}
+
+unary_operators = {
+    '<UMINUS>': operator.neg,
+    '<NOT>': operator.not_,
+}
+
+for name, op in binary_operators.items():
+    global_table.set(name, lambda n, op=op: op(n[0].run(), n[1].run()))
+for name, op in unary_operators.items():
+    global_table.set(name, lambda n, op=op: op(n[0].run()))
+
 global_table.set('<ASSIGN>', lambda n: table_stack.top().set(n[0], n[1].run()))
-global_table.set('<UMINUS>', lambda n: -n[0].run())
 global_table.set('<MEMBER>', lambda n: n[0].run().get(n[1]))
-global_table.set('<GREATER_THAN>', lambda n: n[0].run() > n[1].run())
-global_table.set('<LESS_THAN>', lambda n: n[0].run() < n[1].run())
-global_table.set('<EQUAL_GREATER_THAN>', lambda n: n[0].run() >= n[1].run())
-global_table.set('<EQUAL_LESS_THAN>', lambda n: n[0].run() <= n[1].run())
-global_table.set('<NOT_EQUAL>', lambda n: n[0].run() != n[1].run())
-global_table.set('<EQUAL>', lambda n: n[0].run() == n[1].run())
 global_table.set('<AND>', lambda n: n[0].run() and n[1].run())
 global_table.set('<OR>', lambda n: n[0].run() or n[1].run())
-global_table.set('<NOT>', lambda n: not n[0].run())
-global_table.set('<AS>', lambda n: n[1].run()(n[0].run()))
 
-@global_table.register('<DIM_ARRAY>')
-def basic_dim_array(n):
-    id_name, type_name, size = n[0], n[1], n[2].run()
+
+def dim_array(id_name, type_name, sizes):
     py_type = global_table.get(type_name)
-    array = [py_type() for _ in range(size + 1)]
+    if len(sizes) > 1:
+        array = BasicMatrix(py_type, sizes)
+    elif py_type in typecodes:
+        array = BasicArray(py_type, sizes[0])
+    else:
+        array = [py_type() for _ in range(sizes[0] + 1)]
     global_table.set(id_name, array)
 
-@global_table.register('<ASSIGN_ARRAY>')
-def basic_assign_array(n):
-    id_name, basic_count, exp = n[0], n[1].run(), n[2].run()
-    py_list = global_table.get(id_name)
-    py_count = basic_count # - 1
+def assign_array(id_name, indices, exp):
+    # Arrays are global: look in the bottom of the table stack.
+    py_list = table_stack.items[0].get(id_name)
+    if py_list.__class__ is BasicMatrix:
+        py_list.set(indices, exp)
+        return
+    # Nested lists are walked down to the last index.
+    for index in indices[:-1]:
+        try:
+            py_list = py_list[index]
+        except IndexError:
+            raise BasicError('Index %d is out of range (maximum %d)' % (index, len(py_list)))
+    py_count = indices[-1] # - 1
     try:
+        if py_list.__class__ is BasicArray and exp.__class__ is py_list.type:
+            # Nothing to convert: store straight into the buffer.
+            py_list.data[py_count] = exp
+        else:
+            py_list[py_count] = exp
+    except OverflowError:
         py_list[py_count] = exp
     except IndexError:
         raise BasicError('Index %d is out of range (maximum %d)' % (py_count, len(py_list)))
 
-@global_table.register('<ASSIGN_MEMBER>')
-def basic_assign_member(n):
-    master, field, exp = n[0].run(), n[1], n[2].run()
-    master.member[field] = exp
\ No newline at end of file
+def assign_member(master, field, exp):
+    master.member[field] = exp
+
+global_table.set('<DIM_ARRAY>', lambda n: dim_array(n[0], n[1], [x.run() for x in n[2:]]))
+global_table.set('<ASSIGN_ARRAY>', lambda n: assign_array(n[0], [x.run() for x in n[1:-1]], n[-1].run()))
+global_table.set('<ASSIGN_MEMBER>', lambda n: assign_member(n[0].run(), n[1], n[2].run()))
+global_table.set('<SLICE>', lambda n: slice_array(n[0].run(), n[1].run(), n[2].run()))
@@ -0,0 +1,460 @@
+#! python3
+# AST optimizer run between parsing and execution.
+#   -O1: constant folding and removal of constant <IF> branches in <SEQ>.
+#   -O2: also vectorization of element-wise FOR loops, common-subexpression
+#        elimination and hoisting of loop invariant expressions into a
+#        preheader block of the loop.
+# Any name the program may redefine (functions, parameters, assignments,
+# DIM, by-name arguments) is never treated as a known builtin or constant,
+# and a program using Python modules only gets its literals folded.
+from .basic_ast import ASTNode
+from .basic_operators import binary_operators, unary_operators
+from .basic_vectorize import vectorize
+from .symbol_table import global_table
+
+# Builtins whose result depends on their arguments only.
+pure_builtins = {
+    'ABS', 'SQR', 'SIN', 'COS', 'TAN', 'EXP', 'LOG',
+    'ASC', 'CHR$', 'LEN$', 'SPACE$', 'MID$', 'LEFT$', 'RIGHT$',
+    'LCASE$', 'UCASE$', 'TRIM$', 'SUM', 'MAX', 'MIN', 'DOT',
+}
+# Builtins which never assign BASIC variables. Those which wait, such as
+# SLEEP, let other tasks run, which may assign any global.
+passive_builtins = pure_builtins | {
+    'PRINT', 'WRITE', 'OPEN', 'CLOSE', 'FPRINT', 'FWRITE',
+    'RND', 'RANDINT', 'CLS', 'SYS_EXIT', 'STRUCT',
+}
+# Operators and builtins building a new array out of array operands. Their
+# result is only shared by several uses when no array may be assigned an
+# element after being passed around, as that would change all of them.
+array_results = {
+    '<PLUS>', '<MINUS>', '<TIMES>', '<DIVIDE>', '<EXACTDIV>', '<MOD>', '<EXP>',
+    '<UMINUS>', 'ABS', 'SQR', 'SIN', 'COS', 'TAN', 'EXP', 'LOG',
+}
+# Assignments, which evaluate all their operands before assigning.
+assign_builtins = ('<ASSIGN>', '<ASSIGN_ARRAY>', '<ASSIGN_MEMBER>')
+constant_names = ('NOTHING', 'TRUE', 'FALSE', 'PI')
+type_names = ('INTEGER', 'DECIMAL', 'STRING')
+loop_flags = ('<FOR>', '<WHILE>', '<DO>')
+control_flags = ('<BREAK>', '<CONTINUE>', '<RETURN>', '<END>')
+# Index of the body and of the optional preheader block in loop nodes.
+loop_body = {'<FOR>': 4, '<WHILE>': 1, '<DO>': 1}
+loop_preheader = {'<FOR>': 5, '<WHILE>': 2, '<DO>': 2}
+
+
+def literal(value):
+    return ASTNode(type='string' if isinstance(value, str) else 'number', value=value)
+
+def is_literal(node):
+    return isinstance(node, ASTNode) and node.type in ASTNode.literals
+
+def foldable(value):
+    return value is None or isinstance(value, (bool, int, float, str))
+
+def expression_key(node):
+    if not isinstance(node, ASTNode):
+        return ('raw', node)
+    if node.type in ASTNode.literals:
+        return (node.type, type(node.value), node.value)
+    return (node.type, node.value, tuple(expression_key(x) for x in node.tree))
+
+def node_size(node):
+    if not isinstance(node, ASTNode):
+        return 1
+    return 1 + sum(node_size(x) for x in node.tree)
+
+def replace_with_id(node, name):
+    # Turn node into a read of name, returning a node with its old content.
+    moved = ASTNode(type=node.type, value=node.value, tree=node.tree)
+    node.type, node.value, node.tree = 'id', name, ASTNode.leaf
+    return moved
+
+def assign_node(name, value, lineno=0):
+    node = ASTNode(type='funcall', value='<ASSIGN>', tree=[name, value])
+    node.lineno = lineno
+    return node
+
+def preheader(loop):
+    index = loop_preheader[loop.value]
+    if len(loop.tree) <= index:
+        loop.add(ASTNode.BlockNode())
+    return loop.tree[index]
+
+
+class Effects:
+    # Names a piece of code may assign, and whether it calls anything that
+    # could assign arbitrary variables.
+    def __init__(self):
+        self.assigned = set()
+        self.mutating = False
+        self.control = False
+
+
+class Optimizer:
+    counter = 0
+
+    def __init__(self, program, level=1):
+        self.level = level
+        self.redefined = set()
+        self.functions = set()
+        self.arrays = set()
+        self.assigned = set()
+        self.indexed = set()
+        self.dynamic = False
+        self.analyze(program)
+        # Arrays other than those only ever created by DIM may be aliased.
+        self.aliased = any(name not in self.arrays or name in self.assigned for name in self.indexed)
+
+    # Program-wide analysis of redefinable names.
+    def analyze(self, node):
+        if isinstance(node, list):
+            for item in node:
+                self.analyze(item)
+            return
+        if not isinstance(node, ASTNode):
+            return
+        if node.type == 'flag':
+            if node.value in ('<SUB>', '<FUNCTION>'):
+                self.functions.add(node.tree[0])
+                self.redefined.add(node.tree[0])
+                self.redefined.update(node.tree[1])
+                self.assigned.update(node.tree[1])
+            elif node.value in ('<FOR>', '<FOR_EACH>', '<PARALLEL_FOR>'):
+                self.redefined.add(node.tree[0].value)
+                self.assigned.add(node.tree[0].value)
+            elif node.value == '<USE>':
+                self.dynamic = True
+        elif node.type == 'funcall':
+            if node.value == '<ASSIGN>':
+                self.redefined.add(node.tree[0])
+                self.assigned.add(node.tree[0])
+            elif node.value == '<DIM_ARRAY>':
+                self.arrays.add(node.tree[0])
+            elif node.value == '<ASSIGN_ARRAY>':
+                self.indexed.add(node.tree[0])
+            elif not node.value.startswith('<'):
+                for arg in node.tree:
+                    if isinstance(arg, ASTNode) and arg.type == 'id':
+                        self.redefined.add(arg.value)
+        elif node.type == 'array':
+            self.analyze(node.value)
+        self.analyze(node.tree)
+
+    def is_known(self, name):
+        return not self.dynamic and name not in self.redefined
+
+    def is_array(self, name):
+        return (not self.dynamic and name in self.arrays
+                and name not in self.functions and name not in self.redefined)
+
+    def is_pure(self, node):
+        if not isinstance(node, ASTNode):
+            return True
+        if node.type in ASTNode.literals or node.type == 'id':
+            return True
+        if node.type != 'funcall':
+            return False
+        name = node.value
+        if name == '<AS>':
+            rhs = node.tree[1]
+            if not (isinstance(rhs, ASTNode) and rhs.type == 'id'
+                    and rhs.value in type_names and self.is_known(rhs.value)):
+                return False
+        elif name not in binary_operators and name not in unary_operators \
+                and name not in ('<AND>', '<OR>'):
+            # An element of an array which may be aliased can be written
+            # through another name, which assigns nothing to the array's.
+            if not (name in pure_builtins and self.is_known(name)) \
+                    and not (self.is_array(name) and not self.aliased):
+                return False
+        return all(self.is_pure(x) for x in node.tree)
+
+    def is_shareable(self, node):
+        # Whether one evaluation of node can stand for several.
+        return self.is_pure(node) and not (self.aliased and node.value in array_results)
+
+    def variables(self, node, names=None):
+        names = set() if names is None else names
+        if isinstance(node, ASTNode):
+            if node.type == 'id':
+                names.add(node.value)
+            elif node.type == 'funcall' and not node.value.startswith('<'):
+                names.add(node.value)
+            for child in node.tree:
+                self.variables(child, names)
+        return names
+
+    def effects(self, node, effects=None):
+        effects = Effects() if effects is None else effects
+        if isinstance(node, list):
+            for item in node:
+                self.effects(item, effects)
+            return effects
+        if not isinstance(node, ASTNode):
+            return effects
+        if node.type == 'flag':
+            if node.value in ('<SUB>', '<FUNCTION>'):
+                effects.assigned.add(node.tree[0])
+                return effects
+            if node.value in ('<FOR>', '<FOR_EACH>'):
+                effects.assigned.add(node.tree[0].value)
+            elif node.value in control_flags:
+                effects.control = True
+            elif node.value in ('<USE>', '<PARALLEL_FOR>'):
+                # Workers of a PARALLEL FOR may assign any variable it uses.
+                effects.mutating = True
+        elif node.type == 'funcall':
+            name = node.value
+            if name == '<ASSIGN>':
+                effects.assigned.add(node.tree[0])
+            elif name in ('<DIM_ARRAY>', '<ASSIGN_ARRAY>'):
+                effects.assigned.add(node.tree[0])
+            elif name == '<ASSIGN_MEMBER>':
+                effects.mutating = True
+            elif not name.startswith('<') and not self.is_array(name):
+                if not (name in passive_builtins and self.is_known(name)):
+                    effects.mutating = True
+                for arg in node.tree:
+                    if isinstance(arg, ASTNode) and arg.type == 'id':
+                        effects.assigned.add(arg.value)
+        elif node.type == 'array':
+            self.effects(node.value, effects)
+        return self.effects(node.tree, effects)
+
+    def new_temp(self, kind):
+        Optimizer.counter += 1
+        return '<%s_%d>' % (kind, Optimizer.counter)
+
+    def optimize(self, node):
+        if self.level >= 1:
+            node = self.fold(node)
+            self.prune(node)
+        if self.level >= 2:
+            vectorize(self, node)
+            self.hoist(node)
+            self.eliminate(node)
+        return node
+
+    # Constant folding.
+    def fold(self, node):
+        if not isinstance(node, ASTNode):
+            return node
+        if node.type == 'array':
+            node.value = [self.fold(x) for x in node.value]
+            return node
+        node.tree = [self.fold(x) if isinstance(x, ASTNode) else x for x in node.tree]
+        if node.type == 'id':
+            if node.value in constant_names and self.is_known(node.value):
+                return literal(global_table.get(node.value))
+        elif node.type == 'funcall':
+            return self.fold_funcall(node)
+        return node
+
+    def fold_funcall(self, node):
+        name, args = node.value, node.tree
+        if name in ('<AND>', '<OR>'):
+            if is_literal(args[0]):
+                taken = bool(args[0].value) == (name == '<OR>')
+                return args[0] if taken else args[1]
+            return node
+        if name == '<AS>':
+            value, rhs = args
+            if is_literal(value) and self.is_pure(node):
+                return self.evaluate(node, lambda: global_table.get(rhs.value)(value.value))
+            return node
+        if not all(is_literal(x) for x in args):
+            return node
+        if name in binary_operators and len(args) == 2:
+            op = binary_operators[name]
+            return self.evaluate(node, lambda: op(args[0].value, args[1].value))
+        if name in unary_operators and len(args) == 1:
+            op = unary_operators[name]
+            return self.evaluate(node, lambda: op(args[0].value))
+        if name in pure_builtins and self.is_known(name):
+            return self.evaluate(node, lambda: global_table.get(name)(args))
+        return node
+
+    def evaluate(self, node, compute):
+        # Errors are left for the program to raise when it gets there.
+        try:
+            value = compute()
+        except Exception:
+            return node
+        return literal(value) if foldable(value) else node
+
+    # Removal of constant branches.
+    def prune(self, node):
+        if not isinstance(node, ASTNode) or node.type != 'flag':
+            return
+        if node.value in ('<PROGRAM>', '<BLOCK>'):
+            statements = []
+            for child in node.tree:
+                self.prune(child)
+                statements.extend(self.prune_seq(child))
+            node.tree = statements
+        else:
+            for child in node.tree:
+                self.prune(child)
+
+    def prune_seq(self, node):
+        # Returns the statements a <SEQ> statement reduces to.
+        if not (isinstance(node, ASTNode) and node.value == '<SEQ>'):
+            return [node]
+        branches = []
+        for branch in node.tree:
+            if isinstance(branch, ASTNode) and branch.value == '<IF>' and is_literal(branch.tree[0]):
+                if branch.tree[0].value is not True:
+                    continue
+                branches.append(branch)
+                break
+            branches.append(branch)
+        node.tree = branches
+        if not branches:
+            return []
+        first = branches[0]
+        if first.value == '<IF>' and is_literal(first.tree[0]):
+            return first.tree[1].tree
+        return [node]
+
+    # Loop-invariant code motion.
+    def hoist(self, node):
+        if not isinstance(node, ASTNode) or node.type != 'flag':
+            return
+        for child in node.tree:
+            self.hoist(child)
+        if node.value in loop_flags:
+            self.hoist_loop(node)
+
+    def hoist_loop(self, loop):
+        effects = self.effects(loop)
+        if effects.mutating:
+            return
+        body = loop.tree[loop_body[loop.value]]
+        # A hoisted expression may raise, so it must not move ahead of
+        # anything the body does: take expressions only from the statements
+        # up to the first with an effect, and from that one only what it
+        # evaluates before its effect.
+        candidates = []
+        for statement in body.tree:
+            for root in self.unconditional(statement):
+                operands = root.tree if root.value in assign_builtins else [root]
+                if all(self.is_pure(x) for x in operands):
+                    self.invariants(root, effects.assigned, candidates)
+            if not self.is_pure(statement):
+                break
+        hoisted = {}
+        for candidate in candidates:
+            key = expression_key(candidate)
+            if key in hoisted:
+                continue
+            name = hoisted[key] = self.new_temp('LICM')
+            preheader(loop).add(assign_node(name, replace_with_id(candidate, name), loop.lineno))
+        if hoisted:
+            targets = [body]
+            if loop.value == '<DO>':
+                targets.append(loop.tree[0])
+            for target in targets:
+                self.replace(target, hoisted)
+
+    def invariants(self, node, assigned, found):
+        if not isinstance(node, ASTNode):
+            return
+        if node.type == 'funcall' and node.value not in ('<AND>', '<OR>') \
+                and self.is_shareable(node) and not (self.variables(node) & assigned):
+            found.append(node)
+            return
+        if node.type == 'funcall' and node.value in ('<AND>', '<OR>'):
+            self.invariants(node.tree[0], assigned, found)
+            return
+        for child in node.tree:
+            self.invariants(child, assigned, found)
+
+    def replace(self, node, names):
+        if not isinstance(node, ASTNode):
+            return
+        if node.type == 'flag' and node.value in ('<SUB>', '<FUNCTION>'):
+            return
+        if node.type == 'funcall' and expression_key(node) in names:
+            replace_with_id(node, names[expression_key(node)])
+            return
+        for child in node.tree:
+            self.replace(child, names)
+
+    def unconditional(self, statement):
+        # Expressions always evaluated when the statement runs.
+        if not isinstance(statement, ASTNode):
+            return []
+        if statement.type == 'funcall':
+            return [statement]
+        if statement.value == '<SEQ>' and statement.tree:
+            first = statement.tree[0]
+            if isinstance(first, ASTNode) and first.value == '<IF>':
+                return [first.tree[0]]
+        if statement.value == '<RETURN>':
+            return [statement.tree[0]]
+        return []
+
+    # Common-subexpression elimination over straight-line statements. An
+    # expression is computed once, where it first occurs, and reused by the
+    # statements after it in the same block, up to the first statement which
+    # assigns one of its variables or may assign any (a call, a wait letting
+    # other tasks run, a PARALLEL FOR, USE). Only expressions every run of a
+    # statement evaluates are shared, and only pure ones: no calls, and no
+    # array elements when arrays may be aliased. So the shared value is the
+    # one each occurrence would have computed.
+    def eliminate(self, node):
+        if not isinstance(node, ASTNode) or node.type != 'flag':
+            return
+        for child in node.tree:
+            self.eliminate(child)
+        if node.value in ('<PROGRAM>', '<BLOCK>'):
+            for _ in range(100):
+                if not self.eliminate_once(node):
+                    break
+
+    def eliminate_once(self, block):
+        groups, open_groups = [], {}
+        for index, statement in enumerate(block.tree):
+            effects = self.effects(statement)
+            if not effects.mutating:
+                for root in self.unconditional(statement):
+                    for expr in self.subexpressions(root):
+                        key = expression_key(expr)
+                        if key not in open_groups:
+                            open_groups[key] = (index, expr, [])
+                            groups.append(open_groups[key])
+                        open_groups[key][2].append(expr)
+            for key in list(open_groups):
+                _, expr, _ = open_groups[key]
+                if effects.mutating or self.variables(expr) & effects.assigned:
+                    del open_groups[key]
+        groups = [g for g in groups if len(g[2]) > 1]
+        if not groups:
+            return False
+        index, expr, occurrences = max(groups, key=lambda g: node_size(g[1]))
+        name = self.new_temp('CSE')
+        value = replace_with_id(occurrences[0], name)
+        for occurrence in occurrences[1:]:
+            replace_with_id(occurrence, name)
+        lineno = getattr(block.tree[index], 'lineno', 0)
+        block.tree.insert(index, assign_node(name, value, lineno))
+        return True
+
+    def subexpressions(self, node, found=None):
+        found = [] if found is None else found
+        if not isinstance(node, ASTNode) or node.type != 'funcall':
+            return found
+        if node.value in ('<AND>', '<OR>'):
+            self.subexpressions(node.tree[0], found)
+            return found
+        if self.is_shareable(node) and node.value not in ('<ASSIGN>',):
+            found.append(node)
+        for child in node.tree:
+            self.subexpressions(child, found)
+        return found
+
+
+def optimize(node, level=1):
+    if level <= 0:
+        return node
+    return Optimizer(node, level).optimize(node)
@@ -0,0 +1,249 @@
+#! python3
+# PARALLEL FOR: a FOR loop whose iterations are split into chunks run by a
+# pool of worker processes.
+#
+#   S = 0
+#   PARALLEL FOR I = 1 TO N REDUCE S WITH +
+#       S = S + F(I)
+#       A(I) = I * I
+#   NEXT I
+#
+# Each chunk starts from a copy of the variables the loop refers to, taken
+# when the loop starts, with the variables of the REDUCE clause set to the
+# identity of their operator (0 or "" for +, 1 for *). When the chunks are
+# done, their values are combined in the order of the chunks, the array
+# elements they assigned are copied back and what they printed is printed.
+# Chunks never see each other's changes. RND is seeded for every chunk from
+# a number drawn when the loop starts, and the chunks only depend on the
+# number of iterations, so RANDOMIZE gives the same results whatever the
+# number of workers.
+import io
+import math
+import os
+import random
+import sys
+import threading
+from contextlib import redirect_stdout
+from importlib import import_module
+from itertools import count
+
+from .basic_array import BasicArray
+from .basic_operators import binary_operators
+from .symbol_table import global_table, table_stack
+from .utils import BasicError
+
+# Pool settings, changed by the command line. A chunk size of 0 splits the
+# iterations into default_chunks chunks.
+workers = os.cpu_count() or 1
+chunk_size = 0
+default_chunks = 64
+
+reductions = {
+    '<PLUS>': binary_operators['<PLUS>'],
+    '<TIMES>': binary_operators['<TIMES>'],
+    'MAX': max,
+    'MIN': min,
+}
+# Engines register a function preparing a <PROGRAM> node to run in the
+# global table of a worker, returning a function running it.
+runners = {}
+
+# Shared by the interpreters of the process.
+pool = None
+pool_size = 0
+pool_lock = threading.Lock()
+loop_ids = count()
+
+
+def register(program, definitions=None):
+    # Records the SUB/FUNCTION definitions under program, which the workers
+    # of loops calling them need, in the running Context.
+    if definitions is None:
+        definitions = table_stack.context.definitions
+    if isinstance(program, list):
+        for item in program:
+            register(item, definitions)
+        return
+    if getattr(program, 'type', None) != 'flag':
+        return
+    if program.value in ('<SUB>', '<FUNCTION>'):
+        definitions[program.tree[0]] = program
+    register(program.tree, definitions)
+
+
+def names_in(node, names):
+    # Names node reads or assigns.
+    if isinstance(node, list):
+        for item in node:
+            names_in(item, names)
+        return names
+    if not hasattr(node, 'tree'):
+        return names
+    if node.type == 'id':
+        names.add(node.value)
+    elif node.type == 'funcall':
+        if not node.value.startswith('<'):
+            names.add(node.value)
+        elif node.value in ('<ASSIGN>', '<ASSIGN_ARRAY>', '<DIM_ARRAY>'):
+            names.add(node.tree[0])
+    elif node.type == 'array':
+        names_in(node.value, names)
+    return names_in(node.tree, names)
+
+
+def assigned_arrays(node, arrays):
+    if isinstance(node, list):
+        for item in node:
+            assigned_arrays(item, arrays)
+    elif hasattr(node, 'tree'):
+        if node.value == '<ASSIGN_ARRAY>':
+            arrays.add(node.tree[0])
+        assigned_arrays(node.tree, arrays)
+    return arrays
+
+
+def chunks(start, end, step):
+    # (first, last) values of the loop variable in every chunk, and the
+    # value it has after the loop.
+    if start.__class__ is int and end.__class__ is int and step.__class__ is int:
+        values = range(start, end + (1 if step > 0 else -1), step)
+        size = chunk_size or max(1, math.ceil(len(values) / default_chunks))
+        bounds = [(values[i], values[min(i + size, len(values)) - 1]) for i in range(0, len(values), size)]
+        return bounds, values[-1] + step if values else start
+    values = []
+    value = start
+    while value <= end if step >= 0 else value >= end:
+        values.append(value)
+        value += step
+    size = chunk_size or max(1, math.ceil(len(values) / default_chunks))
+    return [(values[i], values[min(i + size, len(values)) - 1]) for i in range(0, len(values), size)], value
+
+
+def get_pool():
+    global pool, pool_size
+    from concurrent.futures import ProcessPoolExecutor
+    with pool_lock:
+        if pool is None or pool_size != workers:
+            if pool is not None:
+                pool.shutdown()
+            # Workers load every engine before running chunks.
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=import_module,
+                initargs=(__package__ + '.pybasic',))
+            pool_size = workers
+        return pool
+
+
+def parallel_for(node, start, end, step, engine, table):
+    import pickle
+    var, body, reduced = node.tree[0].value, node.tree[4], node.tree[5]
+    if not step:
+        raise BasicError('PARALLEL FOR with a STEP of 0')
+    bounds, after = chunks(start, end, step)
+    if not bounds:
+        table.set(var, after)
+        return
+    # Variables and definitions the loop needs.
+    names = names_in(body, set())
+    definitions = table_stack.context.definitions
+    functions = []
+    pending = [x for x in names if x in definitions]
+    while pending:
+        name = pending.pop()
+        if definitions[name] in functions:
+            continue
+        functions.append(definitions[name])
+        found = names_in(definitions[name].tree[2], set())
+        names |= found
+        pending.extend(x for x in found if x in definitions)
+    skipped = {var} | {name for name, _ in reduced}
+    values = {}
+    for name in sorted(names - skipped):
+        try:
+            value = table.get(name)
+        except BasicError:
+            continue
+        if not callable(value):
+            values[name] = value
+    initial = [(name, op, table.get(name)) for name, op in reduced]
+    try:
+        shared = pickle.dumps(values)
+    except Exception as e:
+        raise BasicError('Cannot pass the variables of PARALLEL FOR to workers: %s' % e)
+    # The loop each worker runs for a chunk.
+    make = node.__class__
+    loop = make(type='flag', value='<FOR>', tree=[node.tree[0],
+        make(type='id', value='<PARALLEL_FIRST>'), make(type='id', value='<PARALLEL_LAST>'),
+        make(type='id', value='<PARALLEL_STEP>'), body])
+    program = make(type='flag', value='<PROGRAM>', tree=functions + [loop])
+    identities = [(name, op, 1 if op == '<TIMES>' else value.__class__() if op == '<PLUS>'
+        else -math.inf if op == 'MAX' else math.inf) for name, op, value in initial]
+    task = pickle.dumps((program, engine, identities, sorted(assigned_arrays(body, set()))))
+    key = (os.getpid(), next(loop_ids))
+    seed = random.getrandbits(64)
+    jobs = [(key, task, shared, first, last, step, seed + index)
+        for index, (first, last) in enumerate(bounds)]
+    results = get_pool().map(run_chunk, *zip(*jobs))
+    totals = {name: value for name, _, value in initial}
+    stdout = table_stack.context.stdout or sys.stdout
+    for output, partials, writes in results:
+        stdout.write(output)
+        for (name, op, _), partial in zip(initial, partials):
+            totals[name] = reductions[op](totals[name], partial)
+        for name, changes in writes.items():
+            target = table.get(name)
+            for index, value in changes:
+                target[index] = value
+    for name, value in totals.items():
+        table.set(name, value)
+    table.set(var, after)
+
+
+# Worker side. The loop of the last task is kept compiled.
+current = None
+
+
+def run_chunk(key, task, shared, first, last, step, seed):
+    global current
+    import pickle
+    if current is None or current[0] != key:
+        program, engine, identities, arrays = pickle.loads(task)
+        current = (key, runners[engine](program), identities, arrays)
+    _, run, identities, arrays = current
+    values = pickle.loads(shared)
+    before = pickle.loads(shared)
+    # Variables the chunk is given or creates are not seen by the next one.
+    gtab = global_table.gtab
+    known = set(gtab)
+    try:
+        for name, value in values.items():
+            global_table.set(name, value)
+        for name, _, identity in identities:
+            global_table.set(name, identity)
+        global_table.set('<PARALLEL_FIRST>', first)
+        global_table.set('<PARALLEL_LAST>', last)
+        global_table.set('<PARALLEL_STEP>', step)
+        random.seed(seed)
+        output = io.StringIO()
+        # PRINT writes to the stdout of the Context, which a forked worker
+        # inherits from the thread starting it.
+        table_stack.context.stdout = output
+        with redirect_stdout(output):
+            run()
+        partials = [global_table.get(name) for name, _, _ in identities]
+        writes = {}
+        for name in arrays:
+            if name in before:
+                changes = changed(before[name], global_table.get(name))
+                if changes:
+                    writes[name] = changes
+        return output.getvalue(), partials, writes
+    finally:
+        for name in set(gtab) - known:
+            del gtab[name]
+
+
+def changed(old, new):
+    # (index, value) of the elements of array new which differ from old.
+    if isinstance(old, BasicArray):
+        old, new = old.data, new.data
+    return [(i, y) for i, (x, y) in enumerate(zip(old, new)) if x != y or x.__class__ is not y.__class__]
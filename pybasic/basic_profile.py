@@ -0,0 +1,144 @@
+#! python3
+# Per-function and per-statement profiler for compiled programs. It costs
+# nothing unless a Profiler is handed to the compiler, which then wraps the
+# closures of every statement and function body.
+import sys
+import time
+
+
+class ProfileEntry:
+    __slots__ = ('kind', 'name', 'line', 'calls', 'total_time', 'self_time',
+                 'depth', 'max_depth')
+
+    def __init__(self, kind, name, line=0):
+        self.kind = kind
+        self.name = name
+        self.line = line
+        self.calls = 0
+        self.total_time = 0.0
+        self.self_time = 0.0
+        self.depth = 0
+        self.max_depth = 0
+
+    def as_dict(self):
+        return {
+            'kind': self.kind,
+            'name': self.name,
+            'line': self.line,
+            'calls': self.calls,
+            'total_time': self.total_time,
+            'self_time': self.self_time,
+            'max_depth': self.max_depth,
+        }
+
+
+class Profiler:
+    sort_keys = ('self', 'total', 'calls', 'depth')
+
+    def __init__(self, timer=time.perf_counter):
+        self.timer = timer
+        self.entries = {}
+        # Time spent in profiled callees, one cell per active entry.
+        self.stack = []
+
+    def entry(self, kind, name, line=0):
+        key = (kind, name, line)
+        if key not in self.entries:
+            self.entries[key] = ProfileEntry(kind, name, line)
+        return self.entries[key]
+
+    def statement(self, node):
+        name = node.value
+        if name in ('<ASSIGN>', '<ASSIGN_ARRAY>', '<DIM_ARRAY>') and node.tree:
+            name = '%s %s' % (name, node.tree[0])
+        return self.entry('statement', name, node.lineno)
+
+    def function(self, name):
+        return self.entry('function', name)
+
+    def wrap(self, entry, func):
+        stack = self.stack
+        timer = self.timer
+        def profiled(env):
+            entry.calls += 1
+            entry.depth += 1
+            if entry.depth > entry.max_depth:
+                entry.max_depth = entry.depth
+            children = [0.0]
+            stack.append(children)
+            start = timer()
+            try:
+                return func(env)
+            finally:
+                elapsed = timer() - start
+                stack.pop()
+                entry.depth -= 1
+                entry.self_time += elapsed - children[0]
+                # Recursive activations are only counted once.
+                if entry.depth == 0:
+                    entry.total_time += elapsed
+                if stack:
+                    stack[-1][0] += elapsed
+        return profiled
+
+    def sorted_entries(self, sort='self'):
+        key = {
+            'self': lambda e: e.self_time,
+            'total': lambda e: e.total_time,
+            'calls': lambda e: e.calls,
+            'depth': lambda e: e.max_depth,
+        }[sort]
+        return sorted((e for e in self.entries.values() if e.calls), key=key, reverse=True)
+
+    def report(self, sort='self', file=sys.stderr, limit=None):
+        entries = self.sorted_entries(sort)[:limit]
+        print('%10s %12s %12s %12s %6s  %s' % (
+            'calls', 'total (s)', 'self (s)', 'self/call', 'depth', 'name'), file=file)
+        for e in entries:
+            where = 'line %d: %s' % (e.line, e.name) if e.kind == 'statement' else 'FUNCTION %s' % e.name
+            print('%10d %12.6f %12.6f %12.9f %6d  %s' % (
+                e.calls, e.total_time, e.self_time, e.self_time / e.calls, e.max_depth, where), file=file)
+
+    def dump_json(self, file_name, sort='self'):
+        import json
+        with open(file_name, 'w') as f:
+            json.dump([e.as_dict() for e in self.sorted_entries(sort)], f, indent=2)
+
+
+# Helpers of the timing commands of the REPL.
+time_units = (('sec', 1.0), ('msec', 1e-3), ('usec', 1e-6), ('nsec', 1e-9))
+size_units = (('MiB', 1 << 20), ('KiB', 1 << 10), ('B', 1))
+
+
+def format_time(seconds):
+    for unit, scale in time_units:
+        if seconds >= scale:
+            break
+    return '%.3g %s' % (seconds / scale, unit)
+
+
+def format_size(size):
+    for unit, scale in size_units:
+        if abs(size) >= scale:
+            break
+    return '%.3g %s' % (size / scale, unit)
+
+
+def time_loops(run, number, timer=time.perf_counter):
+    # Seconds run() takes number times in a row.
+    loops = range(number)
+    start = timer()
+    for _ in loops:
+        run()
+    return timer() - start
+
+
+def autorange(run, min_time=0.2):
+    # How many times in a row run() needs to take at least min_time, trying
+    # 1, 2, 5, 10, 20, 50... times like the timeit module.
+    number = 1
+    while True:
+        for factor in (1, 2, 5):
+            if time_loops(run, number * factor) >= min_time:
+                return number * factor
+        number *= 10
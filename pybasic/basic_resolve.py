@@ -0,0 +1,65 @@
+#! python3
+# Resolution pass run on SUB/FUNCTION bodies before they are compiled. Every
+# variable the body may assign gets a fixed slot in the call Frame, anything
+# it only reads is looked up in the global table directly.
+from .basic_ast import ASTNode
+from .symbol_table import UNSET
+
+
+class Scope:
+    def __init__(self, params):
+        self.params = tuple(params)
+        self.names = []
+        self.index = {}
+        self.template = ()
+        for name in params:
+            self.add(name)
+
+    def add(self, name):
+        if name not in self.index:
+            self.index[name] = len(self.names)
+            self.names.append(name)
+
+    def is_local(self, name):
+        return name in self.index
+
+
+def collect_locals(node, scope):
+    if isinstance(node, list):
+        for item in node:
+            collect_locals(item, scope)
+    if not isinstance(node, ASTNode):
+        return
+    if node.type == 'flag':
+        if node.value in ('<SUB>', '<FUNCTION>'):
+            # Nested definitions only bind their name here.
+            scope.add(node.tree[0])
+            return
+        if node.value in ('<FOR>', '<FOR_EACH>', '<PARALLEL_FOR>'):
+            scope.add(node.tree[0].value)
+    elif node.type == 'funcall':
+        if node.value == '<ASSIGN>':
+            scope.add(node.tree[0])
+        elif not node.value.startswith('<'):
+            # Builtins such as SWAP may assign to plain variable arguments.
+            for arg in node.tree:
+                if isinstance(arg, ASTNode) and arg.type == 'id':
+                    scope.add(arg.value)
+    elif node.type == 'array':
+        collect_locals(node.value, scope)
+        return
+    collect_locals(node.tree, scope)
+
+
+def assigned_names(node):
+    # Names node may assign, including through by-name arguments.
+    scope = Scope(())
+    collect_locals(node, scope)
+    return scope.index
+
+
+def resolve_function(node):
+    scope = Scope(node.tree[1])
+    collect_locals(node.tree[2], scope)
+    scope.template = (UNSET,) * len(scope.names)
+    return scope
@@ -0,0 +1,566 @@
+# Parser tables made by basic_yacc.write_tables(), do not edit.
+checksum = '5e3dba4d'
+actions = [
+    {'NEWLINE': -4, 'SELECT': -4, 'USE': -4, 'ID': -4, 'LET': -4, 'EXIT': -4, 'CONTINUE': -4, 'RETURN': -4, 'END': -4, 'DEFUN': -4, 'MINUS': -4, 'LPAREN': -4, 'INTEGER': -4, 'DECIMAL': -4, 'STRING': -4, 'LBRACE': -4, 'WEND': -4, 'NEXT': -4, 'LOOP': -4, 'IF': -4, 'ELSEIF': -4, 'ELSE': -4, 'CASE': -4, 'DIM': -4, 'WHILE': -4, 'FOR': -4, 'DO': -4, 'SUB': -4, 'FUNCTION': -4, '$end': -4},
+    {'$end': 0, 'NEWLINE': 3, 'SELECT': 19, 'USE': 21, 'ID': 22, 'LET': 23, 'EXIT': 26, 'CONTINUE': 30, 'RETURN': 31, 'END': 32, 'DEFUN': 33, 'MINUS': 34, 'LPAREN': 24, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38, 'WEND': 46, 'NEXT': 47, 'LOOP': 48, 'IF': 45, 'ELSEIF': 51, 'ELSE': 52, 'CASE': 20, 'DIM': 53, 'WHILE': 27, 'FOR': 29, 'DO': 28, 'SUB': 49, 'FUNCTION': 50},
+    {'NEWLINE': 54, 'COLON': 55},
+    {'NEWLINE': -3, 'SELECT': -3, 'USE': -3, 'ID': -3, 'LET': -3, 'EXIT': -3, 'CONTINUE': -3, 'RETURN': -3, 'END': -3, 'DEFUN': -3, 'MINUS': -3, 'LPAREN': -3, 'INTEGER': -3, 'DECIMAL': -3, 'STRING': -3, 'LBRACE': -3, 'WEND': -3, 'NEXT': -3, 'LOOP': -3, 'IF': -3, 'ELSEIF': -3, 'ELSE': -3, 'CASE': -3, 'DIM': -3, 'WHILE': -3, 'FOR': -3, 'DO': -3, 'SUB': -3, 'FUNCTION': -3, '$end': -3},
+    {'NEWLINE': -5, 'COLON': -5},
+    {'NEWLINE': -6, 'COLON': -6},
+    {'NEWLINE': -7, 'COLON': -7},
+    {'NEWLINE': -8, 'COLON': -8},
+    {'NEWLINE': -9, 'COLON': -9},
+    {'NEWLINE': -10, 'COLON': -10},
+    {'NEWLINE': -11, 'COLON': -11},
+    {'NEWLINE': -12, 'COLON': -12, 'DOT': 56, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64},
+    {'NEWLINE': -13, 'COLON': -13},
+    {'NEWLINE': -14, 'COLON': -14},
+    {'NEWLINE': -15, 'COLON': -15},
+    {'NEWLINE': -16, 'COLON': -16},
+    {'NEWLINE': -17, 'COLON': -17},
+    {'NEWLINE': -18, 'COLON': -18},
+    {'NEWLINE': -19, 'COLON': -19},
+    {'CASE': 65, 'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'ELSE': 69, 'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'ID': 70},
+    {'EQUALS': 72, 'LPAREN': 74, 'ID': 71, 'DOT': -62, 'PLUS': -62, 'MINUS': 34, 'TIMES': -62, 'DIVIDE': -62, 'EXACTDIV': -62, 'MOD': -62, 'AS': -62, 'EXP': -62, 'NEWLINE': -62, 'COLON': -62, 'FOR': 77, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'ID': 78},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'NEWLINE': -31, 'COLON': -31},
+    {'WHILE': 80, 'DO': 81, 'FOR': 82},
+    {'LPAREN': 85, 'NOT': 86, 'MINUS': 34, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'NEWLINE': -78, 'COLON': -78},
+    {'ID': 87},
+    {'WHILE': 88, 'DO': 89, 'FOR': 90},
+    {'NEWLINE': -104, 'COLON': -104, 'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'NEWLINE': -106, 'COLON': -106, 'IF': 92, 'SELECT': 93, 'WHILE': 94, 'FOR': 95, 'SUB': 96, 'FUNCTION': 97},
+    {'ID': 98},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'DOT': -59, 'PLUS': -59, 'MINUS': -59, 'TIMES': -59, 'DIVIDE': -59, 'EXACTDIV': -59, 'MOD': -59, 'AS': -59, 'EXP': -59, 'NEWLINE': -59, 'COLON': -59, 'COMMA': -59, 'RPAREN': -59, 'GREATER_THAN': -59, 'LESS_THAN': -59, 'EQUAL_GREATER_THAN': -59, 'EQUAL_LESS_THAN': -59, 'EQUALS': -59, 'NOT_EQUAL': -59, 'RBRACE': -59, 'TO': -59, 'AND': -59, 'OR': -59, 'THEN': -59, 'STEP': -59, 'ID': -59},
+    {'DOT': -60, 'PLUS': -60, 'MINUS': -60, 'TIMES': -60, 'DIVIDE': -60, 'EXACTDIV': -60, 'MOD': -60, 'AS': -60, 'EXP': -60, 'NEWLINE': -60, 'COLON': -60, 'COMMA': -60, 'RPAREN': -60, 'GREATER_THAN': -60, 'LESS_THAN': -60, 'EQUAL_GREATER_THAN': -60, 'EQUAL_LESS_THAN': -60, 'EQUALS': -60, 'NOT_EQUAL': -60, 'RBRACE': -60, 'TO': -60, 'AND': -60, 'OR': -60, 'THEN': -60, 'STEP': -60, 'ID': -60},
+    {'DOT': -61, 'PLUS': -61, 'MINUS': -61, 'TIMES': -61, 'DIVIDE': -61, 'EXACTDIV': -61, 'MOD': -61, 'AS': -61, 'EXP': -61, 'NEWLINE': -61, 'COLON': -61, 'COMMA': -61, 'RPAREN': -61, 'GREATER_THAN': -61, 'LESS_THAN': -61, 'EQUAL_GREATER_THAN': -61, 'EQUAL_LESS_THAN': -61, 'EQUALS': -61, 'NOT_EQUAL': -61, 'RBRACE': -61, 'TO': -61, 'AND': -61, 'OR': -61, 'THEN': -61, 'STEP': -61, 'ID': -61},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'NEWLINE': -64, 'COLON': -64},
+    {'NEWLINE': -65, 'COLON': -65},
+    {'NEWLINE': -66, 'COLON': -66},
+    {'NEWLINE': -67, 'COLON': -67},
+    {'NEWLINE': -68, 'COLON': -68},
+    {'NEWLINE': -69, 'COLON': -69},
+    {'LPAREN': 85, 'NOT': 86, 'MINUS': 34, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'NEWLINE': -96, 'COLON': -96},
+    {'ID': 102},
+    {'NEWLINE': -99, 'COLON': -99, 'WHILE': 103, 'UNTIL': 104},
+    {'ID': 105},
+    {'ID': 106},
+    {'LPAREN': 85, 'NOT': 86, 'MINUS': 34, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'NEWLINE': -71, 'COLON': -71},
+    {'ID': 108},
+    {'NEWLINE': -1, 'SELECT': -1, 'USE': -1, 'ID': -1, 'LET': -1, 'EXIT': -1, 'CONTINUE': -1, 'RETURN': -1, 'END': -1, 'DEFUN': -1, 'MINUS': -1, 'LPAREN': -1, 'INTEGER': -1, 'DECIMAL': -1, 'STRING': -1, 'LBRACE': -1, 'WEND': -1, 'NEXT': -1, 'LOOP': -1, 'IF': -1, 'ELSEIF': -1, 'ELSE': -1, 'CASE': -1, 'DIM': -1, 'WHILE': -1, 'FOR': -1, 'DO': -1, 'SUB': -1, 'FUNCTION': -1, '$end': -1},
+    {'NEWLINE': -2, 'SELECT': -2, 'USE': -2, 'ID': -2, 'LET': -2, 'EXIT': -2, 'CONTINUE': -2, 'RETURN': -2, 'END': -2, 'DEFUN': -2, 'MINUS': -2, 'LPAREN': -2, 'INTEGER': -2, 'DECIMAL': -2, 'STRING': -2, 'LBRACE': -2, 'WEND': -2, 'NEXT': -2, 'LOOP': -2, 'IF': -2, 'ELSEIF': -2, 'ELSE': -2, 'CASE': -2, 'DIM': -2, 'WHILE': -2, 'FOR': -2, 'DO': -2, 'SUB': -2, 'FUNCTION': -2, '$end': -2},
+    {'ID': 109},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'NEWLINE': -74, 'COLON': -74, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'LPAREN': 121, 'ID': 120, 'PLUS': -62, 'MINUS': -62, 'TIMES': -62, 'DIVIDE': -62, 'EXACTDIV': -62, 'MOD': -62, 'AS': -62, 'EXP': -62, 'DOT': -62, 'NEWLINE': -62, 'COLON': -62, 'RPAREN': -62, 'GREATER_THAN': -62, 'LESS_THAN': -62, 'EQUAL_GREATER_THAN': -62, 'EQUAL_LESS_THAN': -62, 'EQUALS': -62, 'NOT_EQUAL': -62, 'COMMA': -62, 'RBRACE': -62, 'TO': -62, 'AND': -62, 'OR': -62, 'THEN': -62, 'STEP': -62},
+    {'NEWLINE': -75, 'COLON': -75, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'NEWLINE': -76, 'COLON': -76},
+    {'NEWLINE': -113, 'COLON': -113},
+    {'LPAREN': 122, 'ID': 120, 'PLUS': -62, 'MINUS': -62, 'TIMES': -62, 'DIVIDE': -62, 'EXACTDIV': -62, 'MOD': -62, 'AS': -62, 'EXP': -62, 'DOT': -62, 'COMMA': -62, 'NEWLINE': -62, 'COLON': -62},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'COMMA': -21, 'NEWLINE': -21, 'COLON': -21, 'RBRACE': -21, 'RPAREN': -21, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'RPAREN': 125, 'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'NEWLINE': -25, 'COLON': -25, 'COMMA': 127},
+    {'NEWLINE': -82, 'COLON': -82, 'ID': 128},
+    {'ID': 129},
+    {'EQUALS': 130},
+    {'RPAREN': 131, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'NEWLINE': -107, 'COLON': -107},
+    {'NEWLINE': -108, 'COLON': -108},
+    {'NEWLINE': -109, 'COLON': -109},
+    {'NEWLINE': -77, 'COLON': -77, 'AND': 132, 'OR': 133},
+    {'GREATER_THAN': 134, 'LESS_THAN': 135, 'EQUAL_GREATER_THAN': 136, 'EQUAL_LESS_THAN': 137, 'EQUALS': 138, 'NOT_EQUAL': 139, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'LPAREN': 85, 'NOT': 86, 'MINUS': 34, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'LPAREN': 85, 'NOT': 86, 'MINUS': 34, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'EQUALS': 144, 'ID': 143},
+    {'NEWLINE': -110, 'COLON': -110},
+    {'NEWLINE': -111, 'COLON': -111},
+    {'NEWLINE': -112, 'COLON': -112},
+    {'NEWLINE': -105, 'COLON': -105, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'NEWLINE': -93, 'COLON': -93},
+    {'NEWLINE': -94, 'COLON': -94},
+    {'NEWLINE': -95, 'COLON': -95},
+    {'NEWLINE': -97, 'COLON': -97},
+    {'NEWLINE': -102, 'COLON': -102},
+    {'NEWLINE': -103, 'COLON': -103},
+    {'LPAREN': 145},
+    {'DOT': 119, 'PLUS': -52, 'MINUS': -52, 'TIMES': -52, 'DIVIDE': -52, 'EXACTDIV': -52, 'MOD': -52, 'AS': -52, 'EXP': -52, 'NEWLINE': -52, 'COLON': -52, 'COMMA': -52, 'RPAREN': -52, 'GREATER_THAN': -52, 'LESS_THAN': -52, 'EQUAL_GREATER_THAN': -52, 'EQUAL_LESS_THAN': -52, 'EQUALS': -52, 'NOT_EQUAL': -52, 'RBRACE': -52, 'TO': -52, 'AND': -52, 'OR': -52, 'THEN': -52, 'STEP': -52, 'ID': -52},
+    {'RBRACE': 146, 'COMMA': 127},
+    {'THEN': 147, 'AND': 132, 'OR': 133},
+    {'NEWLINE': -98, 'COLON': -98},
+    {'LPAREN': 85, 'NOT': 86, 'MINUS': 34, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'LPAREN': 85, 'NOT': 86, 'MINUS': 34, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'LPAREN': 150},
+    {'LPAREN': 151},
+    {'THEN': 152, 'AND': 132, 'OR': 133},
+    {'LPAREN': 153},
+    {'EQUALS': 154, 'DOT': -51, 'PLUS': -51, 'MINUS': -51, 'TIMES': -51, 'DIVIDE': -51, 'EXACTDIV': -51, 'MOD': -51, 'AS': -51, 'EXP': -51, 'NEWLINE': -51, 'COLON': -51},
+    {'DOT': 119, 'PLUS': -43, 'MINUS': -43, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': -43, 'EXP': 64, 'NEWLINE': -43, 'COLON': -43, 'COMMA': -43, 'RPAREN': -43, 'GREATER_THAN': -43, 'LESS_THAN': -43, 'EQUAL_GREATER_THAN': -43, 'EQUAL_LESS_THAN': -43, 'EQUALS': -43, 'NOT_EQUAL': -43, 'RBRACE': -43, 'TO': -43, 'AND': -43, 'OR': -43, 'THEN': -43, 'STEP': -43, 'ID': -43},
+    {'DOT': 119, 'PLUS': -44, 'MINUS': -44, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': -44, 'EXP': 64, 'NEWLINE': -44, 'COLON': -44, 'COMMA': -44, 'RPAREN': -44, 'GREATER_THAN': -44, 'LESS_THAN': -44, 'EQUAL_GREATER_THAN': -44, 'EQUAL_LESS_THAN': -44, 'EQUALS': -44, 'NOT_EQUAL': -44, 'RBRACE': -44, 'TO': -44, 'AND': -44, 'OR': -44, 'THEN': -44, 'STEP': -44, 'ID': -44},
+    {'DOT': 119, 'PLUS': -45, 'MINUS': -45, 'TIMES': -45, 'DIVIDE': -45, 'EXACTDIV': -45, 'MOD': -45, 'AS': -45, 'EXP': 64, 'NEWLINE': -45, 'COLON': -45, 'COMMA': -45, 'RPAREN': -45, 'GREATER_THAN': -45, 'LESS_THAN': -45, 'EQUAL_GREATER_THAN': -45, 'EQUAL_LESS_THAN': -45, 'EQUALS': -45, 'NOT_EQUAL': -45, 'RBRACE': -45, 'TO': -45, 'AND': -45, 'OR': -45, 'THEN': -45, 'STEP': -45, 'ID': -45},
+    {'DOT': 119, 'PLUS': -46, 'MINUS': -46, 'TIMES': -46, 'DIVIDE': -46, 'EXACTDIV': -46, 'MOD': -46, 'AS': -46, 'EXP': 64, 'NEWLINE': -46, 'COLON': -46, 'COMMA': -46, 'RPAREN': -46, 'GREATER_THAN': -46, 'LESS_THAN': -46, 'EQUAL_GREATER_THAN': -46, 'EQUAL_LESS_THAN': -46, 'EQUALS': -46, 'NOT_EQUAL': -46, 'RBRACE': -46, 'TO': -46, 'AND': -46, 'OR': -46, 'THEN': -46, 'STEP': -46, 'ID': -46},
+    {'DOT': 119, 'PLUS': -47, 'MINUS': -47, 'TIMES': -47, 'DIVIDE': -47, 'EXACTDIV': -47, 'MOD': -47, 'AS': -47, 'EXP': 64, 'NEWLINE': -47, 'COLON': -47, 'COMMA': -47, 'RPAREN': -47, 'GREATER_THAN': -47, 'LESS_THAN': -47, 'EQUAL_GREATER_THAN': -47, 'EQUAL_LESS_THAN': -47, 'EQUALS': -47, 'NOT_EQUAL': -47, 'RBRACE': -47, 'TO': -47, 'AND': -47, 'OR': -47, 'THEN': -47, 'STEP': -47, 'ID': -47},
+    {'DOT': 119, 'PLUS': -48, 'MINUS': -48, 'TIMES': -48, 'DIVIDE': -48, 'EXACTDIV': -48, 'MOD': -48, 'AS': -48, 'EXP': 64, 'NEWLINE': -48, 'COLON': -48, 'COMMA': -48, 'RPAREN': -48, 'GREATER_THAN': -48, 'LESS_THAN': -48, 'EQUAL_GREATER_THAN': -48, 'EQUAL_LESS_THAN': -48, 'EQUALS': -48, 'NOT_EQUAL': -48, 'RBRACE': -48, 'TO': -48, 'AND': -48, 'OR': -48, 'THEN': -48, 'STEP': -48, 'ID': -48},
+    {'DOT': 119, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': -49, 'EXP': 64, 'NEWLINE': -49, 'COLON': -49, 'COMMA': -49, 'RPAREN': -49, 'GREATER_THAN': -49, 'LESS_THAN': -49, 'EQUAL_GREATER_THAN': -49, 'EQUAL_LESS_THAN': -49, 'EQUALS': -49, 'NOT_EQUAL': -49, 'RBRACE': -49, 'TO': -49, 'AND': -49, 'OR': -49, 'THEN': -49, 'STEP': -49, 'ID': -49},
+    {'DOT': 119, 'PLUS': -50, 'MINUS': -50, 'TIMES': -50, 'DIVIDE': -50, 'EXACTDIV': -50, 'MOD': -50, 'AS': -50, 'EXP': -50, 'NEWLINE': -50, 'COLON': -50, 'COMMA': -50, 'RPAREN': -50, 'GREATER_THAN': -50, 'LESS_THAN': -50, 'EQUAL_GREATER_THAN': -50, 'EQUAL_LESS_THAN': -50, 'EQUALS': -50, 'NOT_EQUAL': -50, 'RBRACE': -50, 'TO': -50, 'AND': -50, 'OR': -50, 'THEN': -50, 'STEP': -50, 'ID': -50},
+    {'NEWLINE': -73, 'COLON': -73, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'ID': 155},
+    {'LPAREN': 156},
+    {'RPAREN': 125, 'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'RPAREN': 159, 'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'NEWLINE': -26, 'COLON': -26, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'RPAREN': 161, 'TO': 162, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119, 'COMMA': -21},
+    {'DOT': -54, 'PLUS': -54, 'MINUS': -54, 'TIMES': -54, 'DIVIDE': -54, 'EXACTDIV': -54, 'MOD': -54, 'AS': -54, 'EXP': -54, 'NEWLINE': -54, 'COLON': -54, 'RPAREN': -54, 'GREATER_THAN': -54, 'LESS_THAN': -54, 'EQUAL_GREATER_THAN': -54, 'EQUAL_LESS_THAN': -54, 'EQUALS': -54, 'NOT_EQUAL': -54, 'COMMA': -54, 'RBRACE': -54, 'TO': -54, 'AND': -54, 'OR': -54, 'THEN': -54, 'STEP': -54, 'ID': -54},
+    {'RPAREN': 163, 'COMMA': 127},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'ID': 165},
+    {'EQUALS': 144},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'DOT': -53, 'PLUS': -53, 'MINUS': -53, 'TIMES': -53, 'DIVIDE': -53, 'EXACTDIV': -53, 'MOD': -53, 'AS': -53, 'EXP': -53, 'NEWLINE': -53, 'COLON': -53, 'RPAREN': -53, 'GREATER_THAN': -53, 'LESS_THAN': -53, 'EQUAL_GREATER_THAN': -53, 'EQUAL_LESS_THAN': -53, 'EQUALS': -53, 'NOT_EQUAL': -53, 'COMMA': -53, 'RBRACE': -53, 'TO': -53, 'AND': -53, 'OR': -53, 'THEN': -53, 'STEP': -53, 'ID': -53},
+    {'LPAREN': 85, 'NOT': 86, 'MINUS': 34, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'LPAREN': 85, 'NOT': 86, 'MINUS': 34, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'RPAREN': 177, 'AND': 132, 'OR': 133},
+    {'RPAREN': 131, 'GREATER_THAN': 134, 'LESS_THAN': 135, 'EQUAL_GREATER_THAN': 136, 'EQUAL_LESS_THAN': 137, 'EQUALS': 138, 'NOT_EQUAL': 139, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'AND': -42, 'OR': -42, 'NEWLINE': -42, 'COLON': -42, 'THEN': -42, 'RPAREN': -42},
+    {'ID': 178},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'ID': 180},
+    {'DOT': -63, 'PLUS': -63, 'MINUS': -63, 'TIMES': -63, 'DIVIDE': -63, 'EXACTDIV': -63, 'MOD': -63, 'AS': -63, 'EXP': -63, 'NEWLINE': -63, 'COLON': -63, 'COMMA': -63, 'RPAREN': -63, 'GREATER_THAN': -63, 'LESS_THAN': -63, 'EQUAL_GREATER_THAN': -63, 'EQUAL_LESS_THAN': -63, 'EQUALS': -63, 'NOT_EQUAL': -63, 'RBRACE': -63, 'TO': -63, 'AND': -63, 'OR': -63, 'THEN': -63, 'STEP': -63, 'ID': -63},
+    {'NEWLINE': -70, 'COLON': -70},
+    {'NEWLINE': -100, 'COLON': -100, 'AND': 132, 'OR': 133},
+    {'NEWLINE': -101, 'COLON': -101, 'AND': 132, 'OR': 133},
+    {'RPAREN': 183, 'ID': 180},
+    {'RPAREN': 185, 'ID': 180},
+    {'NEWLINE': -72, 'COLON': -72},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'PLUS': -51, 'MINUS': -51, 'TIMES': -51, 'DIVIDE': -51, 'EXACTDIV': -51, 'MOD': -51, 'AS': -51, 'EXP': -51, 'DOT': -51, 'NEWLINE': -51, 'COLON': -51, 'COMMA': -51, 'RPAREN': -51, 'GREATER_THAN': -51, 'LESS_THAN': -51, 'EQUAL_GREATER_THAN': -51, 'EQUAL_LESS_THAN': -51, 'EQUALS': -51, 'NOT_EQUAL': -51, 'RBRACE': -51, 'TO': -51, 'AND': -51, 'OR': -51, 'THEN': -51, 'STEP': -51, 'ID': -51},
+    {'RPAREN': 188, 'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'RPAREN': 190, 'COMMA': 127},
+    {'TO': 162, 'RPAREN': -21, 'COMMA': -21, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'DOT': -54, 'PLUS': -54, 'MINUS': -54, 'TIMES': -54, 'DIVIDE': -54, 'EXACTDIV': -54, 'MOD': -54, 'AS': -54, 'EXP': -54, 'NEWLINE': -54, 'COLON': -54, 'COMMA': -54},
+    {'RPAREN': 191, 'COMMA': 127},
+    {'EQUALS': 192, 'PLUS': -53, 'MINUS': -53, 'TIMES': -53, 'DIVIDE': -53, 'EXACTDIV': -53, 'MOD': -53, 'AS': -53, 'EXP': -53, 'DOT': -53, 'COMMA': -53, 'NEWLINE': -53, 'COLON': -53},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'EQUALS': 194, 'DOT': -55, 'PLUS': -55, 'MINUS': -55, 'TIMES': -55, 'DIVIDE': -55, 'EXACTDIV': -55, 'MOD': -55, 'AS': -55, 'EXP': -55, 'NEWLINE': -55, 'COLON': -55},
+    {'COMMA': -20, 'NEWLINE': -20, 'COLON': -20, 'RBRACE': -20, 'RPAREN': -20, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'ID': 195},
+    {'NEWLINE': -83, 'COLON': -83, 'COMMA': 196},
+    {'COMMA': -85, 'NEWLINE': -85, 'COLON': -85},
+    {'NEWLINE': -27, 'COLON': -27, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'AND': -39, 'OR': -39, 'NEWLINE': -39, 'COLON': -39, 'THEN': -39, 'RPAREN': -39},
+    {'AND': -40, 'OR': -40, 'NEWLINE': -40, 'COLON': -40, 'THEN': -40, 'RPAREN': -40},
+    {'AND': -33, 'OR': -33, 'NEWLINE': -33, 'COLON': -33, 'THEN': -33, 'RPAREN': -33, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'AND': -34, 'OR': -34, 'NEWLINE': -34, 'COLON': -34, 'THEN': -34, 'RPAREN': -34, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'AND': -35, 'OR': -35, 'NEWLINE': -35, 'COLON': -35, 'THEN': -35, 'RPAREN': -35, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'AND': -36, 'OR': -36, 'NEWLINE': -36, 'COLON': -36, 'THEN': -36, 'RPAREN': -36, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'AND': -37, 'OR': -37, 'NEWLINE': -37, 'COLON': -37, 'THEN': -37, 'RPAREN': -37, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'AND': -38, 'OR': -38, 'NEWLINE': -38, 'COLON': -38, 'THEN': -38, 'RPAREN': -38, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'AND': -41, 'OR': -41, 'NEWLINE': -41, 'COLON': -41, 'THEN': -41, 'RPAREN': -41},
+    {'ID': 197},
+    {'TO': 198, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'RPAREN': -23, 'COMMA': -23},
+    {'RPAREN': 199, 'COMMA': 200},
+    {'RPAREN': 201, 'COMMA': 200},
+    {'NEWLINE': -91, 'COLON': -91},
+    {'RPAREN': 202, 'COMMA': 200},
+    {'NEWLINE': -92, 'COLON': -92},
+    {'RPAREN': 203, 'COMMA': 127},
+    {'NEWLINE': -29, 'COLON': -29, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'PLUS': -57, 'MINUS': -57, 'TIMES': -57, 'DIVIDE': -57, 'EXACTDIV': -57, 'MOD': -57, 'AS': -57, 'EXP': -57, 'DOT': -57, 'NEWLINE': -57, 'COLON': -57, 'COMMA': -57, 'RPAREN': -57, 'GREATER_THAN': -57, 'LESS_THAN': -57, 'EQUAL_GREATER_THAN': -57, 'EQUAL_LESS_THAN': -57, 'EQUALS': -57, 'NOT_EQUAL': -57, 'RBRACE': -57, 'TO': -57, 'AND': -57, 'OR': -57, 'THEN': -57, 'STEP': -57, 'ID': -57},
+    {'RPAREN': 204, 'COMMA': 127},
+    {'PLUS': -55, 'MINUS': -55, 'TIMES': -55, 'DIVIDE': -55, 'EXACTDIV': -55, 'MOD': -55, 'AS': -55, 'EXP': -55, 'DOT': -55, 'NEWLINE': -55, 'COLON': -55, 'RPAREN': -55, 'GREATER_THAN': -55, 'LESS_THAN': -55, 'EQUAL_GREATER_THAN': -55, 'EQUAL_LESS_THAN': -55, 'EQUALS': -55, 'NOT_EQUAL': -55, 'COMMA': -55, 'RBRACE': -55, 'TO': -55, 'AND': -55, 'OR': -55, 'THEN': -55, 'STEP': -55, 'ID': -55},
+    {'DOT': -55, 'PLUS': -55, 'MINUS': -55, 'TIMES': -55, 'DIVIDE': -55, 'EXACTDIV': -55, 'MOD': -55, 'AS': -55, 'EXP': -55, 'NEWLINE': -55, 'COLON': -55, 'COMMA': -55},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'RPAREN': 206, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'PLUS': 209, 'TIMES': 210, 'ID': 208},
+    {'ID': 165},
+    {'ID': 212},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'EQUALS': 214},
+    {'ID': 215},
+    {'NEWLINE': -89, 'COLON': -89},
+    {'NEWLINE': -90, 'COLON': -90},
+    {'AS': 216},
+    {'PLUS': -58, 'MINUS': -58, 'TIMES': -58, 'DIVIDE': -58, 'EXACTDIV': -58, 'MOD': -58, 'AS': -58, 'EXP': -58, 'DOT': -58, 'NEWLINE': -58, 'COLON': -58, 'COMMA': -58, 'RPAREN': -58, 'GREATER_THAN': -58, 'LESS_THAN': -58, 'EQUAL_GREATER_THAN': -58, 'EQUAL_LESS_THAN': -58, 'EQUALS': -58, 'NOT_EQUAL': -58, 'RBRACE': -58, 'TO': -58, 'AND': -58, 'OR': -58, 'THEN': -58, 'STEP': -58, 'ID': -58},
+    {'NEWLINE': -28, 'COLON': -28, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'DOT': -56, 'PLUS': -56, 'MINUS': -56, 'TIMES': -56, 'DIVIDE': -56, 'EXACTDIV': -56, 'MOD': -56, 'AS': -56, 'EXP': -56, 'NEWLINE': -56, 'COLON': -56, 'COMMA': -56, 'RPAREN': -56, 'GREATER_THAN': -56, 'LESS_THAN': -56, 'EQUAL_GREATER_THAN': -56, 'EQUAL_LESS_THAN': -56, 'EQUALS': -56, 'NOT_EQUAL': -56, 'RBRACE': -56, 'TO': -56, 'AND': -56, 'OR': -56, 'THEN': -56, 'STEP': -56, 'ID': -56},
+    {'NEWLINE': -30, 'COLON': -30, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'COMMA': -88, 'NEWLINE': -88, 'COLON': -88},
+    {'COMMA': -86, 'NEWLINE': -86, 'COLON': -86},
+    {'COMMA': -87, 'NEWLINE': -87, 'COLON': -87},
+    {'COMMA': -84, 'NEWLINE': -84, 'COLON': -84},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'NEWLINE': -79, 'COLON': -79, 'ID': -79, 'STEP': 218, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'RPAREN': -22, 'COMMA': -22},
+    {'ID': 220},
+    {'NEWLINE': -81, 'COLON': -81, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'MINUS': 34, 'LPAREN': 24, 'ID': 67, 'INTEGER': 35, 'DECIMAL': 36, 'STRING': 37, 'LBRACE': 38},
+    {'NEWLINE': -24, 'COLON': -24, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+    {'NEWLINE': -32, 'COLON': -32},
+    {'NEWLINE': -80, 'COLON': -80, 'ID': -80, 'PLUS': 57, 'MINUS': 58, 'TIMES': 59, 'DIVIDE': 60, 'EXACTDIV': 61, 'MOD': 62, 'AS': 63, 'EXP': 64, 'DOT': 119},
+]
+gotos = [
+    {'program': 1},
+    {'statement': 2, 'assignment': 4, 'declaration': 5, 'funcall': 6, 'control': 7, 'return': 8, 'prog_end': 9, 'defun_statement': 10, 'expression': 11, 'block_begin': 12, 'block_end': 13, 'if_block_begin': 14, 'elseif_block_begin': 15, 'else_statement': 16, 'case_begin': 17, 'case_else_begin': 18, 'declare_array': 25, 'while_block_begin': 39, 'for_block_begin': 40, 'for_each_block_begin': 41, 'parallel_for_block_begin': 42, 'do_block_begin': 43, 'function_block_begin': 44},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {'expression': 66},
+    {'expression': 68},
+    {},
+    {'expression': 73, 'args_list': 75, 'for_block_begin': 76},
+    {},
+    {'expression': 79},
+    {},
+    {},
+    {'rel_expression': 83, 'expression': 84},
+    {},
+    {},
+    {},
+    {'expression': 91},
+    {},
+    {},
+    {'expression': 99},
+    {},
+    {},
+    {},
+    {'args_list': 100, 'expression': 73},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {'rel_expression': 101, 'expression': 84},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {'rel_expression': 107, 'expression': 84},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {'expression': 110},
+    {'expression': 111},
+    {'expression': 112},
+    {'expression': 113},
+    {'expression': 114},
+    {'expression': 115},
+    {'expression': 116},
+    {'expression': 117},
+    {'expression': 118},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {'expression': 123},
+    {},
+    {'expression': 124, 'args_list': 126},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {'rel_expression': 140, 'expression': 141},
+    {'rel_expression': 142, 'expression': 84},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {'rel_expression': 148, 'expression': 84},
+    {'rel_expression': 149, 'expression': 84},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {'args_list': 157, 'expression': 158},
+    {'args_list': 160, 'expression': 158},
+    {},
+    {},
+    {},
+    {},
+    {'expression': 164},
+    {'reductions_list': 166, 'reduction': 167},
+    {},
+    {'expression': 168},
+    {},
+    {'rel_expression': 169, 'expression': 84},
+    {'rel_expression': 170, 'expression': 84},
+    {'expression': 171},
+    {'expression': 172},
+    {'expression': 173},
+    {'expression': 174},
+    {'expression': 175},
+    {'expression': 176},
+    {},
+    {},
+    {},
+    {},
+    {'expression': 179},
+    {'params_list': 181},
+    {},
+    {},
+    {},
+    {},
+    {'params_list': 182},
+    {'params_list': 184},
+    {},
+    {'args_list': 186, 'expression': 73},
+    {'expression': 187},
+    {},
+    {'args_list': 189, 'expression': 73},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {'expression': 193},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {'expression': 205},
+    {},
+    {'expression': 207},
+    {},
+    {'reduction': 211},
+    {},
+    {'expression': 213},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {'expression': 217},
+    {},
+    {'expression': 219},
+    {},
+    {},
+    {},
+    {'expression': 221},
+    {},
+    {},
+    {},
+]
+rules = [
+    (1, "S'", None),
+    (3, 'program', 'p_program'),
+    (3, 'program', 'p_program'),
+    (2, 'program', 'p_program'),
+    (0, 'program', 'p_program'),
+    (1, 'statement', 'p_singleline_statement'),
+    (1, 'statement', 'p_singleline_statement'),
+    (1, 'statement', 'p_singleline_statement'),
+    (1, 'statement', 'p_singleline_statement'),
+    (1, 'statement', 'p_singleline_statement'),
+    (1, 'statement', 'p_singleline_statement'),
+    (1, 'statement', 'p_singleline_statement'),
+    (1, 'statement', 'p_expression'),
+    (1, 'statement', 'p_multiline_begin_statement'),
+    (1, 'statement', 'p_multiline_end_statement'),
+    (1, 'statement', 'p_logic_control'),
+    (1, 'statement', 'p_logic_control'),
+    (1, 'statement', 'p_logic_control'),
+    (1, 'statement', 'p_logic_control'),
+    (1, 'statement', 'p_logic_control'),
+    (3, 'args_list', 'p_args_list'),
+    (1, 'args_list', 'p_args_list'),
+    (3, 'params_list', 'p_param_list'),
+    (1, 'params_list', 'p_param_list'),
+    (7, 'defun_statement', 'p_defun'),
+    (2, 'funcall', 'p_funcall'),
+    (3, 'assignment', 'p_assignment'),
+    (4, 'assignment', 'p_assignment'),
+    (6, 'assignment', 'p_assignment'),
+    (5, 'assignment', 'p_assignment'),
+    (6, 'assignment', 'p_assignment_indices'),
+    (1, 'declaration', 'p_declare'),
+    (7, 'declare_array', 'p_declare_array'),
+    (3, 'rel_expression', 'p_rel_expression'),
+    (3, 'rel_expression', 'p_rel_expression'),
+    (3, 'rel_expression', 'p_rel_expression'),
+    (3, 'rel_expression', 'p_rel_expression'),
+    (3, 'rel_expression', 'p_rel_expression'),
+    (3, 'rel_expression', 'p_rel_expression'),
+    (3, 'rel_expression', 'p_rel_expression'),
+    (3, 'rel_expression', 'p_rel_expression'),
+    (3, 'rel_expression', 'p_rel_expression'),
+    (2, 'rel_expression', 'p_rel_expression'),
+    (3, 'expression', 'p_expression_calc'),
+    (3, 'expression', 'p_expression_calc'),
+    (3, 'expression', 'p_expression_calc'),
+    (3, 'expression', 'p_expression_calc'),
+    (3, 'expression', 'p_expression_calc'),
+    (3, 'expression', 'p_expression_calc'),
+    (3, 'expression', 'p_expression_calc'),
+    (3, 'expression', 'p_expression_calc'),
+    (3, 'expression', 'p_expression_calc'),
+    (2, 'expression', 'p_expression_calc'),
+    (3, 'expression', 'p_expression_calc'),
+    (3, 'expression', 'p_inline_funcall'),
+    (4, 'expression', 'p_inline_funcall'),
+    (6, 'expression', 'p_expression_slice'),
+    (4, 'expression', 'p_expression_spawn'),
+    (5, 'expression', 'p_expression_spawn'),
+    (1, 'expression', 'p_expression_number'),
+    (1, 'expression', 'p_expression_number'),
+    (1, 'expression', 'p_expression_string'),
+    (1, 'expression', 'p_expression_id'),
+    (3, 'expression', 'p_expression_array'),
+    (1, 'block_begin', 'p_block_begin'),
+    (1, 'block_begin', 'p_block_begin'),
+    (1, 'block_begin', 'p_block_begin'),
+    (1, 'block_begin', 'p_block_begin'),
+    (1, 'block_begin', 'p_block_begin'),
+    (1, 'block_begin', 'p_block_begin'),
+    (3, 'if_block_begin', 'p_if_block_begin'),
+    (1, 'else_statement', 'p_else'),
+    (3, 'elseif_block_begin', 'p_elseif'),
+    (3, 'statement', 'p_select_case_begin'),
+    (2, 'statement', 'p_select_case_begin'),
+    (2, 'case_begin', 'p_case'),
+    (2, 'case_else_begin', 'p_case_else'),
+    (2, 'while_block_begin', 'p_while_block_begin'),
+    (1, 'do_block_begin', 'p_do_block_begin'),
+    (6, 'for_block_begin', 'p_for_block_begin'),
+    (8, 'for_block_begin', 'p_for_block_begin'),
+    (7, 'for_each_block_begin', 'p_for_each_block_begin'),
+    (2, 'parallel_for_block_begin', 'p_parallel_for_block_begin'),
+    (4, 'parallel_for_block_begin', 'p_parallel_for_block_begin'),
+    (3, 'reductions_list', 'p_reductions_list'),
+    (1, 'reductions_list', 'p_reductions_list'),
+    (3, 'reduction', 'p_reduction'),
+    (3, 'reduction', 'p_reduction'),
+    (3, 'reduction', 'p_reduction'),
+    (5, 'function_block_begin', 'p_function_block_begin'),
+    (5, 'function_block_begin', 'p_function_block_begin'),
+    (4, 'function_block_begin', 'p_function_block_begin'),
+    (4, 'function_block_begin', 'p_function_block_begin'),
+    (2, 'block_end', 'p_if_block_end'),
+    (2, 'block_end', 'p_select_block_end'),
+    (2, 'block_end', 'p_while_block_end'),
+    (1, 'block_end', 'p_while_block_end'),
+    (2, 'block_end', 'p_for_block_end'),
+    (2, 'block_end', 'p_for_block_end'),
+    (1, 'block_end', 'p_do_block_end'),
+    (3, 'block_end', 'p_do_block_end'),
+    (3, 'block_end', 'p_do_block_end'),
+    (2, 'block_end', 'p_function_block_end'),
+    (2, 'block_end', 'p_function_block_end'),
+    (1, 'return', 'p_return'),
+    (2, 'return', 'p_return'),
+    (1, 'prog_end', 'p_prog_end'),
+    (2, 'control', 'p_control_exit'),
+    (2, 'control', 'p_control_exit'),
+    (2, 'control', 'p_control_exit'),
+    (2, 'control', 'p_control_continue'),
+    (2, 'control', 'p_control_continue'),
+    (2, 'control', 'p_control_continue'),
+    (2, 'statement', 'p_use_statement'),
+]
@@ -0,0 +1,224 @@
+#! python3
+# Vectorization of element-wise FOR loops, run by the optimizer at -O2.
+#
+#   FOR I = 1 TO N
+#       C(I) = A(I) * K + B(I)
+#   NEXT I
+#
+# A loop with step 1 whose body only assigns array elements indexed by the
+# loop variable, from arrays indexed by the loop variable, the loop variable
+# itself, numbers, invariant expressions and math builtins, does the same
+# whatever order its iterations run in. Its body becomes
+#
+#   IF <VECTOR_FOR>(plan, I, N, A, B, C, K) THEN
+#   ELSE
+#       C(I) = A(I) * K + B(I)
+#   END IF
+#
+# where <VECTOR_FOR> runs every remaining iteration at once with whole-array
+# operations and moves I to N, so the loop ends after its first iteration.
+# It returns FALSE when the values it gets do not allow it (arrays which are
+# not typed DIM arrays, indices out of range, operands which are not
+# numbers), and the loop then runs as written.
+import sys
+
+from .basic_array import BasicArray
+from .basic_ast import ASTNode
+from .basic_lib import math_functions
+from .basic_operators import binary_operators, unary_operators
+from .symbol_table import global_table, table_stack
+
+arithmetic = ('<PLUS>', '<MINUS>', '<TIMES>', '<DIVIDE>', '<EXACTDIV>', '<MOD>', '<EXP>')
+
+
+class Unsupported(Exception):
+    pass
+
+
+class LoopPlan:
+    # Turns the body of one loop into a plan, collecting the expressions the
+    # loop passes to <VECTOR_FOR> as operands.
+    def __init__(self, optimizer, loop, typed):
+        self.optimizer = optimizer
+        self.typed = typed
+        self.var = loop.tree[0].value
+        self.targets = set()
+        # Operand expressions and what they are: 'array' or 'scalar'.
+        self.operands = []
+        self.kinds = []
+        self.arrays = {}
+
+    def operand(self, node, kind):
+        self.operands.append(node)
+        self.kinds.append(kind)
+        return len(self.operands) - 1
+
+    def array(self, name):
+        optimizer = self.optimizer
+        if name not in optimizer.arrays or name in optimizer.functions:
+            raise Unsupported('%s is not an array declared with DIM' % name)
+        if name not in self.typed:
+            raise Unsupported('%s is not a one-dimensional INTEGER or DECIMAL array' % name)
+        if name not in self.arrays:
+            self.arrays[name] = self.operand(ASTNode(type='id', value=name), 'array')
+        return self.arrays[name]
+
+    def statements(self, body):
+        for statement in body.tree:
+            if not (isinstance(statement, ASTNode) and statement.value == '<ASSIGN_ARRAY>'):
+                raise Unsupported('the body does more than assign array elements')
+            if len(statement.tree) != 3:
+                raise Unsupported('%s has several dimensions' % statement.tree[0])
+            self.index(statement.tree[0], statement.tree[1])
+            self.targets.add(statement.tree[0])
+        if not body.tree:
+            raise Unsupported('the body is empty')
+        return tuple((self.array(x.tree[0]), self.expression(x.tree[2])) for x in body.tree)
+
+    def index(self, name, node):
+        if not (node.type == 'id' and node.value == self.var):
+            raise Unsupported('%s is not indexed with %s alone' % (name, self.var))
+
+    def is_invariant(self, node):
+        names = self.optimizer.variables(node)
+        return self.var not in names and not (names & self.targets) and self.optimizer.is_pure(node)
+
+    def expression(self, node):
+        if node.type == 'number':
+            return ('const', node.value)
+        if node.type == 'id' and node.value == self.var:
+            return ('index',)
+        if node.type == 'funcall' and node.value in arithmetic:
+            return ('binary', node.value, self.expression(node.tree[0]), self.expression(node.tree[1]))
+        if node.type == 'funcall' and node.value == '<UMINUS>':
+            return ('unary', node.value, self.expression(node.tree[0]))
+        if node.type == 'funcall' and node.value in math_functions and len(node.tree) == 1 \
+                and self.optimizer.is_known(node.value):
+            return ('call', node.value, self.expression(node.tree[0]))
+        if node.type == 'funcall' and not node.value.startswith('<') and len(node.tree) == 1 \
+                and not self.is_invariant(node):
+            self.index(node.value, node.tree[0])
+            return ('array', self.array(node.value))
+        if node.type == 'id' and node.value in self.optimizer.arrays:
+            raise Unsupported('%s is used without an index' % node.value)
+        if node.type in ('id', 'funcall') and self.is_invariant(node):
+            return ('scalar', self.operand(node, 'scalar'))
+        raise Unsupported('%s is not an element-wise expression' % describe(node))
+
+
+def describe(node):
+    if node.type == 'funcall' and not node.value.startswith('<'):
+        return 'calling %s' % node.value
+    if node.type == 'string':
+        return 'a string'
+    return node.value.strip('<>').lower().replace('_', ' ')
+
+
+def typed_arrays(node, typed=None, untyped=None):
+    # Names only ever declared as one-dimensional INTEGER or DECIMAL arrays.
+    if typed is None:
+        typed, untyped = set(), set()
+        typed_arrays(node, typed, untyped)
+        return typed - untyped
+    if isinstance(node, list):
+        for item in node:
+            typed_arrays(item, typed, untyped)
+    elif isinstance(node, ASTNode):
+        if node.value == '<DIM_ARRAY>':
+            if len(node.tree) == 3 and node.tree[1].upper() in ('INTEGER', 'DECIMAL'):
+                typed.add(node.tree[0])
+            else:
+                untyped.add(node.tree[0])
+        typed_arrays(node.tree, typed, untyped)
+
+
+def plan_loop(optimizer, loop, typed):
+    # Returns the arguments of <VECTOR_FOR> for loop, or raises Unsupported.
+    var, end, step, body = loop.tree[0].value, loop.tree[2], loop.tree[3], loop.tree[4]
+    if not (step.type == 'number' and step.value.__class__ is int and step.value == 1):
+        raise Unsupported('the step is not 1')
+    plan = LoopPlan(optimizer, loop, typed)
+    statements = plan.statements(body)
+    if var in plan.targets:
+        raise Unsupported('%s is also an array' % var)
+    if not plan.is_invariant(end):
+        raise Unsupported('the end of the loop may change in the loop')
+    return [(var, tuple(plan.kinds), statements), loop.tree[0], end] + plan.operands
+
+
+def vectorize(optimizer, node, typed=None):
+    # Vectorizes every FOR loop under node which allows it.
+    if typed is None:
+        typed = typed_arrays(node)
+    if not isinstance(node, ASTNode) or node.type != 'flag':
+        return
+    for child in node.tree:
+        vectorize(optimizer, child, typed)
+    if node.value != '<FOR>':
+        return
+    # Why each loop was vectorized or not, as (line, variable, reason) with a
+    # reason of None for vectorized loops.
+    reports = table_stack.context.vector_reports
+    try:
+        args = plan_loop(optimizer, node, typed)
+    except Unsupported as e:
+        reports.append((node.lineno, node.tree[0].value, str(e)))
+        return
+    reports.append((node.lineno, node.tree[0].value, None))
+    body = node.tree[4]
+    vector = ASTNode(type='funcall', value='<VECTOR_FOR>', tree=args)
+    loop_body = ASTNode.BlockNode()
+    loop_body.tree = body.tree
+    seq = ASTNode(type='flag', value='<SEQ>')
+    seq.lineno = node.lineno
+    seq.add(ASTNode(type='flag', value='<IF>', tree=[vector, ASTNode.BlockNode()]))
+    seq.add(ASTNode(type='flag', value='<IF>', tree=[ASTNode.TrueNode(), loop_body]))
+    body.tree = [seq]
+
+
+def report(reports, file=sys.stderr):
+    for lineno, var, reason in reports:
+        if reason is None:
+            print('line %d: FOR %s vectorized' % (lineno, var), file=file)
+        else:
+            print('line %d: FOR %s not vectorized: %s' % (lineno, var, reason), file=file)
+
+
+# Runtime part.
+def evaluate(expr, operands, first, last):
+    kind = expr[0]
+    if kind == 'array':
+        return operands[expr[1]].slice(first, last)
+    if kind == 'binary':
+        a = evaluate(expr[2], operands, first, last)
+        return binary_operators[expr[1]](a, evaluate(expr[3], operands, first, last))
+    if kind == 'scalar':
+        return operands[expr[1]]
+    if kind == 'const':
+        return expr[1]
+    if kind == 'index':
+        return BasicArray.of(range(first, last + 1))
+    if kind == 'unary':
+        return unary_operators[expr[1]](evaluate(expr[2], operands, first, last))
+    return math_functions[expr[1]](evaluate(expr[2], operands, first, last))
+
+
+def usable(operand, kind, last):
+    if kind == 'array':
+        return operand.__class__ is BasicArray and last < len(operand.data)
+    return operand.__class__ in (int, float)
+
+
+@global_table.register('<VECTOR_FOR>')
+def vector_for(n):
+    (var, kinds, statements), first, last = n[0], n[1].run(), n[2].run()
+    if first.__class__ is not int or last.__class__ is not int or not 0 <= first <= last:
+        return False
+    operands = [x.run() for x in n[3:]]
+    for operand, kind in zip(operands, kinds):
+        if not usable(operand, kind, last):
+            return False
+    for target, expr in statements:
+        operands[target].store(first, last, evaluate(expr, operands, first, last))
+    table_stack.top().set(var, last)
+    return True
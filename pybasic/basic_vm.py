@@ -0,0 +1,756 @@
+#! python3
+# Bytecode engine: compiles the AST into flat instruction lists and runs them
+# on a stack machine. BASIC calls push VMFrames on a heap-allocated list
+# instead of recursing in Python, so recursion depth is bounded by memory
+# only, and a running program can be suspended and resumed.
+import sys
+
+from .basic_array import BasicArray, BasicMatrix, array_types
+from .basic_ast import ASTControl, ASTNode
+from .basic_compile import BasicFunction
+from .basic_lib import each_line
+from .basic_memo import MISSING, MemoCache, pure_functions
+from .basic_modules import use
+from .basic_parallel import parallel_for, runners
+from .basic_operators import (binary_operators, unary_operators,
+    dim_array, assign_array, assign_member, slice_array)
+from .basic_resolve import resolve_function
+from .symbol_table import UNSET, Frame, table_stack
+from .utils import BasicError
+
+opnames = (
+    'LOAD_CONST', 'LOAD_LOCAL', 'LOAD_GLOBAL', 'STORE_LOCAL', 'STORE_GLOBAL',
+    'BINARY', 'UNARY', 'POP', 'DUP_TOP', 'BUILD_LIST', 'MEMBER',
+    'BINARY_ADAPTIVE',
+    'JUMP', 'POP_JUMP_IF_TRUE', 'POP_JUMP_IF_NOT_TRUE', 'POP_JUMP_IF_FALSE',
+    'JUMP_IF_FALSY_OR_POP', 'JUMP_IF_TRUTHY_OR_POP', 'FOR_TEST', 'FOR_STEP',
+    'CALL', 'RETURN_VALUE', 'MAKE_FUNCTION',
+    'DIM_ARRAY', 'ASSIGN_ARRAY', 'ASSIGN_MEMBER', 'SLICE', 'PARALLEL_FOR', 'USE', 'END',
+    'ADD_SAME', 'INDEX', 'GET_LINES', 'FOR_ITER',
+)
+for opcode, opname in enumerate(opnames):
+    globals()[opname] = opcode
+
+# Quickening. Instructions are rewritten in place, based on the operands
+# they see, into forms specialized for them. A specialized instruction
+# checks that its guess still holds and otherwise turns back into the
+# generic one.
+#
+# Operators implemented in Python start out as BINARY_ADAPTIVE, which counts
+# down from WARMUP executions before specializing for the operand types it
+# sees, if there is a specialization for them. On failure it waits twice as
+# long before trying again, and after MAX_BACKOFF settles for BINARY. The
+# operators of the operator module are already as fast as a guarded inline
+# operation, so they are emitted as BINARY directly.
+#
+# CALL turns into INDEX as soon as it reads one element of an array.
+WARMUP = 8
+MAX_BACKOFF = 1024
+specializations = {
+    # BASIC + is plain Python + on operands of the same type.
+    (binary_operators['<PLUS>'], int, int): ADD_SAME,
+    (binary_operators['<PLUS>'], float, float): ADD_SAME,
+    (binary_operators['<PLUS>'], str, str): ADD_SAME,
+}
+adaptive_operators = {key[0] for key in specializations}
+
+# The argument of adaptive and specialized instructions is a
+# [operator, countdown, backoff] list.
+def specialize(instruction, a, b):
+    # Called when an adaptive instruction has counted down.
+    state = instruction[1]
+    op = specializations.get((state[0], a.__class__, b.__class__))
+    if op is not None:
+        instruction[0] = op
+    elif state[2] >= MAX_BACKOFF:
+        # In one step: other threads may be running the same code.
+        instruction[:] = BINARY, state[0]
+    else:
+        state[2] *= 2
+        state[1] = state[2]
+
+def deoptimize(instruction, a, b):
+    # Called when the operands of a specialized instruction fail its check.
+    state = instruction[1]
+    instruction[0] = BINARY_ADAPTIVE
+    if state[2] < MAX_BACKOFF:
+        state[2] *= 2
+    state[1] = state[2]
+    return state[0](a, b)
+
+
+class CodeObject:
+    def __init__(self, name, scope=None):
+        self.name = name
+        self.scope = scope
+        # Whether functions made from this code cache their results.
+        self.memoize = False
+        # Instructions are [opcode, argument] lists, patched in place.
+        self.instructions = []
+
+    def emit(self, op, arg=None):
+        self.instructions.append([op, arg])
+        return len(self.instructions) - 1
+
+    def patch(self, index, target=None):
+        self.instructions[index][1] = len(self.instructions) if target is None else target
+
+    def __len__(self):
+        return len(self.instructions)
+
+
+class Arg:
+    # An evaluated argument handed to a builtin, which expects objects with
+    # a run() method (and reads .value for by-name arguments).
+    __slots__ = ('result', 'type', 'value')
+
+    def __init__(self, result, meta):
+        self.result = result
+        self.type, self.value = meta
+
+    def run(self):
+        return self.result
+
+
+class Loop:
+    def __init__(self, depth):
+        # Number of values the loop keeps on the operand stack.
+        self.depth = depth
+        # CONTINUE jumps to continue_target, or is patched once the target
+        # has been emitted when it is None.
+        self.continue_target = None
+        self.continues = []
+        self.breaks = []
+
+
+class VMCompiler:
+    # Instructions which do not leave a result on the stack, with the value
+    # the tree-walker would have produced for them.
+    stores = {
+        '<ASSIGN>': True,
+        '<DIM_ARRAY>': None,
+        '<ASSIGN_ARRAY>': None,
+        '<ASSIGN_MEMBER>': None,
+    }
+
+    def __init__(self, tco=True, memoize=True):
+        # Whether RETURN F(...) replaces the frame of the current call.
+        self.tco = tco
+        # Names of the pure functions to memoize, filled by compile_vm().
+        self.memoize = memoize
+        self.pure = set()
+        self.scope = None
+        self.code = None
+        self.loops = []
+        self.flags = {
+            '<PROGRAM>': self.compile_block,
+            '<BLOCK>': self.compile_block,
+            '<SUB>': self.compile_function,
+            '<FUNCTION>': self.compile_function,
+            '<SEQ>': self.compile_seq,
+            '<IF>': self.compile_seq,
+            '<FOR>': self.compile_for,
+            '<FOR_EACH>': self.compile_for_each,
+            '<DO>': self.compile_do,
+            '<WHILE>': self.compile_while,
+            '<BREAK>': self.compile_break,
+            '<CONTINUE>': self.compile_continue,
+            '<RETURN>': self.compile_return,
+            '<END>': lambda node: self.code.emit(END),
+            '<USE>': lambda node: self.code.emit(USE, node.tree[0]),
+            '<PARALLEL_FOR>': self.compile_parallel_for,
+        }
+
+    def compile_program(self, node, name='<program>'):
+        self.code = CodeObject(name, self.scope)
+        self.compile_statement(node)
+        self.code.emit(LOAD_CONST, None)
+        self.code.emit(RETURN_VALUE)
+        return self.code
+
+    # Statements leave the operand stack as they found it.
+    def compile_statement(self, node):
+        if node.type == 'flag':
+            try:
+                handler = self.flags[node.value]
+            except KeyError:
+                raise BasicError('Cannot compile %s' % node.value)
+            handler(node)
+        elif node.type == 'funcall' and node.value in VMCompiler.stores:
+            self.compile_store_like(node)
+        else:
+            self.compile_expression(node)
+            self.code.emit(POP)
+
+    def compile_block(self, node):
+        for child in node.tree:
+            self.compile_statement(child)
+
+    def compile_function(self, node):
+        name = node.tree[0]
+        outer = self.scope, self.code, self.loops
+        self.scope, self.loops = resolve_function(node), []
+        try:
+            code = self.compile_program(node.tree[2], name)
+        finally:
+            self.scope, self.code, self.loops = outer
+        code.memoize = self.scope is None and name in self.pure
+        self.code.emit(MAKE_FUNCTION, (name, code))
+        self.compile_store(name)
+
+    def compile_seq(self, node):
+        branches = node.tree if node.value == '<SEQ>' else [node]
+        ends = []
+        for branch in branches:
+            if isinstance(branch, ASTNode) and branch.value == '<IF>':
+                self.compile_expression(branch.tree[0])
+                skip = self.code.emit(POP_JUMP_IF_NOT_TRUE)
+                self.compile_statement(branch.tree[1])
+                ends.append(self.code.emit(JUMP))
+                self.code.patch(skip)
+            else:
+                # A statement returning True ends the chain, like in <SEQ>.
+                self.compile_expression(branch)
+                ends.append(self.code.emit(POP_JUMP_IF_TRUE))
+        for end in ends:
+            self.code.patch(end)
+
+    def compile_for(self, node):
+        # The end and step values stay on the stack while the loop runs.
+        name = node.tree[0].value
+        code = self.code
+        self.compile_expression(node.tree[1])
+        self.compile_store(name)
+        self.compile_expression(node.tree[2])
+        self.compile_expression(node.tree[3])
+        loop = Loop(depth=2)
+        exits = []
+        if len(node.tree) > 5:
+            self.compile_load(name)
+            exits.append(code.emit(FOR_TEST))
+            self.compile_preheader(node, 5)
+            enter = code.emit(JUMP)
+        else:
+            enter = None
+        top = len(code)
+        self.compile_load(name)
+        exits.append(code.emit(FOR_TEST))
+        if enter is not None:
+            code.patch(enter)
+        self.compile_loop_body(node.tree[4], loop)
+        for index in loop.continues:
+            code.patch(index)
+        self.compile_load(name)
+        code.emit(FOR_STEP)
+        self.compile_store(name)
+        code.emit(JUMP, top)
+        for index in exits:
+            code.patch(index)
+        code.emit(POP)
+        code.emit(POP)
+        self.close_loop(loop)
+
+    def compile_for_each(self, node):
+        # The iterator of the lines stays on the stack while the loop runs.
+        code = self.code
+        self.compile_expression(node.tree[1])
+        code.emit(GET_LINES)
+        loop = Loop(depth=1)
+        top = len(code)
+        loop.continue_target = top
+        end = code.emit(FOR_ITER)
+        self.compile_store(node.tree[0].value)
+        self.compile_loop_body(node.tree[2], loop)
+        code.emit(JUMP, top)
+        code.patch(end)
+        self.close_loop(loop)
+
+    def compile_parallel_for(self, node):
+        for value in node.tree[1:4]:
+            self.compile_expression(value)
+        self.code.emit(PARALLEL_FOR, node)
+
+    def compile_do(self, node):
+        code = self.code
+        self.compile_preheader(node, 2)
+        top = len(code)
+        loop = Loop(depth=0)
+        loop.continue_target = top
+        self.compile_loop_body(node.tree[1], loop)
+        self.compile_expression(node.tree[0])
+        loop.breaks.append(code.emit(POP_JUMP_IF_FALSE))
+        code.emit(JUMP, top)
+        self.close_loop(loop)
+
+    def compile_while(self, node):
+        code = self.code
+        loop = Loop(depth=0)
+        if len(node.tree) > 2:
+            # Test once more in front of the preheader, so it only runs
+            # when the body does.
+            self.compile_expression(node.tree[0])
+            loop.breaks.append(code.emit(POP_JUMP_IF_NOT_TRUE))
+            self.compile_preheader(node, 2)
+            enter = code.emit(JUMP)
+        else:
+            enter = None
+        top = len(code)
+        loop.continue_target = top
+        self.compile_expression(node.tree[0])
+        loop.breaks.append(code.emit(POP_JUMP_IF_NOT_TRUE))
+        if enter is not None:
+            code.patch(enter)
+        self.compile_loop_body(node.tree[1], loop)
+        code.emit(JUMP, top)
+        self.close_loop(loop)
+
+    def compile_preheader(self, node, index):
+        # Block hoisted out of a loop body by the optimizer.
+        if len(node.tree) > index:
+            self.compile_statement(node.tree[index])
+
+    def compile_loop_body(self, node, loop):
+        self.loops.append(loop)
+        try:
+            self.compile_statement(node)
+        finally:
+            self.loops.pop()
+
+    def close_loop(self, loop):
+        for index in loop.breaks:
+            self.code.patch(index)
+
+    def compile_break(self, node):
+        loop = self.loops[-1]
+        for _ in range(loop.depth):
+            self.code.emit(POP)
+        loop.breaks.append(self.code.emit(JUMP))
+
+    def compile_continue(self, node):
+        loop = self.loops[-1]
+        if loop.continue_target is None:
+            loop.continues.append(self.code.emit(JUMP))
+        else:
+            self.code.emit(JUMP, loop.continue_target)
+
+    def compile_return(self, node):
+        value = node.tree[0]
+        if self.tco and self.scope is not None and isinstance(value, ASTNode) \
+                and value.type == 'funcall' and not value.value.startswith('<'):
+            self.compile_call(value, tail=True)
+        else:
+            self.compile_expression(value)
+        self.code.emit(RETURN_VALUE)
+
+    # Variables, resolved like in the closure compiler.
+    def compile_load(self, name):
+        name = name.upper()
+        if self.scope is not None and self.scope.is_local(name):
+            self.code.emit(LOAD_LOCAL, (self.scope.index[name], name))
+        else:
+            self.code.emit(LOAD_GLOBAL, name)
+
+    def compile_store(self, name):
+        name = name.upper()
+        if self.scope is not None:
+            self.code.emit(STORE_LOCAL, (self.scope.index[name], name))
+        else:
+            self.code.emit(STORE_GLOBAL, name)
+
+    # Expressions push exactly one value.
+    def compile_expression(self, node):
+        code = self.code
+        if not isinstance(node, ASTNode):
+            code.emit(LOAD_CONST, node)
+        elif node.type in ASTNode.literals:
+            code.emit(LOAD_CONST, node.value)
+        elif node.type == 'id':
+            self.compile_load(node.value)
+        elif node.type == 'array':
+            for item in node.value:
+                self.compile_expression(item)
+            code.emit(BUILD_LIST, len(node.value))
+        elif node.type == 'funcall':
+            self.compile_funcall(node)
+        else:
+            raise BasicError('Cannot compile %s' % node)
+
+    def compile_funcall(self, node):
+        code, name, args = self.code, node.value, node.tree
+        if name in VMCompiler.stores:
+            self.compile_store_like(node)
+            code.emit(LOAD_CONST, VMCompiler.stores[name])
+        elif name in binary_operators:
+            self.compile_expression(args[0])
+            self.compile_expression(args[1])
+            op = binary_operators[name]
+            if op in adaptive_operators:
+                code.emit(BINARY_ADAPTIVE, [op, WARMUP, WARMUP])
+            else:
+                code.emit(BINARY, op)
+        elif name in unary_operators:
+            self.compile_expression(args[0])
+            code.emit(UNARY, unary_operators[name])
+        elif name in ('<AND>', '<OR>'):
+            self.compile_expression(args[0])
+            jump = code.emit(JUMP_IF_FALSY_OR_POP if name == '<AND>' else JUMP_IF_TRUTHY_OR_POP)
+            self.compile_expression(args[1])
+            code.patch(jump)
+        elif name == '<MEMBER>':
+            self.compile_expression(args[0])
+            code.emit(MEMBER, args[1])
+        elif name == '<SLICE>':
+            for arg in args:
+                self.compile_expression(arg)
+            code.emit(SLICE)
+        else:
+            self.compile_call(node)
+
+    def compile_call(self, node, tail=False):
+        name, args = node.value, node.tree
+        self.compile_load(name)
+        for arg in args:
+            self.compile_expression(arg)
+        metas = tuple((x.type, x.value) if isinstance(x, ASTNode) else None for x in args)
+        self.code.emit(CALL, (len(args), metas, name, tail))
+
+    def compile_store_like(self, node):
+        code, name, args = self.code, node.value, node.tree
+        if name == '<ASSIGN>':
+            self.compile_expression(args[1])
+            self.compile_store(args[0])
+        elif name == '<DIM_ARRAY>':
+            for size in args[2:]:
+                self.compile_expression(size)
+            code.emit(DIM_ARRAY, (args[0], args[1], len(args) - 2))
+        elif name == '<ASSIGN_ARRAY>':
+            for index in args[1:]:
+                self.compile_expression(index)
+            code.emit(ASSIGN_ARRAY, (args[0], len(args) - 2))
+        elif name == '<ASSIGN_MEMBER>':
+            self.compile_expression(args[0])
+            self.compile_expression(args[2])
+            code.emit(ASSIGN_MEMBER, args[1])
+
+
+def compile_vm(node, tco=True, memoize=True):
+    compiler = VMCompiler(tco, memoize)
+    if memoize:
+        compiler.pure = pure_functions(node)
+    return compiler.compile_program(node)
+
+
+class VMFrame:
+    __slots__ = ('code', 'pc', 'stack', 'env', 'memo')
+
+    def __init__(self, code, env):
+        self.code = code
+        self.pc = 0
+        self.stack = []
+        self.env = env
+        # The (MemoCache, key) pair to store the return value in.
+        self.memo = None
+
+
+class VM:
+    # Runs a CodeObject in env, the global table or a Frame.
+    def __init__(self, code, env):
+        self.frames = [VMFrame(code, env)]
+        self.finished = False
+        self.result = None
+        self.suspend_requested = False
+
+    def suspend(self):
+        # Called by builtins to stop run() once they return.
+        self.suspend_requested = True
+
+    def run(self, budget=None):
+        # Run until the program ends, suspend() is called, or budget loop
+        # iterations and calls have been executed. Returns whether the
+        # program has ended; call run() again to resume it.
+        if self.finished:
+            return True
+        base = len(table_stack)
+        for frame in self.frames[1:]:
+            table_stack.push(frame.env)
+        self.suspend_requested = False
+        try:
+            return self._run(budget)
+        finally:
+            del table_stack.items[base:]
+
+    def make_function(self, name, code, gtab):
+        def body(frame):
+            vm = VM(code, frame)
+            vm.run()
+            return ASTControl('return', vm.result)
+        func = BasicFunction(name, code.scope, body, gtab)
+        func.code = code
+        if code.memoize:
+            func.memo = MemoCache(name)
+        return func
+
+    def _run(self, budget):
+        frames = self.frames
+        frame = frames[-1]
+        code, stack, env, pc = frame.code.instructions, frame.stack, frame.env, frame.pc
+        while True:
+            op, arg = code[pc]
+            pc += 1
+            if op == LOAD_LOCAL:
+                value = env[arg[0]]
+                if value is UNSET:
+                    try:
+                        value = env.gtab[arg[1]]
+                    except KeyError:
+                        raise BasicError('undefined variable "%s"' % arg[1])
+                stack.append(value)
+            elif op == LOAD_CONST:
+                stack.append(arg)
+            elif op == LOAD_GLOBAL:
+                try:
+                    stack.append(env.gtab[arg])
+                except KeyError:
+                    raise BasicError('undefined variable "%s"' % arg)
+            elif op == BINARY:
+                b = stack.pop()
+                stack[-1] = arg(stack[-1], b)
+            elif op == ADD_SAME:
+                b = stack.pop()
+                a = stack[-1]
+                if a.__class__ is b.__class__:
+                    stack[-1] = a + b
+                else:
+                    stack[-1] = deoptimize(code[pc - 1], a, b)
+            elif op == STORE_LOCAL:
+                slot, name = arg
+                if env[slot] is not UNSET or name not in env.gtab:
+                    env[slot] = stack.pop()
+                else:
+                    env.gtab[name] = stack.pop()
+            elif op == STORE_GLOBAL:
+                env.gtab[arg] = stack.pop()
+            elif op == POP_JUMP_IF_NOT_TRUE:
+                if stack.pop() is not True:
+                    pc = arg
+            elif op == JUMP:
+                pc = arg
+                if budget is not None:
+                    budget -= 1
+                    if budget <= 0:
+                        frame.pc = pc
+                        return False
+            elif op == FOR_TEST:
+                # Stack: end, step, value of the loop variable.
+                value = stack.pop()
+                if value > stack[-2] if stack[-1] >= 0 else value < stack[-2]:
+                    pc = arg
+            elif op == FOR_STEP:
+                value = stack.pop()
+                stack.append(value + stack[-1])
+            elif op == FOR_ITER:
+                # Stack: the iterator of a FOR EACH loop, dropped at its end.
+                value = next(stack[-1], None)
+                if value is None:
+                    stack.pop()
+                    pc = arg
+                else:
+                    stack.append(value)
+            elif op == INDEX:
+                index = stack.pop()
+                array = stack[-1]
+                if array.__class__ is BasicArray:
+                    array = array.data
+                elif array.__class__ is not list:
+                    # Not an array any more: run it again as a CALL.
+                    code[pc - 1][0] = CALL
+                    stack.append(index)
+                    pc -= 1
+                    continue
+                try:
+                    stack[-1] = array[index]
+                except IndexError:
+                    raise BasicError('Index %d is out of range (maximum %d)' % (index, len(array)))
+            elif op == POP:
+                stack.pop()
+            elif op == CALL:
+                nargs, metas, name, tail = arg
+                if nargs:
+                    args = stack[-nargs:]
+                    del stack[-nargs:]
+                else:
+                    args = []
+                func = stack.pop()
+                if func.__class__ is BasicFunction and func.code is not None:
+                    memo, pending = func.memo, None
+                    if memo is not None:
+                        key = memo.key(args)
+                        if key is not None:
+                            value = memo.get(key)
+                            if value is not MISSING:
+                                stack.append(value)
+                                continue
+                            pending = (memo, key)
+                    scope, gtab = func.scope, func.gtab
+                    if nargs < len(scope.params):
+                        raise BasicError('Wrong number of arguments when calling %s' % name)
+                    new_env = Frame(scope, gtab)
+                    for slot, param in enumerate(scope.params):
+                        if param in gtab:
+                            gtab[param] = args[slot]
+                        else:
+                            new_env[slot] = args[slot]
+                    if tail and len(frames) > 1:
+                        # The callee returns straight to our caller. Only the
+                        # first memoized call of a chain of tail calls waits
+                        # for the result, so that the chain runs in constant
+                        # memory.
+                        if frame.memo is not None:
+                            pending = frame.memo
+                        frames.pop()
+                        table_stack.pop()
+                    else:
+                        frame.pc = pc
+                    frame = VMFrame(func.code, new_env)
+                    frame.memo = pending
+                    frames.append(frame)
+                    table_stack.push(new_env)
+                    code, stack, env, pc = frame.code.instructions, frame.stack, new_env, 0
+                    if budget is not None:
+                        budget -= 1
+                        if budget <= 0:
+                            return False
+                elif isinstance(func, array_types):
+                    if func.__class__ is BasicMatrix:
+                        stack.append(func.get(args))
+                        continue
+                    if func.__class__ is BasicArray:
+                        func = func.data
+                    if nargs == 1:
+                        code[pc - 1][0] = INDEX
+                    result = func
+                    for index in args:
+                        try:
+                            result = result[index]
+                        except IndexError:
+                            raise BasicError('Index %d is out of range (maximum %d)' % (index, len(result)))
+                    stack.append(result)
+                else:
+                    try:
+                        result = func([Arg(x, meta) if meta else x for x, meta in zip(args, metas)])
+                    except IndexError:
+                        raise BasicError('Wrong number of arguments when calling %s' % name)
+                    stack.append(result)
+                    if self.suspend_requested:
+                        frame.pc = pc
+                        return False
+            elif op == RETURN_VALUE:
+                value = stack.pop()
+                if frame.memo is not None:
+                    frame.memo[0].put(frame.memo[1], value)
+                frames.pop()
+                if not frames:
+                    self.finished = True
+                    self.result = value
+                    return True
+                table_stack.pop()
+                frame = frames[-1]
+                code, stack, env, pc = frame.code.instructions, frame.stack, frame.env, frame.pc
+                stack.append(value)
+            elif op == BINARY_ADAPTIVE:
+                b = stack.pop()
+                a = stack[-1]
+                stack[-1] = arg[0](a, b)
+                arg[1] -= 1
+                if arg[1] <= 0:
+                    specialize(code[pc - 1], a, b)
+            elif op == POP_JUMP_IF_TRUE:
+                if stack.pop() is True:
+                    pc = arg
+            elif op == POP_JUMP_IF_FALSE:
+                if stack.pop() is False:
+                    pc = arg
+            elif op == JUMP_IF_FALSY_OR_POP:
+                if stack[-1]:
+                    stack.pop()
+                else:
+                    pc = arg
+            elif op == JUMP_IF_TRUTHY_OR_POP:
+                if stack[-1]:
+                    pc = arg
+                else:
+                    stack.pop()
+            elif op == UNARY:
+                stack[-1] = arg(stack[-1])
+            elif op == DUP_TOP:
+                stack.append(stack[-1])
+            elif op == BUILD_LIST:
+                if arg:
+                    items = stack[-arg:]
+                    del stack[-arg:]
+                else:
+                    items = []
+                stack.append(items)
+            elif op == MEMBER:
+                stack[-1] = stack[-1].get(arg)
+            elif op == ASSIGN_ARRAY:
+                value = stack.pop()
+                indices = stack[-arg[1]:]
+                del stack[-arg[1]:]
+                assign_array(arg[0], indices, value)
+            elif op == ASSIGN_MEMBER:
+                value = stack.pop()
+                assign_member(stack.pop(), arg, value)
+            elif op == SLICE:
+                last = stack.pop()
+                first = stack.pop()
+                stack[-1] = slice_array(stack[-1], first, last)
+            elif op == PARALLEL_FOR:
+                step = stack.pop()
+                end = stack.pop()
+                parallel_for(arg, stack.pop(), end, step, 'vm', env)
+            elif op == DIM_ARRAY:
+                sizes = stack[-arg[2]:]
+                del stack[-arg[2]:]
+                dim_array(arg[0], arg[1], sizes)
+            elif op == MAKE_FUNCTION:
+                stack.append(self.make_function(arg[0], arg[1], env.gtab))
+            elif op == USE:
+                use(arg, 'vm', env)
+            elif op == GET_LINES:
+                stack[-1] = each_line(stack[-1])
+            elif op == END:
+                sys.exit(0)
+            else:
+                raise BasicError('Unknown opcode %d' % op)
+
+
+def disassemble(code, file=sys.stdout):
+    print('Disassembly of %s:' % code.name, file=file)
+    nested = []
+    for index, (op, arg) in enumerate(code.instructions):
+        if op == MAKE_FUNCTION:
+            nested.append(arg[1])
+            arg = arg[0]
+        elif op in (BINARY_ADAPTIVE, ADD_SAME):
+            arg = arg[0].__name__
+        elif op in (BINARY, UNARY):
+            arg = arg.__name__
+        elif op in (LOAD_LOCAL, STORE_LOCAL):
+            arg = '%d (%s)' % arg
+        elif op in (CALL, INDEX):
+            arg = '%d (%s)%s' % (arg[0], arg[2], ' tail' if arg[3] else '')
+        elif op == PARALLEL_FOR:
+            arg = 'FOR %s' % arg.tree[0].value
+        elif op == LOAD_CONST or isinstance(arg, str):
+            arg = repr(arg)
+        print('%6d %-22s %s' % (index, opnames[op], '' if arg is None else arg), file=file)
+    for code in nested:
+        print(file=file)
+        disassemble(code, file)
+
+
+def run_vm(code):
+    return lambda: VM(code, table_stack.items[0]).run()
+
+runners['vm'] = lambda program: run_vm(compile_vm(program))
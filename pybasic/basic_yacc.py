@@ -1,22 +1,32 @@
 #! python3
 # import readline
+import gc
 import sys
+import threading
+import zlib
+from contextlib import contextmanager
 from os import path
 
-import ply.yacc as yacc
-
 from .basic_ast import ASTNode, build_ast
-from .basic_lex import tokens
+from .basic_lex import tokenize, tokens
 from .utils import BasicError, RootStack, Stack
 
-# Abstract syntax tree.
-ast = build_ast()
-root_stack = RootStack([ast])
+class ParseState:
+    # What parsing a program builds up: its abstract syntax tree, the blocks
+    # open in it and the number of SELECT CASE blocks open.
+    def __init__(self):
+        self.ast = build_ast()
+        self.root_stack = RootStack([self.ast])
+        self.select_var_count = 0
+
+# The parser is shared: parsing() swaps the state of the program being parsed
+# in, one thread at a time.
+parse_lock = threading.RLock()
+root_stack = None
 select_var_count = 0
 
 # Precedence specifier.
 precedence = (
-    ('left', 'COLON'),
     ('left', 'COMMA'),
     ('left', 'AND', 'OR'),
     ('left', 'EQUALS', 'NOT_EQUAL', 'GREATER_THAN', 'LESS_THAN', 'EQUAL_GREATER_THAN', 'EQUAL_LESS_THAN'),
@@ -28,17 +38,17 @@ precedence = (
     ('left', 'DOT'),
 )
 
-# Parsers.
-def p_multi_statement(p):
+# Parsers. A program is parsed as a whole, line by line; each statement
+# adds itself to the block open when it is parsed.
+start = 'program'
+
+def p_program(p):
     '''
-    statement : statement COLON statement
+    program : program statement NEWLINE
+            | program statement COLON
+            | program NEWLINE
+            |
     '''
-    current_root = root_stack.top()
-    current_root.add(p[1])
-    current_root.add(p[3])
-    # for REPL only
-    p[0] = ASTNode.BlockNode()
-    p[0].tree = [p[1], p[3]]
 
 def p_singleline_statement(p):
     '''
@@ -52,6 +62,7 @@ def p_singleline_statement(p):
     '''
     current_root = root_stack.top()
     p[0] = p[1]
+    p[0].lineno = p.lineno(1)
     current_root.add(p[0])
 
 def p_expression(p):
@@ -59,7 +70,11 @@ def p_expression(p):
     statement : expression
     '''
     current_root = root_stack.top()
-    p[0] = ASTNode(type='funcall', value=p[1].value)
+    if p[1].value == '<SPAWN>':
+        p[0] = p[1]
+    else:
+        p[0] = ASTNode(type='funcall', value=p[1].value)
+    p[0].lineno = p.lineno(1)
     current_root.add(p[0])
 
 def p_multiline_begin_statement(p):
@@ -68,8 +83,9 @@ def p_multiline_begin_statement(p):
     '''
     current_root = root_stack.top()
     p[0] = p[1]
+    p[0].lineno = p.lineno(1)
     current_root.add(p[0])
-    root_stack.push(p[0].block)
+    root_stack.push_block(p[0])
 
 def p_multiline_end_statement(p):
     '''
@@ -117,6 +133,7 @@ def p_defun(p):
     p[0] = ASTNode(type='flag', value='<FUNCTION>')
     block_node = ASTNode.BlockNode()
     return_node = ASTNode(type='flag', value='<RETURN>')
+    return_node.lineno = p.lineno(1)
     return_node.add(p[7])
     block_node.add(return_node)
     p[0].add_group([
@@ -129,8 +146,13 @@ def p_funcall(p):
     '''
     funcall : ID args_list
     '''
-    args = p[2].tree[:]
-    p[0] = ASTNode(type='funcall', value=p[1], tree=args)
+    args = p[2].tree
+    # SPAWN F(...) as a statement reads like a call of SPAWN with F(...).
+    if p[1] == 'SPAWN' and len(args) == 1 and args[0].type == 'funcall' \
+            and not args[0].value.startswith('<'):
+        p[0] = spawn_node(args[0].value, args[0].tree)
+    else:
+        p[0] = ASTNode(type='funcall', value=p[1], tree=args)
 
 def p_assignment(p):
     '''
@@ -148,6 +170,14 @@ def p_assignment(p):
     else:
         p[0] = ASTNode(type='funcall', value='<ASSIGN_ARRAY>', tree=[p[1], p[3], p[6]])
 
+def p_assignment_indices(p):
+    '''
+    assignment : ID LPAREN args_list RPAREN EQUALS expression
+    '''
+    # Two or more indices, as a single one is parsed as an expression above.
+    # The tree holds the array name, one index per dimension and the value.
+    p[0] = ASTNode(type='funcall', value='<ASSIGN_ARRAY>', tree=[p[1], *p[3].tree, p[6]])
+
 def p_declare(p):
     '''
     declaration : declare_array
@@ -156,9 +186,10 @@ def p_declare(p):
 
 def p_declare_array(p):
     '''
-    declare_array : DIM ID LPAREN expression RPAREN AS ID
+    declare_array : DIM ID LPAREN args_list RPAREN AS ID
     '''
-    p[0] = ASTNode(type='funcall', value='<DIM_ARRAY>', tree=[p[2], p[7], p[4]])
+    # Array name, type name and one size per dimension.
+    p[0] = ASTNode(type='funcall', value='<DIM_ARRAY>', tree=[p[2], p[7], *p[4].tree])
 
 def p_rel_expression(p):
     '''
@@ -241,8 +272,28 @@ def p_inline_funcall(p):
     if len(p) == 4:
         p[0] = ASTNode(type='funcall', value=p[1])
     else:
-        args = p[3].tree[:]
-        p[0] = ASTNode(type='funcall', value=p[1], tree=args)
+        p[0] = ASTNode(type='funcall', value=p[1], tree=p[3].tree)
+
+def p_expression_slice(p):
+    '''
+    expression : ID LPAREN expression TO expression RPAREN
+    '''
+    # Elements of an array from the first index to the last one, included.
+    p[0] = ASTNode(type='funcall', value='<SLICE>', tree=[ASTNode(type='id', value=p[1]), p[3], p[5]])
+
+def p_expression_spawn(p):
+    '''
+    expression : ID ID LPAREN RPAREN
+               | ID ID LPAREN args_list RPAREN
+    '''
+    # Calls a SUB or FUNCTION in a new task. SPAWN is not reserved, so
+    # programs may still have variables of this name.
+    if p[1] != 'SPAWN':
+        raise BasicError('SPAWN expected')
+    p[0] = spawn_node(p[2], p[4].tree if len(p) == 6 else [])
+
+def spawn_node(name, args):
+    return ASTNode(type='funcall', value='<SPAWN>', tree=[ASTNode(type='id', value=name)] + args)
 
 def p_expression_number(p):
     '''
@@ -267,13 +318,14 @@ def p_expression_array(p):
     '''
     expression : LBRACE args_list RBRACE
     '''
-    elements = p[2].tree[:]
-    p[0] = ASTNode(type='array', value=elements)
+    p[0] = ASTNode(type='array', value=p[2].tree)
 
 def p_block_begin(p):
     '''
     block_begin : while_block_begin
                 | for_block_begin
+                | for_each_block_begin
+                | parallel_for_block_begin
                 | do_block_begin
                 | function_block_begin
     '''
@@ -285,53 +337,54 @@ def p_if_block_begin(p):
     '''
     current_root = root_stack.top()
     seq_node = ASTNode(type='flag', value='<SEQ>')
+    seq_node.lineno = p.lineno(1)
     current_root.add(seq_node)
     p[0] = ASTNode(type='flag', value='<IF>')
     p[0].add_group([
         p[2],
         ASTNode.BlockNode(),
     ])
-    p[0].block = p[0].tree[1]
     seq_node.add(p[0])
-    root_stack.push(p[0].block)
+    root_stack.parents[p[0]] = seq_node
+    root_stack.push_block(p[0])
 
 def p_else(p):
     '''
     else_statement : ELSE
     '''
     current_root = root_stack.top()
-    if_node = current_root.parent
+    if_node = root_stack.parent(current_root)
     if if_node.value != '<IF>':
         raise BasicError('ELSE without IF')
-    seq_node = if_node.parent
-    p[0] = ASTNode(type='flag', value='<IF>', parent=if_node)
+    seq_node = root_stack.parent(if_node)
+    p[0] = ASTNode(type='flag', value='<IF>')
     p[0].add_group([
         ASTNode.TrueNode(),
         ASTNode.BlockNode(),
     ])
-    p[0].block = p[0].tree[1]
     seq_node.add(p[0])
+    root_stack.parents[p[0]] = seq_node
     root_stack.pop()
-    root_stack.push(p[0].block)
+    root_stack.push_block(p[0])
 
 def p_elseif(p):
     '''
     elseif_block_begin : ELSEIF rel_expression THEN
     '''
     current_root = root_stack.top()
-    if_node = current_root.parent
+    if_node = root_stack.parent(current_root)
     if if_node.value != '<IF>':
         raise BasicError('ELSEIF without IF')
-    seq_node = if_node.parent
-    p[0] = ASTNode(type='flag', value='<IF>', parent=if_node)
+    seq_node = root_stack.parent(if_node)
+    p[0] = ASTNode(type='flag', value='<IF>')
     p[0].add_group([
         p[2],
         ASTNode.BlockNode(),
     ])
-    p[0].block = p[0].tree[1]
     seq_node.add(p[0])
+    root_stack.parents[p[0]] = seq_node
     root_stack.pop()
-    root_stack.push(p[0].block)
+    root_stack.push_block(p[0])
 
 def p_select_case_begin(p):
     '''
@@ -346,6 +399,7 @@ def p_select_case_begin(p):
         p[len(p) - 1]
     ])
     seq_node = ASTNode(type='flag', value='<SEQ>')
+    define_select_var_node.lineno = seq_node.lineno = p.lineno(1)
     current_root.add_group([define_select_var_node, seq_node])
     root_stack.push(seq_node)
 
@@ -365,19 +419,19 @@ def p_case(p):
         eq_node,
         ASTNode.BlockNode(),
     ])
-    p[0].block = p[0].tree[1]
     if current_root.value == '<SEQ>':
         current_root.add(p[0])
     else:
         try:
-            if_node = current_root.parent
-            seq_node = if_node.parent
+            if_node = root_stack.parent(current_root)
+            seq_node = root_stack.parent(if_node)
             assert seq_node.value == '<SEQ>'
         except Exception:
             raise BasicError('CASE without SELECT')
         seq_node.add(p[0])
         root_stack.pop()
-    root_stack.push(p[0].block)
+    root_stack.parents[p[0]] = root_stack.top()
+    root_stack.push_block(p[0])
 
 def p_case_else(p):
     '''
@@ -389,19 +443,19 @@ def p_case_else(p):
         ASTNode.TrueNode(),
         ASTNode.BlockNode()
     ])
-    p[0].block = p[0].tree[1]
     if current_root.value == '<SEQ>':
         current_root.add(p[0])
     else:
         try:
-            if_node = current_root.parent
-            seq_node = if_node.parent
+            if_node = root_stack.parent(current_root)
+            seq_node = root_stack.parent(if_node)
             assert seq_node.value == '<SEQ>'
         except Exception:
             raise BasicError('CASE without SELECT')
         seq_node.add(p[0])
         root_stack.pop()
-    root_stack.push(p[0].block)
+    root_stack.parents[p[0]] = root_stack.top()
+    root_stack.push_block(p[0])
 
 def p_while_block_begin(p):
     '''
@@ -412,7 +466,6 @@ def p_while_block_begin(p):
         p[2], # judgement
         ASTNode.BlockNode()
     ])
-    p[0].block = p[0].tree[1]
 
 def p_do_block_begin(p):
     '''
@@ -423,7 +476,6 @@ def p_do_block_begin(p):
         None, # to be filled when parsing LOOP
         ASTNode.BlockNode()
     ])
-    p[0].block = p[0].tree[1]
 
 def p_for_block_begin(p):
     '''
@@ -438,7 +490,57 @@ def p_for_block_begin(p):
         ASTNode(type='number', value=1) if len(p) == 7 else p[8], # step
         ASTNode.BlockNode()
     ])
-    p[0].block = p[0].tree[4]
+
+def p_for_each_block_begin(p):
+    '''
+    for_each_block_begin : FOR ID ID ID ID ID expression
+    '''
+    # FOR EACH LINE L IN FILE F. The words are not reserved, so programs may
+    # still have variables named LINE or FILE.
+    if (p[2], p[3], p[5], p[6]) != ('EACH', 'LINE', 'IN', 'FILE'):
+        raise BasicError('FOR EACH LINE expected')
+    p[0] = ASTNode(type='flag', value='<FOR_EACH>')
+    p[0].add_group([
+        ASTNode(type='id', value=p[4]), # loop variable
+        p[7], # file name or file
+        ASTNode.BlockNode()
+    ])
+
+def p_parallel_for_block_begin(p):
+    '''
+    parallel_for_block_begin : ID for_block_begin
+                             | ID for_block_begin ID reductions_list
+    '''
+    # PARALLEL, REDUCE and WITH are not reserved, so programs may still have
+    # variables of these names.
+    if p[1] != 'PARALLEL':
+        raise BasicError('PARALLEL FOR expected')
+    if len(p) == 5 and p[3] != 'REDUCE':
+        raise BasicError('REDUCE expected')
+    # Same tree as FOR, followed by the list of (variable, operator) pairs
+    # combining the results of the workers.
+    reductions = p[4] if len(p) == 5 else []
+    p[0] = ASTNode(type='flag', value='<PARALLEL_FOR>', tree=p[2].tree + [reductions])
+
+def p_reductions_list(p):
+    '''
+    reductions_list : reductions_list COMMA reduction
+                    | reduction
+    '''
+    p[0] = p[1] + [p[3]] if len(p) == 4 else [p[1]]
+
+def p_reduction(p):
+    '''
+    reduction : ID ID PLUS
+              | ID ID TIMES
+              | ID ID ID
+    '''
+    if p[2] != 'WITH':
+        raise BasicError('WITH expected')
+    operator = {'+': '<PLUS>', '*': '<TIMES>', 'MAX': 'MAX', 'MIN': 'MIN'}.get(p[3])
+    if operator is None:
+        raise BasicError('Cannot reduce %s with %s' % (p[1], p[3]))
+    p[0] = (p[1], operator)
 
 def p_function_block_begin(p):
     '''
@@ -451,14 +553,13 @@ def p_function_block_begin(p):
     args_node = p[4].tree[:] if len(p) == 6 else []
     block_node = ASTNode.BlockNode()
     p[0].add_group([p[2], args_node, block_node])
-    p[0].block = p[0].tree[2]
 
 def p_if_block_end(p):
     '''
     block_end : END IF
     '''
     current_root = root_stack.top()
-    if current_root.parent.value != '<IF>':
+    if root_stack.parent(current_root).value != '<IF>':
         raise BasicError('END IF without IF')
 
 def p_select_block_end(p):
@@ -467,9 +568,11 @@ def p_select_block_end(p):
     '''
     global select_var_count
     current_root = root_stack.top()
-    if current_root.parent.value != '<IF>':
+    if root_stack.parent(current_root).value != '<IF>':
         raise BasicError('END SELECT without SELECT')
     select_var_count -= 1
+    # Close the last CASE here, and the SELECT as any block.
+    root_stack.pop()
 
 def p_while_block_end(p):
     '''
@@ -477,7 +580,7 @@ def p_while_block_end(p):
               | WEND
     '''
     current_root = root_stack.top()
-    if current_root.parent.value != '<WHILE>':
+    if root_stack.parent(current_root).value != '<WHILE>':
         raise BasicError('END WHILE without WHILE')
 
 def p_for_block_end(p):
@@ -486,11 +589,11 @@ def p_for_block_end(p):
               | NEXT ID
     '''
     current_root = root_stack.top()
-    for_node = current_root.parent
-    if for_node.value != '<FOR>':
+    for_node = root_stack.parent(current_root)
+    if for_node.value not in ('<FOR>', '<FOR_EACH>', '<PARALLEL_FOR>'):
         raise BasicError('END FOR without FOR')
     if p[1] == 'NEXT' and p[2] != for_node.tree[0].value:
-        raise BasicError('Unmatched NEXT %s with %s' % p[2])
+        raise BasicError('Unmatched NEXT %s with %s' % (p[2], for_node.tree[0].value))
 
 def p_do_block_end(p):
     '''
@@ -499,7 +602,7 @@ def p_do_block_end(p):
               | LOOP UNTIL rel_expression
     '''
     current_root = root_stack.top()
-    do_node = current_root.parent
+    do_node = root_stack.parent(current_root)
     if do_node.value != '<DO>':
         raise BasicError('LOOP without DO')
     if len(p) == 2:
@@ -515,7 +618,7 @@ def p_function_block_end(p):
               | END FUNCTION
     '''
     current_root = root_stack.top()
-    func_node = current_root.parent
+    func_node = root_stack.parent(current_root)
     if func_node.value != '<%s>' % p[2]:
         raise BasicError('END %s without %s' % (p[2], p[2]))
 
@@ -524,8 +627,10 @@ def p_return(p):
     return : RETURN
            | RETURN expression
     '''
+    if root_stack.parallel_top() is not None:
+        raise BasicError('RETURN inside PARALLEL FOR')
     current_root = root_stack.closure_top()
-    func_node = current_root.parent
+    func_node = root_stack.parent(current_root)
     if len(p) == 2 and func_node.value not in ('<FUNCTION>', '<SUB>'):
         raise BasicError('RETURN without FUNCTION or SUB')
     if len(p) == 3 and func_node.value != '<FUNCTION>':
@@ -540,6 +645,8 @@ def p_prog_end(p):
     '''
     prog_end : END
     '''
+    if root_stack.parallel_top() is not None:
+        raise BasicError('END inside PARALLEL FOR')
     p[0] = ASTNode(type='flag', value='<END>')
 
 def p_control_exit(p):
@@ -549,8 +656,8 @@ def p_control_exit(p):
             | EXIT FOR
     '''
     current_root = root_stack.control_top()
-    node = current_root.parent
-    if node.value != '<%s>' % p[2]:
+    node = root_stack.parent(current_root)
+    if node.value != '<%s>' % p[2] and not (node.value == '<FOR_EACH>' and p[2] == 'FOR'):
         raise BasicError('EXIT %s without %s' % (p[2], p[2]))
     p[0] = ASTNode(type='flag', value='<BREAK>')
 
@@ -561,8 +668,9 @@ def p_control_continue(p):
             | CONTINUE FOR
     '''
     current_root = root_stack.control_top()
-    node = current_root.parent
-    if node.value != '<%s>' % p[2]:
+    node = root_stack.parent(current_root)
+    # Workers run each chunk of a PARALLEL FOR as a FOR loop.
+    if node.value != '<%s>' % p[2] and not (node.value in ('<FOR_EACH>', '<PARALLEL_FOR>') and p[2] == 'FOR'):
         raise BasicError('CONTINUE %s without %s' % (p[2], p[2]))
     p[0] = ASTNode(type='flag', value='<CONTINUE>')
 
@@ -570,34 +678,154 @@ def p_use_statement(p):
     '''
     statement : USE ID
     '''
-    name = p[2].lower()
-    lib_module_name = '%s/basic_lib/%s.py' % (sys.path[0], name)
-    py_module_name = '%s.py' % name
-    basic_module_name = '%s.bas' % name
-    if path.isfile(basic_module_name):
-        module_file = open(basic_module_name)
-        lines = module_file.readlines()
-        module_file.close()
-        for line in lines:
-            parser.parse(line)
-    elif path.isfile(py_module_name):
-        current_root = root_stack.top()
-        p[0] = ASTNode(type='flag', value='<RUN_PY>')
-        p[0].add(py_module_name)
-        current_root.add(p[0])
-    elif path.isfile(lib_module_name):
-        current_root = root_stack.top()
-        p[0] = ASTNode(type='flag', value='<RUN_PY>')
-        p[0].add(lib_module_name)
-        current_root.add(p[0])
-    else:
-        raise BasicError('No such module: %s' % p[2])
+    # The module is loaded when the statement runs, see basic_modules.
+    current_root = root_stack.top()
+    p[0] = ASTNode(type='flag', value='<USE>')
+    p[0].add(p[2])
+    p[0].lineno = p.lineno(1)
+    current_root.add(p[0])
 
-# Error rule for syntax errors.
-def p_error(p):
-    # blank lines or errors
-    if p is not None:
-        raise BasicError('Syntax error on line %d' % p.lineno)
+# Error rule for syntax errors, given the unexpected token.
+def p_error(t):
+    if t[0] == '$end':
+        raise BasicError('Unexpected end of file')
+    raise BasicError('Syntax error on line %d' % t[2])
+
+# Build the parser. Its tables drive parse_tokens(): for each state, its
+# only action or its actions by token type, and the state after each symbol;
+# the length, symbol and function of each rule. PLY makes them from the rules
+# above, which takes longer than the rest of starting up, so they are kept in
+# basic_tables.py, made by write_tables(), with a checksum of the grammar they
+# were made from. When the grammar has changed since, PLY makes them again.
+def grammar_checksum():
+    rules = [(name, func.__doc__) for name, func in sorted(globals().items())
+             if name.startswith('p_') and name != 'p_error']
+    return '%08x' % zlib.crc32(repr((tokens, precedence, start, rules)).encode())
+
+def make_tables():
+    import ply.yacc as yacc
+    parser = yacc.yacc(module=sys.modules[__name__], debug=False, write_tables=False)
+    actions = [parser.defaulted_states.get(state, parser.action[state])
+               for state in range(len(parser.action))]
+    gotos = [parser.goto.get(state, {}) for state in range(len(parser.action))]
+    rules = [(rule.len, rule.name, rule.func) for rule in parser.productions]
+    return actions, gotos, rules
+
+# Writes the tables of the grammar to basic_tables.py, to run after changing
+# the rules:
+#   python -c "from pybasic.basic_yacc import write_tables; write_tables()"
+def write_tables(file_name=path.join(path.dirname(path.abspath(__file__)), 'basic_tables.py')):
+    actions, gotos, rules = make_tables()
+    with open(file_name, 'w', encoding='utf8') as f:
+        f.write('# Parser tables made by basic_yacc.write_tables(), do not edit.\n')
+        f.write('checksum = %r\n' % grammar_checksum())
+        for name, table in (('actions', actions), ('gotos', gotos), ('rules', rules)):
+            f.write('%s = [\n' % name)
+            for item in table:
+                f.write('    %r,\n' % (item,))
+            f.write(']\n')
+
+def load_tables():
+    try:
+        from . import basic_tables
+    except ImportError:
+        basic_tables = None
+    if basic_tables is None or basic_tables.checksum != checksum:
+        actions, gotos, rules = make_tables()
+    else:
+        actions, gotos, rules = basic_tables.actions, basic_tables.gotos, basic_tables.rules
+    functions = globals()
+    return actions, gotos, [(n, name, functions[func] if func else None) for n, name, func in rules]
+
+# Also part of the key of the programs basic_cache keeps.
+checksum = grammar_checksum()
+state_actions, state_gotos, rules = load_tables()
+
+class Production(list):
+    # What a rule gets as p: the values of its symbols, with p[0] set by the
+    # rule, and their line numbers.
+    __slots__ = ('lines',)
+
+    def lineno(self, n):
+        return self.lines[n]
+
+# LR parsing of a stream of tokens, with the tables PLY made for the rules
+# above. PLY's parser does more for every token, for error recovery and
+# debugging, which the grammar does not use. Returns the value of the start
+# symbol.
+def parse_tokens(tokens):
+    states, values, lines = [0], [None], [0]
+    state = 0
+    token = None
+    while True:
+        t = state_actions[state]
+        if t.__class__ is not int:
+            if token is None:
+                token = next(tokens)
+            t = t.get(token[0])
+            if t is None:
+                p_error(token)
+        if t > 0:
+            # Shift.
+            state = t
+            states.append(t)
+            values.append(token[1])
+            lines.append(token[2])
+            token = None
+        elif t < 0:
+            # Reduce, the rule setting p[0].
+            n, name, func = rules[-t]
+            if n:
+                p = Production(values[-n - 1:])
+                p.lines = lines[-n - 1:]
+                lineno = p.lines[1]
+                del states[-n:], values[-n:], lines[-n:]
+            else:
+                p = Production([None])
+                p.lines = [lines[-1]]
+                lineno = lines[-1]
+            p[0] = None
+            try:
+                func(p)
+            except BasicError as error:
+                raise BasicError('%s on line %d' % (error, lineno)) from None
+            state = state_gotos[states[-1]][name]
+            states.append(state)
+            values.append(p[0])
+            lines.append(lineno)
+        else:
+            return values[-1]
+
+@contextmanager
+def parsing(state):
+    global root_stack, select_var_count
+    with parse_lock:
+        saved = root_stack, select_var_count
+        root_stack, select_var_count = state.root_stack, state.select_var_count
+        try:
+            yield state.ast
+        finally:
+            state.select_var_count = select_var_count
+            root_stack, select_var_count = saved
+
+# Parse source text in one pass into state, or into the state being parsed.
+def parse_source(text, state=None):
+    if state is not None:
+        with parsing(state):
+            return parse_source(text)
+    if not text.endswith('\n'):
+        text += '\n'
+    # The tree holds no cycles, and the collector would go through it again
+    # and again as it grows.
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        parse_tokens(tokenize(text))
+    finally:
+        if collecting:
+            gc.enable()
+
+# Parse source lines, as read by readlines().
+def parse_lines(lines, state=None):
+    return parse_source(''.join(lines), state)
 
-# Build the parser.
-parser = yacc.yacc()
@@ -1,75 +1,369 @@
 #!/usr/bin/env python3
 
-import argparse
-import pickle
+import gc
+import queue
 import sys
+import time
+from os import path
 
-from .basic_yacc import ast, parser, root_stack
-from .basic_ast import stack_size2a
+from .basic_yacc import ParseState, parse_source
+from . import basic_async
+from . import basic_binary
+from . import basic_cache
+from . import basic_parallel
+from . import basic_profile
+from .basic_ast import ASTNode, stack_size2a
+from .basic_compile import Compiler, compile_node
+from .basic_memo import pure_functions
+from .basic_optimize import optimize
+from .basic_vm import VM, compile_vm, disassemble
+from .symbol_table import Context, builtin_table, table_stack
 from .utils import BasicError
 
+engines = ('closure', 'tree', 'vm')
+
 
 def print_error(error):
     print('ERROR: %s' % error, file=sys.stderr)
 
 
-# Read-evaluate-print-loop (REPL).
-def parse_line(cnt, in_block=False):
+# Read a line of input for the REPL.
+def input_line(cnt, in_block=False):
     prompt = '> ' if in_block else 'In [%d]: ' % cnt
     while True:
         try: s = input(prompt)
         except (EOFError, KeyboardInterrupt):
             sys.exit(1)
-        if s: break
-    return parser.parse(s)
+        if s: return s
 
-def repl():
-    cnt = 1
-    while True:
-        try:
-            result = parse_line(cnt)
-            while len(root_stack) > 1:
-                parse_line(cnt, in_block=True)
-        except Exception as error:
-            print_error(error)
-            cnt += 1
-            continue
-        if result is not None:
+
+# Read a statement for the REPL and parse it into state.
+def parse_line(cnt, state, in_block=False):
+    parse_source(input_line(cnt, in_block), state)
+
+
+# Commands of the REPL, typed as :time PRINT F(10). Each runs the statement
+# after it in the session, see the repl_ methods of Interpreter.
+repl_commands = ('time', 'timeit', 'profile', 'mem')
+
+
+class Program:
+    # A parsed, optimized and compiled program, which runs any number of
+    # times without parsing or compiling it again. Nothing in it changes when
+    # it runs, so one Program can run in several interpreters at once. Make
+    # it in the Interpreter running it first, or with compile().
+    def __init__(self, node, engine='closure', profiler=None, tco=True, memoize=True):
+        if engine not in engines:
+            raise BasicError('Unknown engine %s' % engine)
+        self.node = node
+        self.engine = engine
+        self.definitions = {}
+        basic_parallel.register(node, self.definitions)
+        if engine == 'tree':
+            self.code = node
+        elif engine == 'vm':
+            self.code = compile_vm(node, tco, memoize)
+        else:
+            self.code = compile_node(node, profiler, tco, memoize)
+
+    # Run the program in interpreter, a new one by default, with the
+    # variables in inputs set, reading INPUT from stdin and writing PRINT to
+    # stdout. Returns the global variables it leaves, by name.
+    def run(self, inputs=None, stdin=None, stdout=None, interpreter=None):
+        if interpreter is None:
+            interpreter = Interpreter()
+        interpreter.stdin, interpreter.stdout = stdin, stdout
+        with interpreter.active():
+            for name, value in (inputs or {}).items():
+                interpreter.globals.set(name, value)
+            interpreter.definitions.update(self.definitions)
+            if self.engine == 'tree':
+                self.code.run()
+            elif self.engine == 'vm':
+                VM(self.code, interpreter.globals).run()
+            else:
+                self.code(interpreter.globals)
+            # Tasks still running keep the program alive.
+            basic_async.finish()
+        builtins = builtin_table._table
+        return {name: value for name, value in interpreter.globals._table.items()
+                if not name.startswith('<') and (name not in builtins or builtins[name] is not value)}
+
+
+class Interpreter(Context):
+    # Runs programs in a global table of its own, starting as a copy of the
+    # builtins, and parses each program into an AST of its own. Interpreters
+    # share nothing a program changes, so several of them can run at once,
+    # each in a thread of its own; variables set by a program stay in its
+    # interpreter for the next one.
+    def reset(self):
+        super().reset()
+        # AST of the last program parsed.
+        self.ast = None
+
+    # Parse source text, or a list of its lines, into a new program.
+    def parse(self, source):
+        if not isinstance(source, str):
+            source = ''.join(source)
+        state = ParseState()
+        with self.active():
+            parse_source(source, state)
+        self.ast = state.ast
+        return state.ast
+
+    # Parse the source of program file_name, or load its tree from the cache
+    # of parsed programs, see basic_cache.
+    def parse_file(self, file_name, source):
+        with self.active():
+            self.ast = basic_cache.parse_file(file_name, source)
+        return self.ast
+
+    # Optimize a parsed program at the given -O level, printing the tree
+    # before and after if asked to.
+    def optimize_ast(self, node, level=1, dump_ast=False):
+        if dump_ast:
+            print('AST before optimization:', file=sys.stderr)
+            node.show()
+        with self.active():
+            node = optimize(node, level)
+        if dump_ast:
+            print('AST after optimization (-O%d):' % level, file=sys.stderr)
+            node.show()
+        return node
+
+    # Run a parsed program with the given engine.
+    def run_ast(self, node, engine='closure', profiler=None, tco=True, memoize=True):
+        with self.active():
+            program = Program(node, engine, profiler, tco, memoize)
+        program.run(stdin=self.stdin, stdout=self.stdout, interpreter=self)
+
+    # Read-evaluate-print-loop (REPL).
+    def repl(self, engine='closure', tco=True, memoize=True):
+        state = ParseState()
+        cnt = 1
+        while True:
+            line = input_line(cnt)
+            command = None
+            if line.startswith(':'):
+                command, _, line = line[1:].partition(' ')
+                if command not in repl_commands or not line.strip():
+                    print_error('Usage: %s STATEMENT' % ' | '.join(':' + x for x in repl_commands))
+                    cnt += 1
+                    continue
             try:
-                # result.show()
-                out = result.run()
-                if out is not None:
-                    print('Out [%d]: %s' % (cnt, out))
+                start = len(state.ast.tree)
+                parse_source(line, state)
+                while len(state.root_stack) > 1:
+                    parse_line(cnt, state, in_block=True)
             except Exception as error:
                 print_error(error)
-            print('')
-        cnt += 1
-
-# Execute a text-based program.
-def execute(program_name):
-    f = open(program_name, 'r', encoding="utf8")
-    lines = f.readlines()
-    try:
-        for line in lines:
-            parser.parse(line)
-        # ast.show()
-        # print(f'stack depth = {stack_size2a()}')
-        ast.run()
-    except Exception as error:
-        print_error(error)
-
-
-# Save AST object with pickle.
+                cnt += 1
+                continue
+            # The statements the input added to the program.
+            statements = state.ast.tree[start:]
+            if len(statements) == 1:
+                result = statements[0]
+            else:
+                result = ASTNode.BlockNode()
+                result.tree = list(statements)
+            if statements:
+                try:
+                    # result.show()
+                    with self.active():
+                        basic_parallel.register(result)
+                        if command is None:
+                            out = self.compile_input(result, engine, tco, memoize)()
+                        else:
+                            out = getattr(self, 'repl_' + command)(result, engine, tco, memoize, state)
+                    if out is not None:
+                        print('Out [%d]: %s' % (cnt, out))
+                except Exception as error:
+                    print_error(error)
+                print('')
+            cnt += 1
+
+    # A function running statements typed in the REPL with the given engine,
+    # returning the value of an expression. Both engines memoize the pure
+    # FUNCTIONs the statements define unless memoize is False.
+    def compile_input(self, node, engine='closure', tco=True, memoize=True, profiler=None):
+        if engine == 'tree':
+            return node.run
+        if engine == 'vm':
+            code = compile_vm(node, tco, memoize)
+            def run():
+                vm = VM(code, table_stack.top())
+                vm.run()
+                return vm.result
+            return run
+        compiler = Compiler(profiler, tco, memoize)
+        if memoize:
+            compiler.pure = pure_functions(node)
+        run = compiler.compile(node)
+        return lambda: run(table_stack.top())
+
+    # A function emptying the caches of memoized functions before each run,
+    # so that timing a call measures its work rather than a cache hit.
+    def uncached(self, run):
+        caches = self.caches
+        def run_uncached():
+            for cache in caches:
+                cache.table.clear()
+            return run()
+        return run_uncached
+
+    # :time runs the statement once, printing how long it took.
+    def repl_time(self, node, engine, tco, memoize, state):
+        run = self.uncached(self.compile_input(node, engine, tco, memoize))
+        start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            return run()
+        finally:
+            print('Wall time: %s, CPU time: %s' % (
+                basic_profile.format_time(time.perf_counter() - start),
+                basic_profile.format_time(time.process_time() - cpu_start)))
+
+    # :timeit runs the statement as many times as takes 0.2 s, 5 times over
+    # with the garbage collector off, like the timeit module, and prints the
+    # time of one run.
+    def repl_timeit(self, node, engine, tco, memoize, state, repeat=5):
+        run = self.uncached(self.compile_input(node, engine, tco, memoize))
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            number = basic_profile.autorange(run)
+            times = [basic_profile.time_loops(run, number) / number for _ in range(repeat)]
+        finally:
+            if collecting:
+                gc.enable()
+        mean = sum(times) / repeat
+        deviation = (sum((x - mean) ** 2 for x in times) / (repeat - 1)) ** 0.5
+        print('%d loop%s, best of %d: %s per loop (mean %s \u00b1 %s)' % (
+            number, 's' if number > 1 else '', repeat, basic_profile.format_time(min(times)),
+            basic_profile.format_time(mean), basic_profile.format_time(deviation)))
+
+    # :profile runs the statement with the closure engine and a Profiler,
+    # printing the time spent in each statement and in each SUB or FUNCTION
+    # of the session, which are compiled again with the Profiler meanwhile,
+    # without memoization.
+    def repl_profile(self, node, engine, tco, memoize, state, limit=20):
+        profiler = basic_profile.Profiler()
+        definitions = {}
+        basic_parallel.register(state.ast, definitions)
+        functions = self.globals._table
+        saved = {name: functions[name] for name in definitions if name in functions}
+        try:
+            for name in saved:
+                compile_node(definitions[name], profiler, tco)(self.globals)
+            self.compile_input(node, 'closure', tco, False, profiler)()
+        finally:
+            functions.update(saved)
+        profiler.report(file=sys.stdout, limit=limit)
+
+    # :mem runs the statement, printing the most memory it allocated at
+    # once and how much of it is still allocated.
+    def repl_mem(self, node, engine, tco, memoize, state):
+        import tracemalloc
+        run = self.compile_input(node, engine, tco, memoize)
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        try:
+            run()
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            if not tracing:
+                tracemalloc.stop()
+            print('Peak memory: %s, still allocated: %s' % (
+                basic_profile.format_size(peak - before), basic_profile.format_size(current - before)))
+
+    # Execute a text-based program.
+    # The closure engine compiles the AST before running it; 'tree' selects
+    # the original tree-walking interpreter and 'vm' the bytecode machine,
+    # which is not limited by Python's recursion depth. Pass a Profiler to
+    # collect per-function and per-statement timings (closure engine only).
+    # Both the closure engine and the VM run RETURN F(...) without growing
+    # the call stack unless tco is False, and cache the results of pure
+    # functions unless memoize is False.
+    def execute(self, program_name, engine='closure', profiler=None, level=1, dump_ast=False,
+                tco=True, memoize=True):
+        with open(program_name, 'r', encoding="utf8") as f:
+            source = f.read()
+        self.directory = path.dirname(path.abspath(program_name))
+        try:
+            node = self.parse_file(program_name, source)
+            # print(f'stack depth = {stack_size2a()}')
+            self.run_ast(self.optimize_ast(node, level, dump_ast), engine, profiler, tco, memoize)
+        except Exception as error:
+            print_error(error)
+
+    # Print the bytecode of a text-based program.
+    def disassemble_program(self, program_name, file=sys.stdout, level=1, tco=True):
+        with open(program_name, 'r', encoding="utf8") as f:
+            node = self.parse_file(program_name, f.read())
+        with self.active():
+            disassemble(compile_vm(optimize(node, level), tco), file)
+
+    # Save the AST of a program in a binary program file, see basic_binary.
+    def save_ast(self, input_name, output_name):
+        with open(input_name, 'r', encoding="utf8") as input_file:
+            basic_binary.save(self.parse(input_file.read()), output_name)
+
+    # Execute a binary AST program.
+    def execute_ast(self, ast_file_name, engine='closure', profiler=None, level=1, dump_ast=False,
+                    tco=True, memoize=True):
+        self.directory = path.dirname(path.abspath(ast_file_name))
+        try:
+            new_ast = basic_binary.load(ast_file_name)
+            self.run_ast(self.optimize_ast(new_ast, level, dump_ast), engine, profiler, tco, memoize)
+        except Exception as error:
+            print_error(error)
+
+
+# The functions below each run in a new Interpreter.
+def repl(engine='closure', tco=True, memoize=True):
+    Interpreter().repl(engine, tco, memoize)
+
+def execute(program_name, engine='closure', profiler=None, level=1, dump_ast=False, tco=True,
+            memoize=True):
+    Interpreter().execute(program_name, engine, profiler, level, dump_ast, tco, memoize)
+
+def disassemble_program(program_name, file=sys.stdout, level=1, tco=True):
+    Interpreter().disassemble_program(program_name, file, level, tco)
+
 def save_ast(input_name, output_name):
-    with open(input_name, 'r') as input_file, open(output_name, 'wb') as output_file:
-        lines = input_file.readlines()
-        for line in lines:
-            parser.parse(line)
-        pickle.dump(ast, output_file)
-
-# Execute a binary AST program.
-def execute_ast(ast_file_name):
-    with open(ast_file_name, 'rb') as input_file:
-        new_ast = pickle.load(input_file)
-    new_ast.run()
+    Interpreter().save_ast(input_name, output_name)
 
+def execute_ast(ast_file_name, engine='closure', profiler=None, level=1, dump_ast=False, tco=True,
+                memoize=True):
+    Interpreter().execute_ast(ast_file_name, engine, profiler, level, dump_ast, tco, memoize)
+
+
+# Parse, optimize at the given -O level and compile a program, given as its
+# source text or lines, for Program.run().
+def compile(source, engine='closure', level=1, tco=True, memoize=True):
+    interpreter = Interpreter()
+    node = interpreter.optimize_ast(interpreter.parse(source), level)
+    with interpreter.active():
+        return Program(node, engine, tco=tco, memoize=memoize)
+
+
+class InterpreterPool:
+    # Interpreters made in advance for running Programs, size of them, which
+    # is how many programs the pool runs at once; run() waits while all of
+    # them are busy. Each interpreter is reset after a run, so runs see
+    # nothing of each other. Call run() from a thread of its own for each
+    # request, or from an asyncio server with loop.run_in_executor().
+    def __init__(self, size=4):
+        self.interpreters = queue.LifoQueue()
+        for _ in range(size):
+            self.interpreters.put(Interpreter())
+
+    def run(self, program, inputs=None, stdin=None, stdout=None):
+        interpreter = self.interpreters.get()
+        try:
+            return program.run(inputs, stdin, stdout, interpreter)
+        finally:
+            interpreter.reset()
+            self.interpreters.put(interpreter)
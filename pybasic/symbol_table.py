@@ -1,29 +1,30 @@
 #!python3
-import platform
-import math
-import os
+import threading
+from contextlib import contextmanager
 from .utils import BasicError, Stack
 
 class SymbolTable:
     def __init__(self, parent=None):
         self._table = {}
         self.parent = parent
+        # Dictionary of the global table, shared by the whole chain.
+        self.gtab = parent.gtab if parent is not None else self._table
 
     def get(self, id):
         id = id.upper()
         if id in self._table:
             return self._table[id]
-        if not id in global_table._table:
+        if not id in self.gtab:
             raise BasicError('undefined variable "%s"' % id)
         else:
-            return global_table.get(id)
+            return self.gtab[id]
 
     def set(self, id, value):
         id = id.upper()
-        if id in self._table or not id in global_table._table:
+        if id in self._table or not id in self.gtab:
             self._table[id] = value
             return True
-        global_table._table[id] = value
+        self.gtab[id] = value
         return True
 
     def register(self, id):
@@ -43,8 +44,116 @@ class SymbolTable:
                 return new_func
             return decorator
 
-global_table = SymbolTable()
-table_stack = Stack([global_table])
+# Marks a local slot which has not been assigned yet.
+UNSET = object()
+
+class Frame(list):
+    # Locals of a compiled SUB/FUNCTION call, kept in the slots its Scope
+    # resolved at compile time. Builtins may still use it by name like any
+    # other SymbolTable.
+    __slots__ = ('scope', 'gtab', 'extra')
+
+    def __init__(self, scope, gtab):
+        list.__init__(self, scope.template)
+        self.scope = scope
+        self.gtab = gtab
+        self.extra = None
+
+    def get(self, id):
+        id = id.upper()
+        slot = self.scope.index.get(id)
+        if slot is not None and self[slot] is not UNSET:
+            return self[slot]
+        if self.extra is not None and id in self.extra:
+            return self.extra[id]
+        if not id in self.gtab:
+            raise BasicError('undefined variable "%s"' % id)
+        return self.gtab[id]
+
+    def set(self, id, value):
+        id = id.upper()
+        slot = self.scope.index.get(id)
+        if slot is None:
+            if self.extra is None:
+                self.extra = {}
+            if id in self.extra or not id in self.gtab:
+                self.extra[id] = value
+                return True
+        elif self[slot] is not UNSET or not id in self.gtab:
+            self[slot] = value
+            return True
+        self.gtab[id] = value
+        return True
+
+# Builtins and constants, registered as the modules defining them are
+# imported. Every Context starts with a copy of them.
+builtin_table = SymbolTable()
+
+
+class Context:
+    # What a program changes while it runs: its global table, which starts
+    # as a copy of the builtins, and what builtins keep for it. A thread
+    # runs one context at a time, see table_stack.
+    def __init__(self, table=None):
+        self.globals = SymbolTable() if table is None else table
+        self.reset()
+
+    def reset(self):
+        # Forgets every program run in this context.
+        if self.globals is not builtin_table:
+            self.globals._table.clear()
+            self.globals._table.update(builtin_table._table)
+        # Files INPUT reads and PRINT writes, None for sys.stdin and
+        # sys.stdout.
+        self.stdin = None
+        self.stdout = None
+        # MemoCaches of the memoized functions, for --memo-stats.
+        self.caches = []
+        # SUB/FUNCTION definitions by name, shipped to PARALLEL FOR workers.
+        self.definitions = {}
+        # Why each FOR loop was vectorized or not, for --vectorize-report.
+        self.vector_reports = []
+        # Scheduler of the tasks the program spawns, made by the first SPAWN.
+        self.scheduler = None
+        # Modules USE loaded by file name, see basic_modules, and the
+        # directory of the program run, where USE looks for them.
+        self.modules = {}
+        self.directory = None
+
+    @contextmanager
+    def active(self):
+        # Runs the with block in this context in the calling thread.
+        saved = table_stack.items, table_stack.context
+        table_stack.items, table_stack.context = [self.globals], self
+        try:
+            yield self
+        finally:
+            table_stack.items, table_stack.context = saved
+
+
+# Context of threads running no Interpreter, whose global table holds the
+# builtins themselves.
+default_context = Context(builtin_table)
+
+
+class TableStack(Stack, threading.local):
+    # Symbol tables of the program running in this thread, its global table
+    # first, and its Context. Every thread has its own.
+    def __init__(self):
+        super().__init__([default_context.globals])
+        self.context = default_context
+
+
+class GlobalTable:
+    # Stands for the global table of the program running in the calling
+    # thread, for builtins and Python modules reading and setting globals or
+    # registering functions.
+    def __getattr__(self, name):
+        return getattr(table_stack.context.globals, name)
+
+
+global_table = GlobalTable()
+table_stack = TableStack()
 
 # Constants
 global_table.set('Nothing', None)
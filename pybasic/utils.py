@@ -12,17 +12,46 @@ class Stack:
     def pop(self):
         return self.items.pop()
 
+class NoParent:
+    # Parent of the blocks no statement owns, such as the program, so that
+    # statements closing a block they are not in find no match.
+    value = None
+
 class RootStack(Stack):
-    control_blocks = ('<WHILE>', '<DO>', '<FOR>')
+    control_blocks = ('<WHILE>', '<DO>', '<FOR>', '<FOR_EACH>', '<PARALLEL_FOR>')
     closure_blocks = ('<SUB>', '<FUNCTION>')
+    def __init__(self, items=[]):
+        super().__init__(items)
+        # AST nodes keep no parent pointers, so the parser records the node
+        # owning each open block, and the <SEQ> owning each <IF>, here.
+        self.parents = {}
+    def parent(self, node):
+        return self.parents.get(node, NoParent)
+    def push_block(self, node):
+        self.parents[node.block] = node
+        self.push(node.block)
+    def pop(self):
+        block = super().pop()
+        owner = self.parents.pop(block, None)
+        self.parents.pop(owner, None)
+        return block
     def control_top(self):
         for item in reversed(self.items):
-            if item.parent.value in RootStack.control_blocks:
+            if getattr(self.parent(item), 'value', None) in RootStack.control_blocks:
                 return item
         return None
     def closure_top(self):
         for item in reversed(self.items):
-            if item.parent.value in RootStack.closure_blocks:
+            if getattr(self.parent(item), 'value', None) in RootStack.closure_blocks:
+                return item
+        return None
+    def parallel_top(self):
+        # Innermost PARALLEL FOR open in the current SUB/FUNCTION.
+        for item in reversed(self.items):
+            value = getattr(self.parent(item), 'value', None)
+            if value in RootStack.closure_blocks:
+                return None
+            if value == '<PARALLEL_FOR>':
                 return item
         return None
 
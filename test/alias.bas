@@ -0,0 +1,31 @@
+' Reads of array elements written through another name for the array.
+DIM A(3) AS INTEGER
+X = A(1) + 1
+B = A
+B(1) = 5
+Y = A(1) + 1
+PRINT X, Y
+
+' In a loop writing through the other name.
+N = 0
+WHILE N < 3
+    N = N + 1
+    B(2) = N
+    T = A(2)
+WEND
+PRINT N, T
+
+' Across statements with an assignment or a call in between.
+SUB BUMP()
+    B(3) = B(3) + 10
+END SUB
+P = A(3) * 2
+BUMP()
+Q = A(3) * 2
+K = 4
+R = K * A(1)
+IF R > 0 THEN
+    K = 1
+END IF
+S = K * A(1)
+PRINT P, Q, R, S
@@ -0,0 +1,11 @@
+' Module of modules.bas: counts calls in a variable of its own.
+PRINT "counter loaded"
+CALLS = 0
+
+SUB BUMP()
+    CALLS = CALLS + 1
+END SUB
+
+FUNCTION COUNT()
+    RETURN CALLS
+END FUNCTION
@@ -0,0 +1,18 @@
+' Writes a small log, then reads it back a line at a time and at once.
+WRITELINES "lines.log", {"INFO start", "ERROR disk full", "INFO retry", "ERROR disk full"}
+F = OPEN("lines.log", "APPEND")
+FWRITE F, "INFO done"
+CLOSE F
+
+ERRORS = 0
+FOR EACH LINE L IN FILE "lines.log"
+    IF LEFT$(L, 5) = "ERROR" THEN
+        ERRORS = ERRORS + 1
+    END IF
+NEXT L
+PRINT "errors:", ERRORS
+
+' The last line has no line break, and is read whole.
+LINES = READLINES("lines.log")
+PRINT LINES(LEN$(LINES) - 1)
+PRINT LEN$(READALL$("lines.log"))
@@ -0,0 +1,23 @@
+' Multiply two matrices stored in two-dimensional arrays.
+N = 3
+DIM A(N, N) AS DECIMAL
+DIM B(N, N) AS DECIMAL
+DIM C(N, N) AS DECIMAL
+FOR I = 0 TO N
+    FOR J = 0 TO N
+        A(I, J) = I + J
+        B(I, J) = I - J
+    NEXT J
+NEXT I
+FOR I = 0 TO N
+    FOR J = 0 TO N
+        S = 0
+        FOR K = 0 TO N
+            S = S + A(I, K) * B(K, J)
+        NEXT K
+        C(I, J) = S
+    NEXT J
+NEXT I
+FOR I = 0 TO N
+    PRINT C(I, 0), C(I, 1), C(I, 2), C(I, 3)
+NEXT I
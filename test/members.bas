@@ -0,0 +1,15 @@
+' Results of FUNCTIONs taking structures are never cached, as a structure
+' may change between two calls, even with MEMOIZE.
+FUNCTION GETX(S)
+    RETURN S.X
+END FUNCTION
+
+P = STRUCT()
+P.X = 1
+PRINT GETX(P)
+P.X = 2
+PRINT GETX(P)
+MEMOIZE GETX
+PRINT GETX(P)
+P.X = 3
+PRINT GETX(P)
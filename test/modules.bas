@@ -0,0 +1,12 @@
+' USE runs each module once, and its functions keep using its own
+' variables: the _UNIT and CALLS of the program are not theirs.
+USE SHAPES
+USE COUNTER
+
+_UNIT = 10
+PRINT AREA(2, 3)
+PRINT AREA(4, 5)
+PRINT COUNT()
+PRINT SIDES
+CALLS = 100
+PRINT COUNT()
@@ -0,0 +1,34 @@
+DIM A(100) AS INTEGER
+S = 0
+P = 1
+M = 0
+K = 3
+FUNCTION SQ(X)
+    RETURN X * X
+END FUNCTION
+PARALLEL FOR I = 1 TO 100 REDUCE S WITH +, M WITH MAX
+    S = S + SQ(I) * K
+    A(I) = I * 2
+    M = I
+NEXT I
+PRINT S, M, I
+PRINT SUM(A)
+PARALLEL FOR J = 1 TO 6 REDUCE P WITH *
+    P = P * J
+    PRINT J
+NEXT J
+PRINT P
+RANDOMIZE 5
+R = 0
+PARALLEL FOR J = 1 TO 10 REDUCE R WITH +
+    R = R + RND()
+NEXT J
+PRINT R
+FUNCTION TOT(N)
+    T = 0
+    PARALLEL FOR Z = 0 TO 1 STEP 0.25 REDUCE T WITH +
+        T = T + Z * N
+    NEXT Z
+    RETURN T
+END FUNCTION
+PRINT TOT(4)
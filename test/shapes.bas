@@ -0,0 +1,10 @@
+' Module of modules.bas, itself using COUNTER.
+USE COUNTER
+
+_UNIT = 1
+SIDES = 4
+
+FUNCTION AREA(W, H)
+    BUMP()
+    RETURN W * H * _UNIT
+END FUNCTION
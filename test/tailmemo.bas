@@ -0,0 +1,12 @@
+' A memoized FUNCTION calling itself in tail position many times over.
+' The tree engine does not eliminate tail calls, so it runs out of stack here.
+FUNCTION LOOPY(N, ACC)
+    IF N = 0 THEN
+        RETURN ACC
+    END IF
+    RETURN LOOPY(N - 1, ACC + N)
+END FUNCTION
+
+PRINT LOOPY(100000, 0)
+PRINT LOOPY(100000, 0)
+PRINT LOOPY(10, 0)
@@ -0,0 +1,38 @@
+FUNCTION WORKER(NAME, N, C)
+    FOR I = 1 TO N
+        SEND C, NAME + I
+        YIELD
+    NEXT I
+    RETURN N * 10
+END FUNCTION
+SUB NAP(S)
+    SLEEP S
+END SUB
+C = CHANNEL()
+A = SPAWN WORKER("a", 3, C)
+B = SPAWN WORKER("b", 2, C)
+FOR K = 1 TO 5
+    PRINT RECEIVE(C)
+NEXT K
+PRINT AWAIT(A), AWAIT(B)
+PRINT AWAIT(A, B)
+DIM TS(99) AS STRING
+FOR K = 0 TO 99
+    TS(K) = SPAWN NAP(0.2)
+NEXT K
+AWAIT TS
+PRINT "slept"
+D = CHANNEL(1)
+SUB PRODUCE(D)
+    FOR I = 1 TO 4
+        SEND D, I
+        PRINT "sent", I
+    NEXT I
+    CLOSE D
+END SUB
+SPAWN PRODUCE(D)
+X = RECEIVE(D)
+WHILE X <> NOTHING
+    PRINT "got", X
+    X = RECEIVE(D)
+WEND
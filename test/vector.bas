@@ -0,0 +1,33 @@
+DIM A(4) AS INTEGER
+DIM B(4) AS INTEGER
+FOR I = 0 TO 4
+    A(I) = I + 1
+    B(I) = 10 * I
+NEXT I
+C = A + B * 2
+PRINT C
+PRINT SUM(A), MAX(A), MIN(B), DOT(A, B)
+PRINT MAX(3, 9, 2), MIN(4, 1)
+D = SQR(A)
+PRINT D(3)
+PRINT A(1 TO 3)
+PRINT SUM(A(1 TO 3))
+E = -A
+PRINT E
+PRINT 100 - A
+PRINT A / 2
+PRINT ABS(E)
+PRINT {1, 2, 3} + {4, 5, 6}
+PRINT SUM({1.5, 2.5})
+DIM M(1, 2) AS DECIMAL
+M(1, 2) = 7
+N = M * 3
+PRINT N(1, 2), SUM(N)
+P = M(1 TO 1)
+PRINT P(0, 2)
+C(0) = 99
+PRINT A(0), C(0)
+DIM Z(2) AS INTEGER
+Z(0) = 9223372036854775807
+W = Z + 1
+PRINT W(0)